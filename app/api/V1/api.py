@@ -1,7 +1,11 @@
 """
 FastAPI APIRouter for managing contact forms.
 
-This APIRouter includes the contact_form router from the app.api.V1.endpoints.form module.
+This APIRouter includes the contact_form router from the app.api.V1.endpoints.form module,
+the attachment router from the app.api.V1.endpoints.attachment module, the templates router
+from the app.api.V1.endpoints.template module, the callbacks router from the
+app.api.V1.endpoints.callback module, the history router from the app.api.V1.endpoints.history
+module and the metrics router from the app.api.V1.endpoints.metrics module.
 It is intended for managing endpoints related to contact forms.
 
 Usage:
@@ -19,6 +23,18 @@ Example:
 Attributes:
     - contact_form (APIRouter): The router for handling contact form related endpoints.
 
+    - attachment (APIRouter): The router for sending documents and photos.
+
+    - templates (APIRouter): The router for managing stored message templates.
+
+    - callbacks (APIRouter): The router for managing delivery callbacks.
+
+    - history (APIRouter): The router reading the history of sent notifications.
+
+    - admin (APIRouter): The router for administrative endpoints.
+
+    - metrics (APIRouter): The router exposing runtime metrics.
+
     - tags (List[str]): Tags associated with this router, which can be used for documentation and grouping.
 
 Note:
@@ -29,8 +45,20 @@ See Also:
     - FastAPI documentation on APIRouter: https://fastapi.tiangolo.com/tutorial/bigger-applications/
 """
 
+from api.V1.endpoints.admin import admin
+from api.V1.endpoints.attachment import attachment
+from api.V1.endpoints.callback import callbacks
 from api.V1.endpoints.form import contact_form
+from api.V1.endpoints.history import history
+from api.V1.endpoints.metrics import metrics
+from api.V1.endpoints.template import templates
 from fastapi import APIRouter
 
 api_router = APIRouter()
 api_router.include_router(contact_form, tags=["Contact Form"])
+api_router.include_router(attachment, tags=["Contact Form"])
+api_router.include_router(templates, tags=["Templates"])
+api_router.include_router(callbacks, tags=["Callbacks"])
+api_router.include_router(history, tags=["History"])
+api_router.include_router(admin, tags=["Admin"])
+api_router.include_router(metrics, tags=["Metrics"])
@@ -0,0 +1,769 @@
+"""
+Module: deps
+
+This module holds the process-wide service instances shared by the API endpoints and
+the background tasks they rely on.
+
+Attributes:
+    - bot_pool (BotPool): The bots of `Config.BOT_KEYS`, each with its Bot API client
+      and the priority lane scheduler through which its outbound calls are dispatched.
+    - quota_manager (QuotaManager): The per-API-key rate limits and daily quotas.
+    - template_cache (TemplateCache): The compiled message templates.
+    - admission_controller (AdmissionController): The in-flight limits of the routes.
+    - unreachable_chats (TTLCache): API keys whose chat blocked or deleted the bot.
+    - retry_policy (RetryPolicy): Decides which failed deliveries are retried and when.
+    - request_profiler (RequestProfiler): The opt-in request profiler; `X-Profile`
+      requests are profiled when they carry `Config.ADMIN_TOKEN`.
+    - callback_dispatcher (CallbackDispatcher): Pushes delivery outcomes to the
+      callback URLs of the subscribers, batched per URL.
+    - callback_configs (TTLCache): The callback registration of recently seen API keys.
+    - stream_registry (StreamRegistry): The messages edited in place by progress streams.
+    - api_key_signer (ApiKeySigner): Verifies signed API keys and holds the revoked keys.
+    - subscription_loader (KeyBatcher): Looks subscriptions up by API key, resolving
+      the lookups of concurrent requests with one `$in` query.
+    - history_buffer (HistoryBuffer): The history entries waiting to be written.
+
+Functions:
+    - subscription_store() -> FormClass: The subscription store.
+    - history_store() -> HistoryClass: The history store, read by GET /history and
+      written by the background writer.
+    - retry_store() -> RetryClass: The retry and dead-letter store.
+    - api_key_store() -> ApiKeyClass: The revocation list of signed API keys.
+    - usage_store() -> UsageClass: The persisted usage counters of the quotas.
+    - authenticate(api_key: str) -> Optional[SignedKey]: Verify a signed API key without I/O.
+    - enforce_quota(api_key: str): Reject a request which is over its quota with a 429.
+    - admit(route: str, priority: str): Hold an in-flight slot of a route or reply 503.
+    - admission(route: str) -> Callable: Dependency admitting a request before its body
+      is read.
+    - reject_unreachable(api_key: str, subscription: dict): Reply 410 for unreachable chats.
+    - mark_unreachable(api_key: str, chat_id: int, error: TelegramAPIError): Flag a chat
+      which blocked the bot.
+    - recheck_unreachable() -> int: Drop the cached unreachable keys whose flag the bot
+      cleared.
+    - require_admin(x_admin_token: str): Dependency guarding the admin endpoints.
+    - form_input(request: Request) -> FormInput: Dependency parsing a `FormInput` sent
+      as JSON or MessagePack.
+    - subscription_callback(api_key: str, subscription: dict) -> dict: Cache and return
+      the callback registration of a subscription.
+    - resolve_callback(api_key: str) -> dict: The callback registration of an API key,
+      from the cache or the database.
+    - report_outcome(callback: dict, notification_id: str, status: str, ...): Queue a
+      delivery outcome for the subscriber's callback.
+    - record_history(notification_id: str, chat_id: int, bot_id, text: str, ...): Queue a
+      notification for the history store.
+    - process_retries(retries: RetryClass): Attempt the deliveries due for a retry.
+    - startup(): Start the background tasks; registered on application startup.
+    - shutdown(): Stop the background tasks and flush pending state.
+
+Usage:
+    ```python
+    from api.V1.deps import bot_pool
+
+    bot = bot_pool.for_subscription(subscription)
+    await bot.scheduler.submit("normal", chat_id, bot.client.send_message, chat_id, text)
+    ```
+"""
+import asyncio
+import hmac
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Optional, TypeVar
+
+from config.config import Config
+from fastapi import Header, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from models.apikey import ApiKeyClass
+from models.form import FormClass
+from models.history import HistoryClass
+from models.retry import RetryClass
+from models.usage import UsageClass
+from pydantic import ValidationError
+from schemas.form import FormInput, Priority
+from services.admission import (
+    AdmissionController,
+    AdmissionLimit,
+    Overloaded,
+    parse_limits,
+)
+from services.apikeys import ApiKeySigner, InvalidApiKey, SignedKey
+from services.batching import KeyBatcher
+from services.bots import BotPool, UnknownBot
+from services.cache import TTLCache
+from services.callbacks import CallbackDispatcher
+from services.history import HistoryBuffer, timestamp
+from services.logs import annotate, hash_api_key, stage
+from services.payloads import MalformedPayload, UnsupportedMediaType, decode
+from services.profiling import RequestProfiler
+from services.quota import QuotaExceeded, QuotaManager
+from services.retry import RetryPolicy
+from services.streams import StreamRegistry
+from services.telegram import TelegramAPIError
+from services.templates import TemplateCache
+
+logger = logging.getLogger("rapidNotifyAPI")
+
+bot_pool = BotPool(
+    tokens=Config.BOT_KEYS,
+    lanes=[priority.value for priority in Priority],
+    rate=Config.TELEGRAM_GLOBAL_RATE,
+    chat_rate=Config.TELEGRAM_CHAT_RATE,
+    workers=Config.DELIVERY_WORKERS,
+    starvation_timeout=Config.DELIVERY_STARVATION_TIMEOUT,
+)
+
+quota_manager = QuotaManager(
+    rate_per_minute=Config.QUOTA_RATE_PER_MINUTE,
+    daily_limit=Config.QUOTA_DAILY_LIMIT,
+)
+
+template_cache = TemplateCache(max_size=Config.TEMPLATE_CACHE_SIZE)
+
+admission_controller = AdmissionController(
+    AdmissionLimit(
+        Config.ADMISSION_MAX_IN_FLIGHT,
+        Config.ADMISSION_QUEUE_SIZE,
+        Config.ADMISSION_QUEUE_TIMEOUT,
+    ),
+    parse_limits(Config.ADMISSION_LIMITS),
+)
+
+unreachable_chats = TTLCache(
+    max_size=Config.UNREACHABLE_CACHE_SIZE, ttl=Config.UNREACHABLE_CACHE_TTL
+)
+
+retry_policy = RetryPolicy(
+    max_attempts=Config.RETRY_MAX_ATTEMPTS,
+    base_delay=Config.RETRY_BASE_DELAY,
+    max_delay=Config.RETRY_MAX_DELAY,
+)
+
+# How long a claimed retry is reserved for the worker attempting it
+RETRY_LEASE = 300
+
+request_profiler = RequestProfiler(
+    token=Config.ADMIN_TOKEN,
+    enabled=Config.PROFILING_ENABLED,
+    sample_rate=Config.PROFILING_SAMPLE_RATE,
+    max_profiles=Config.PROFILING_MAX_PROFILES,
+)
+
+callback_dispatcher = CallbackDispatcher(
+    window=Config.CALLBACK_BATCH_WINDOW,
+    max_batch=Config.CALLBACK_MAX_BATCH,
+    max_pending=Config.CALLBACK_MAX_PENDING,
+    max_attempts=Config.CALLBACK_MAX_ATTEMPTS,
+    timeout=Config.CALLBACK_TIMEOUT,
+    pool_size=Config.CALLBACK_POOL_SIZE,
+)
+
+callback_configs = TTLCache(
+    max_size=Config.CALLBACK_CACHE_SIZE, ttl=Config.CALLBACK_CACHE_TTL
+)
+
+stream_registry = StreamRegistry(
+    max_size=Config.STREAM_CACHE_SIZE,
+    ttl=Config.STREAM_TTL,
+    debounce=Config.STREAM_DEBOUNCE,
+)
+
+api_key_signer = ApiKeySigner(Config.API_KEY_SECRET)
+
+Store = TypeVar("Store")
+
+
+def _shared(factory: Callable[[], Store]) -> Callable[[], Store]:
+    """
+    Return a getter creating `factory()` on its first call and reusing it afterwards.
+
+    Stores are created on first use rather than on import, so that the application can
+    be imported without database configuration, and then share one database client
+    (and its connection pool) for the lifetime of the process.
+    """
+    lock = threading.Lock()
+    instance = []
+
+    def get() -> Store:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    get.__doc__ = f"Return the process-wide `{factory.__name__}` instance."
+    return get
+
+
+subscription_store = _shared(FormClass)
+history_store = _shared(HistoryClass)
+retry_store = _shared(RetryClass)
+api_key_store = _shared(ApiKeyClass)
+usage_store = _shared(UsageClass)
+
+subscription_loader = KeyBatcher(
+    lambda api_keys: subscription_store().get_many(api_keys),
+    window=Config.LOOKUP_BATCH_WINDOW,
+    max_batch=Config.LOOKUP_BATCH_SIZE,
+    default=[],
+)
+
+history_buffer = HistoryBuffer(
+    max_pending=Config.HISTORY_MAX_PENDING, batch_size=Config.HISTORY_BATCH_SIZE
+)
+
+_background_tasks = []
+
+
+def authenticate(api_key: str) -> Optional[SignedKey]:
+    """
+    Check an API key using only CPU.
+
+    Args:
+        api_key (str): The API key of the request.
+
+    Returns:
+        Optional[SignedKey]: The chat and bot of a signed key, or None for a random
+            key issued before signed keys, which has to be looked up.
+
+    Raises:
+        InvalidApiKey: If the key is forged or revoked.
+    """
+    try:
+        return api_key_signer.verify(api_key)
+    except InvalidApiKey:
+        annotate(outcome="invalid_key")
+        raise
+
+
+def enforce_quota(api_key: str) -> None:
+    """
+    Check the quota of an API key without touching the database.
+
+    Also attaches the hashed key to the request's log line.
+
+    Args:
+        api_key (str): The API key of the request.
+
+    Raises:
+        HTTPException: 429 with a `Retry-After` header if the key is over its limits.
+    """
+    annotate(api_key=hash_api_key(api_key))
+    try:
+        quota_manager.check(api_key)
+    except QuotaExceeded as e:
+        annotate(outcome="throttled")
+        raise HTTPException(
+            status_code=429,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+
+
+@asynccontextmanager
+async def admit(route: str, priority: Optional[str] = None):
+    """
+    Hold an in-flight slot of a route for the duration of the block.
+
+    Args:
+        route (str): The route name, e.g. "RapidNotify".
+        priority (Optional[str]): The priority of the request.
+
+    Raises:
+        HTTPException: 503 with a `Retry-After` header if the route is saturated.
+    """
+    limiter = admission_controller.limiter(route, priority)
+    try:
+        with stage("admission"):
+            await limiter.acquire()
+    except Overloaded as e:
+        annotate(outcome="shed")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    try:
+        yield
+    finally:
+        limiter.release()
+
+
+def admission(route: str) -> Callable:
+    """
+    Build a dependency holding an in-flight slot of a route for the whole request.
+
+    Listed in the route's `dependencies`, it runs before the body is read, so a
+    saturated route rejects requests without receiving or validating their bodies.
+    The body is not available yet, so the limiter of a priority is chosen with the
+    optional `X-Priority` header instead of the body's `priority`.
+
+    Args:
+        route (str): The route name, e.g. "RapidNotify".
+
+    Returns:
+        Callable: The dependency.
+    """
+
+    async def dependency(x_priority: Optional[Priority] = Header(default=None)):
+        async with admit(route, x_priority and x_priority.value):
+            yield
+
+    return dependency
+
+
+UNREACHABLE_DETAIL = (
+    "The subscriber blocked the bot or deleted the chat. "
+    "Notifications resume once they send /start to the bot again."
+)
+
+
+def reject_unreachable(api_key: str, subscription: Optional[dict] = None) -> None:
+    """
+    Fail fast for subscribers whose chat blocked or deleted the bot.
+
+    Without `subscription`, only the in-process state is checked, so known
+    unreachable keys are rejected before any database lookup. A loaded subscription
+    is authoritative: once the bot cleared its flag (the subscriber sent /start), the
+    key is dropped from the in-process state. Signed keys are never looked up;
+    `recheck_unreachable` rereads the flags of every cached key instead.
+
+    Args:
+        api_key (str): The API key of the request.
+        subscription (Optional[dict]): The subscription document, once it is loaded
+            from the database.
+
+    Raises:
+        HTTPException: 410 if the subscriber's chat is unreachable.
+    """
+    if subscription is None:
+        if api_key not in unreachable_chats:
+            return
+    elif subscription.get("unreachable"):
+        unreachable_chats.set(api_key, subscription.get("unreachable_reason"))
+    else:
+        unreachable_chats.pop(api_key)
+        return
+
+    annotate(outcome="unreachable")
+    raise HTTPException(status_code=410, detail=UNREACHABLE_DETAIL)
+
+
+async def mark_unreachable(
+    api_key: str, chat_id: int, error: TelegramAPIError
+) -> HTTPException:
+    """
+    Flag a subscription whose delivery failed because the chat blocked the bot.
+
+    The flag is stored in the database, so other workers pick it up on their next
+    lookup, and in the in-process state.
+
+    Args:
+        api_key (str): The API key of the subscription.
+        chat_id (int): The chat id of the subscription.
+        error (TelegramAPIError): The delivery failure.
+
+    Returns:
+        HTTPException: The 410 to raise to the caller.
+    """
+    try:
+        await asyncio.to_thread(
+            subscription_store().mark_unreachable, chat_id, str(error)
+        )
+    except Exception as e:
+        logger.error(f"Failed to flag chat {chat_id} as unreachable: {e}")
+    # Cached after the write, so that a concurrent recheck does not drop the key
+    unreachable_chats.set(api_key, str(error))
+
+    annotate(outcome="unreachable")
+    return HTTPException(status_code=410, detail=UNREACHABLE_DETAIL)
+
+
+async def recheck_unreachable() -> int:
+    """
+    Reread the stored flags of the API keys cached as unreachable.
+
+    Keys whose flag the bot cleared (the subscriber sent /start), or whose subscription
+    is gone, are dropped, and the entries of keys still flagged are renewed. This is
+    how signed keys, which are never looked up, learn that their chat is reachable
+    again, while the chat stays blocked without any outbound call.
+
+    Returns:
+        int: The number of keys dropped.
+    """
+    api_keys = unreachable_chats.keys()
+    dropped = 0
+    for start in range(0, len(api_keys), Config.LOOKUP_BATCH_SIZE):
+        batch = api_keys[start : start + Config.LOOKUP_BATCH_SIZE]
+        found = await asyncio.to_thread(subscription_store().get_many, batch)
+        for api_key in batch:
+            subscription = (found.get(api_key) or [{}])[0]
+            if subscription.get("unreachable"):
+                unreachable_chats.set(api_key, subscription.get("unreachable_reason"))
+            else:
+                unreachable_chats.pop(api_key)
+                dropped += 1
+    return dropped
+
+
+async def _recheck_unreachable_periodically() -> None:
+    while True:
+        await asyncio.sleep(Config.UNREACHABLE_RECHECK_INTERVAL)
+        try:
+            await recheck_unreachable()
+        except Exception as e:
+            logger.error(f"Failed to recheck unreachable chats: {e}")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Dependency rejecting requests without the configured admin token.
+
+    Args:
+        x_admin_token (Optional[str]): The value of the `X-Admin-Token` header.
+
+    Raises:
+        HTTPException: 403 if admin endpoints are disabled or the token is wrong.
+    """
+    if not Config.ADMIN_TOKEN or not hmac.compare_digest(
+        (x_admin_token or "").encode(), Config.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Admin token required.")
+
+
+async def form_input(request: Request) -> FormInput:
+    """
+    Dependency parsing the `FormInput` of a request sent as JSON or MessagePack.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        FormInput: The validated input.
+
+    Raises:
+        HTTPException: 415 for other media types, 400 for undecodable MessagePack.
+        RequestValidationError: If the input is invalid, answered with the usual 422.
+    """
+    body = await request.body()
+    try:
+        return decode(FormInput, body, request.headers.get("content-type"))
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e)) from e
+    except MalformedPayload as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        for error in errors:
+            error["loc"] = ("body", *error["loc"])
+        raise RequestValidationError(errors, body=body) from e
+
+
+def subscription_callback(api_key: str, subscription: Optional[dict]) -> dict:
+    """
+    Cache and return the callback registration of a subscription.
+
+    Args:
+        api_key (str): The API key of the subscription.
+        subscription (Optional[dict]): The subscription document, None if unknown.
+
+    Returns:
+        dict: {"url": str, "secret": str}, or {} when no callback is registered.
+    """
+    callback = (subscription or {}).get("callback") or {}
+    callback_configs.set(api_key, callback)
+    return callback
+
+
+def report_outcome(
+    callback: Optional[dict],
+    notification_id: Optional[str],
+    status: str,
+    attempts: int,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Queue a delivery outcome for the callback of a subscriber, if one is registered.
+
+    Args:
+        callback (Optional[dict]): The callback registration of the subscriber.
+        notification_id (Optional[str]): The id returned when the notification was accepted.
+        status (str): "sent", "failed" or "dead_lettered".
+        attempts (int): Delivery attempts made.
+        error (Optional[str]): The last failure, if any.
+    """
+    if not callback or notification_id is None:
+        return
+    callback_dispatcher.emit(
+        callback["url"],
+        callback["secret"],
+        {
+            "notification_id": notification_id,
+            "status": status,
+            "attempts": attempts,
+            "error": error,
+            "timestamp": time.time(),
+        },
+    )
+
+
+async def resolve_callback(api_key: Optional[str]) -> dict:
+    """
+    Return the callback registration of an API key.
+
+    The database is only queried when the key is not in `callback_configs`.
+
+    Args:
+        api_key (Optional[str]): The API key.
+
+    Returns:
+        dict: {"url": str, "secret": str}, or {} when no callback is registered.
+    """
+    if api_key is None:
+        return {}
+    callback = callback_configs.get(api_key)
+    if callback is None:
+        response = await subscription_loader.load(api_key)
+        callback = subscription_callback(api_key, response[0] if response else None)
+    return callback
+
+
+def record_history(
+    notification_id: Optional[str],
+    chat_id: int,
+    bot_id,
+    text: str,
+    priority: str,
+    status: str,
+    stream_id: Optional[str] = None,
+) -> None:
+    """
+    Queue a notification for the history store; it is written in the background.
+
+    A later record of the same `notification_id` replaces the earlier one, e.g. when
+    a queued notification was sent by the retry worker.
+
+    Args:
+        notification_id (Optional[str]): The notification; nothing is recorded if None.
+        chat_id (int): The chat it was delivered to.
+        bot_id (Optional[Union[int, str]]): The bot it was delivered by.
+        text (str): The rendered message.
+        priority (str): Its delivery lane.
+        status (str): "sent", "queued" or "failed".
+        stream_id (Optional[str]): The progress stream it updated.
+    """
+    if notification_id is None:
+        return
+    entry = {
+        "_id": notification_id,
+        "chat_id": chat_id,
+        "bot_id": bot_id,
+        "text": text,
+        "priority": priority,
+        "status": status,
+        "sent_at": timestamp(),
+    }
+    if stream_id is not None:
+        entry["stream_id"] = stream_id
+    history_buffer.record(entry)
+
+
+def _write_history(history: HistoryClass) -> None:
+    """Write the buffered history entries in batches."""
+    while True:
+        entries = history_buffer.drain()
+        if not entries:
+            return
+        try:
+            history.write(entries)
+        except Exception:
+            history_buffer.restore(entries)
+            raise
+
+
+async def _write_history_periodically() -> None:
+    while True:
+        await history_buffer.wait(Config.HISTORY_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(_write_history, history_store())
+        except Exception as e:
+            logger.error(f"Failed to write notification history: {e}")
+
+
+def _flush_usage(usage: UsageClass) -> None:
+    """Write the aggregated usage counters and reconcile today's totals."""
+    pending = quota_manager.drain()
+    if not pending:
+        return
+    try:
+        usage.increment(pending)
+    except Exception:
+        quota_manager.restore(pending)
+        raise
+
+    day = max(pending_day for pending_day, _ in pending)
+    api_keys = [api_key for pending_day, api_key in pending if pending_day == day]
+    quota_manager.reconcile(day, usage.totals(day, api_keys))
+
+
+async def _flush_usage_periodically() -> None:
+    while True:
+        await asyncio.sleep(Config.QUOTA_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(_flush_usage, usage_store())
+        except Exception as e:
+            logger.error(f"Failed to flush usage counters: {e}")
+
+
+async def _retry_delivery(retries: RetryClass, retry: dict) -> None:
+    """Claim and attempt one due delivery, then complete, reschedule or dead-letter it.
+
+    The parts of a split message are sent one after another, resuming at the first
+    part not sent yet; a failure keeps the remaining parts for the next attempt.
+    """
+    claimed = await asyncio.to_thread(retries.claim, retry, time.time() + RETRY_LEASE)
+    if not claimed:
+        return
+
+    parts = retry.get("parts") or [retry["text"]]
+    part = retry.get("part", 0)
+    try:
+        bot = bot_pool.get(retry.get("bot_id"))
+        while part < len(parts):
+            await bot.scheduler.submit(
+                retry["priority"],
+                retry["chat_id"],
+                bot.client.send_message,
+                retry["chat_id"],
+                parts[part],
+            )
+            part += 1
+    except (TelegramAPIError, UnknownBot) as e:
+        attempts = retry["attempts"] + 1
+        if isinstance(e, TelegramAPIError) and e.chat_unreachable:
+            await asyncio.to_thread(
+                subscription_store().mark_unreachable, retry["chat_id"], str(e)
+            )
+        if retry_policy.should_retry(e, attempts):
+            next_attempt = time.time() + retry_policy.delay(attempts, e.retry_after)
+            await asyncio.to_thread(
+                retries.reschedule,
+                retry["_id"],
+                attempts,
+                next_attempt,
+                str(e),
+                part if "parts" in retry else None,
+            )
+        else:
+            logger.error(f"Delivery {retry['_id']} dead-lettered: {e}")
+            if "parts" in retry:
+                retry = {**retry, "part": part}
+            await asyncio.to_thread(retries.dead_letter, retry, attempts, str(e))
+            record_history(
+                retry.get("notification_id"),
+                retry["chat_id"],
+                retry.get("bot_id"),
+                retry["text"],
+                retry["priority"],
+                "failed",
+            )
+            report_outcome(
+                await resolve_callback(retry.get("api_key")),
+                retry.get("notification_id"),
+                "dead_lettered" if retry_policy.is_transient(e) else "failed",
+                attempts,
+                str(e),
+            )
+        return
+
+    await asyncio.to_thread(retries.complete, retry["_id"])
+    record_history(
+        retry.get("notification_id"),
+        retry["chat_id"],
+        retry.get("bot_id"),
+        retry["text"],
+        retry["priority"],
+        "sent",
+    )
+    report_outcome(
+        await resolve_callback(retry.get("api_key")),
+        retry.get("notification_id"),
+        "sent",
+        retry["attempts"] + 1,
+    )
+
+
+async def process_retries(retries: RetryClass) -> int:
+    """
+    Attempt every delivery due for a retry through the delivery scheduler.
+
+    Args:
+        retries (RetryClass): The retry store.
+
+    Returns:
+        int: The number of due deliveries read.
+    """
+    due = await asyncio.to_thread(retries.due, time.time(), Config.RETRY_BATCH_SIZE)
+    results = await asyncio.gather(
+        *(_retry_delivery(retries, retry) for retry in due), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Failed to process a retry: {result}")
+    return len(due)
+
+
+async def _retry_periodically() -> None:
+    while True:
+        await asyncio.sleep(Config.RETRY_POLL_INTERVAL)
+        try:
+            await process_retries(retry_store())
+        except Exception as e:
+            logger.error(f"Failed to read pending retries: {e}")
+
+
+async def _refresh_revoked_keys_periodically() -> None:
+    while True:
+        try:
+            api_key_signer.load_revoked(
+                await asyncio.to_thread(api_key_store().revoked)
+            )
+        except Exception as e:
+            logger.error(f"Failed to load revoked API keys: {e}")
+        await asyncio.sleep(Config.API_KEY_REVOCATION_REFRESH)
+
+
+async def startup() -> None:
+    """Start the background tasks of the API.
+
+    Raises:
+        RuntimeError: If no bot token is configured.
+    """
+    if not bot_pool.bots:
+        raise RuntimeError("No bot token configured, set BOT_KEY or BOT_KEYS.")
+    _background_tasks.append(asyncio.create_task(_refresh_revoked_keys_periodically()))
+    _background_tasks.append(asyncio.create_task(_flush_usage_periodically()))
+    _background_tasks.append(asyncio.create_task(_retry_periodically()))
+    _background_tasks.append(asyncio.create_task(_write_history_periodically()))
+    _background_tasks.append(asyncio.create_task(_recheck_unreachable_periodically()))
+
+
+async def shutdown() -> None:
+    """Stop the background tasks, send pending callbacks and write the remaining usage
+    counters and history."""
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+    await bot_pool.stop()
+    await callback_dispatcher.stop()
+
+    try:
+        await asyncio.to_thread(_flush_usage, usage_store())
+    except Exception as e:
+        logger.error(f"Failed to flush usage counters: {e}")
+
+    try:
+        await asyncio.to_thread(_write_history, history_store())
+    except Exception as e:
+        logger.error(f"Failed to write notification history: {e}")
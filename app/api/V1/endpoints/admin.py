@@ -0,0 +1,228 @@
+"""
+Module: admin
+
+This module defines administrative endpoints, guarded by the `X-Admin-Token` header.
+
+Endpoints:
+    - GET /admin/subscriptions/export: Stream every subscription as NDJSON.
+    - POST /admin/subscriptions/import: Upsert subscriptions from an NDJSON body.
+    - POST /admin/dead-letters/replay: Requeue every dead-lettered delivery.
+    - POST /admin/keys/revoke: Add an API key to the revocation list.
+    - GET /admin/profiling: The profiling settings and the stored request profiles.
+    - PUT /admin/profiling: Turn sampled request profiling on or off.
+    - GET /admin/profiling/{profile_id}: Download a profile as pstats data or text.
+
+Usage:
+    ```bash
+    curl -H "X-Admin-Token: TOKEN" https://endpoint.com/admin/subscriptions/export > subscriptions.ndjson
+    curl -X POST -H "X-Admin-Token: TOKEN" --data-binary @subscriptions.ndjson \
+        "https://endpoint.com/admin/subscriptions/import?ordered=false"
+    curl -X PUT -H "X-Admin-Token: TOKEN" -d '{"enabled": true, "sample_rate": 0.05}' \
+        https://endpoint.com/admin/profiling
+    curl -H "X-Admin-Token: TOKEN" https://endpoint.com/admin/profiling/ID > request.prof
+    ```
+
+    A single request is profiled on demand by sending `X-Profile: TOKEN`; the id of
+    its profile is returned in the `X-Profile-Id` response header.
+
+Notes:
+    Both directions stream: the export reads a server-side cursor batch by batch and
+    the import consumes the request body line by line, so memory use does not depend
+    on the size of the collection. A failed import reports the `offset` to resume from.
+"""
+import asyncio
+
+from api.V1.deps import (
+    api_key_signer,
+    api_key_store,
+    request_profiler,
+    require_admin,
+    retry_store,
+    subscription_store,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from schemas.admin import ProfilingInput, RevokeKeyInput
+from services.apikeys import InvalidApiKey
+from services.streaming import iter_lines, iterate_threadsafe
+from services.transfer import ImportFailed, export_lines, import_documents
+
+admin = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@admin.get("/subscriptions/export")
+async def export_subscriptions(batch_size: int = Query(default=1000, gt=0, le=10000)):
+    """
+    Stream every subscription document as newline-delimited Extended JSON.
+
+    Args:
+        batch_size (int): Documents fetched from the database per round trip.
+
+    Returns:
+        StreamingResponse: The NDJSON stream, ordered by `_id`.
+    """
+    return StreamingResponse(
+        export_lines(subscription_store().export(batch_size)),
+        media_type="application/x-ndjson",
+    )
+
+
+@admin.post("/subscriptions/import")
+async def import_subscriptions(
+    request: Request,
+    offset: int = Query(default=0, ge=0),
+    batch_size: int = Query(default=1000, gt=0, le=10000),
+    ordered: bool = True,
+):
+    """
+    Upsert subscription documents from a newline-delimited JSON request body.
+
+    Args:
+        request (Request): The request whose body holds one document per line.
+        offset (int): Number of leading lines to skip, to resume a failed import.
+        batch_size (int): Documents per bulk write.
+        ordered (bool): Whether each bulk write stops at its first error.
+
+    Returns:
+        dict: The number of lines processed (`offset`), documents written and
+            invalid lines.
+
+    Raises:
+        HTTPException: 500 if a batch fails; the detail holds the offset to resume from.
+    """
+    lines = iter_lines(iterate_threadsafe(request.stream(), asyncio.get_running_loop()))
+
+    try:
+        stats = await asyncio.to_thread(
+            import_documents,
+            lines,
+            subscription_store().write_batch,
+            batch_size,
+            offset,
+            ordered,
+        )
+    except ImportFailed as e:
+        raise HTTPException(
+            status_code=500, detail={"message": str(e), **e.stats.as_dict()}
+        ) from e
+
+    return {"status": "success", **stats.as_dict()}
+
+
+@admin.post("/dead-letters/replay")
+async def replay_dead_letters(batch_size: int = Query(default=1000, gt=0, le=10000)):
+    """
+    Move every dead-lettered delivery back to the retry queue, due immediately.
+
+    The retry worker then sends them through the delivery scheduler, under the same
+    rate limits as any other traffic.
+
+    Args:
+        batch_size (int): Documents per bulk write.
+
+    Returns:
+        dict: The number of deliveries requeued.
+    """
+    replayed = await asyncio.to_thread(retry_store().replay, batch_size)
+    return {"status": "success", "replayed": replayed}
+
+
+@admin.post("/keys/revoke")
+async def revoke_key(data: RevokeKeyInput):
+    """
+    Add an API key to the revocation list and detach it from its subscription.
+
+    The key is rejected by this process immediately, and by every other process
+    once it reloads the list, i.e. within `API_KEY_REVOCATION_REFRESH` seconds. The
+    subscriber gets a new key with /subscribe.
+
+    Args:
+        data (RevokeKeyInput): The API key.
+
+    Returns:
+        dict: The key id the key was revoked by, and whether a subscription held it.
+    """
+    key_id = api_key_signer.key_id(data.api_key)
+    try:
+        signed_key = api_key_signer.verify(data.api_key)
+    except InvalidApiKey:
+        signed_key = None
+
+    await asyncio.to_thread(
+        api_key_store().revoke, key_id, signed_key.chat_id if signed_key else None
+    )
+    api_key_signer.revoke(key_id)
+    released = await asyncio.to_thread(
+        subscription_store().release_api_key, data.api_key
+    )
+    return {"status": "success", "key_id": key_id, "released": released}
+
+
+@admin.get("/profiling")
+async def profiling_status():
+    """
+    Report the profiling settings and the stored request profiles.
+
+    Returns:
+        dict: Whether sampling is enabled, the sample rate and the metadata of the
+            stored profiles, newest first.
+    """
+    return {
+        "enabled": request_profiler.enabled,
+        "sample_rate": request_profiler.sample_rate,
+        "profiles": request_profiler.profiles(),
+    }
+
+
+@admin.put("/profiling")
+async def configure_profiling(data: ProfilingInput):
+    """
+    Turn sampled request profiling on or off.
+
+    Args:
+        data (ProfilingInput): Whether to sample requests and the fraction profiled.
+
+    Returns:
+        dict: The status of the operation.
+    """
+    request_profiler.configure(data.enabled, data.sample_rate)
+    return {"status": "success", **data.model_dump()}
+
+
+@admin.get("/profiling/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query(default="pstats", pattern="^(pstats|text)$"),
+    limit: int = Query(default=50, gt=0),
+):
+    """
+    Download a stored request profile.
+
+    Args:
+        profile_id (str): The id from the `X-Profile-Id` response header.
+        format (str): "pstats" for data loadable with `pstats.Stats`, or "text" for
+            the functions with the highest cumulative time.
+        limit (int): Number of functions listed in the text report.
+
+    Returns:
+        Response: The profile.
+
+    Raises:
+        HTTPException: 404 if the profile does not exist or was evicted.
+    """
+    if format == "text":
+        report = request_profiler.as_text(profile_id, limit)
+        if report is not None:
+            return PlainTextResponse(report)
+    else:
+        data = request_profiler.as_pstats(profile_id)
+        if data is not None:
+            return Response(
+                data,
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{profile_id}.prof"'
+                },
+            )
+
+    raise HTTPException(status_code=404, detail="Profile not found.")
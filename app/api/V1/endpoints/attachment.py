@@ -0,0 +1,235 @@
+"""
+Module: attachment
+
+This module defines an endpoint for sending files (logs, screenshots, reports) as
+Telegram documents or photos.
+
+Endpoints:
+    - POST /RapidNotify/attachment: Stream the request body to the subscriber's chat.
+
+Usage:
+    The raw file is sent as the request body and the metadata as query parameters:
+
+    ```bash
+    curl -X POST -H "Content-Type: text/plain" --data-binary @app.log \
+        "https://endpoint.com/RapidNotify/attachment?api_key=KEY&filename=app.log"
+    ```
+
+Spooling:
+    The body is received in full before the upload is handed to the delivery
+    scheduler, so a slow client never holds a scheduler worker. It is spooled to a
+    temporary file once it exceeds `ATTACHMENT_SPOOL_BYTES`, which bounds the memory
+    of a request regardless of the file size, and the worker then streams the file to
+    Telegram. Size limits are checked against `Content-Length` before any database
+    lookup and enforced again on the bytes actually received.
+
+Authentication:
+    Signed API keys are verified without I/O and name the subscriber's chat and bot,
+    so their attachments are delivered without a database lookup.
+
+Exceptions:
+    - HTTPException: 429 for keys over their quota, 410 for chats which blocked the
+      bot, 503 when saturated or when the subscriber's bot is not configured, 411
+      without a `Content-Length`, 413 for files over the limit, 400 for truncated
+      bodies and 500 for database or Telegram errors.
+"""
+import asyncio
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator, Optional
+
+from api.V1.deps import (
+    admit,
+    authenticate,
+    bot_pool,
+    enforce_quota,
+    mark_unreachable,
+    quota_manager,
+    reject_unreachable,
+    subscription_loader,
+)
+from config.config import Config
+from fastapi import APIRouter, HTTPException, Request
+from schemas.form import AttachmentKind, Priority
+from services.apikeys import InvalidApiKey
+from services.bots import UnknownBot
+from services.logs import annotate, stage
+from services.telegram import TelegramAPIError
+
+from .template import INVALID_API_KEY
+
+attachment = APIRouter()
+
+SIZE_LIMITS = {
+    AttachmentKind.DOCUMENT: Config.MAX_DOCUMENT_BYTES,
+    AttachmentKind.PHOTO: Config.MAX_PHOTO_BYTES,
+}
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class BodyLengthError(ValueError):
+    """Raised when the received body does not match its declared `Content-Length`."""
+
+
+async def _spool_body(request: Request, length: int) -> SpooledTemporaryFile:
+    """
+    Receive the request body into a spooled temporary file.
+
+    The body stays in memory up to `ATTACHMENT_SPOOL_BYTES` and is written to disk
+    beyond that; writes run in a worker thread so a rolled-over file does not block
+    the event loop.
+
+    Args:
+        request (Request): The incoming request.
+        length (int): The declared `Content-Length`.
+
+    Returns:
+        SpooledTemporaryFile: The body, rewound to its start. The caller closes it.
+
+    Raises:
+        BodyLengthError: If more or fewer bytes than `length` arrive.
+    """
+    spool = SpooledTemporaryFile(max_size=Config.ATTACHMENT_SPOOL_BYTES)
+    try:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > length:
+                raise BodyLengthError("Request body exceeds its Content-Length.")
+            if chunk:
+                await asyncio.to_thread(spool.write, chunk)
+
+        if received != length:
+            raise BodyLengthError("Request body is shorter than its Content-Length.")
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _file_chunks(file: BinaryIO) -> Iterator[bytes]:
+    """
+    Read a file in chunks, for the delivery worker thread.
+
+    Args:
+        file (BinaryIO): The spooled body.
+
+    Yields:
+        bytes: The next chunk of the file.
+    """
+    while chunk := file.read(READ_CHUNK_SIZE):
+        yield chunk
+
+
+@attachment.post("/RapidNotify/attachment")
+async def send_attachment(
+    request: Request,
+    api_key: str,
+    filename: str,
+    kind: AttachmentKind = AttachmentKind.DOCUMENT,
+    caption: Optional[str] = None,
+    priority: Priority = Priority.NORMAL,
+):
+    """
+    Handles POST requests to the /RapidNotify/attachment endpoint.
+
+    Args:
+        request (Request): The incoming request whose body is the file content.
+        api_key (str): The API key of the subscriber.
+        filename (str): The file name shown in Telegram.
+        kind (AttachmentKind): Send the file as a document or as a photo.
+        caption (Optional[str]): An optional caption.
+        priority (Priority): The delivery lane of the attachment.
+
+    Returns:
+        dict: The status of the delivery.
+
+    Raises:
+        HTTPException: Raised for missing or oversized bodies and for database or
+            Telegram-related errors.
+    """
+    try:
+        signed_key = authenticate(api_key)
+    except InvalidApiKey:
+        return INVALID_API_KEY
+
+    enforce_quota(api_key)
+    reject_unreachable(api_key)
+
+    content_length = request.headers.get("content-length")
+    if content_length is None:
+        raise HTTPException(status_code=411, detail="Content-Length is required.")
+    try:
+        length = int(content_length)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length.") from e
+
+    limit = SIZE_LIMITS[kind]
+    if length > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A {kind.value} attachment may not exceed {limit} bytes.",
+        )
+    if length == 0:
+        raise HTTPException(status_code=400, detail="The attachment is empty.")
+
+    async with admit("attachment", priority.value):
+        if signed_key is not None:
+            response = [{"_id": signed_key.chat_id, "bot_id": signed_key.bot_id}]
+        else:
+            try:
+                with stage("lookup"):
+                    response = await subscription_loader.load(api_key)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to retrieve existing user data: {e}",
+                ) from e
+
+        if not response:
+            annotate(outcome="invalid_key")
+            return INVALID_API_KEY
+
+        quota_manager.record(api_key)
+        if signed_key is None:
+            reject_unreachable(api_key, response[0])
+
+        uuid = response[0]["_id"]
+        try:
+            bot = bot_pool.for_subscription(response[0])
+        except UnknownBot as e:
+            raise HTTPException(status_code=503, detail=str(e)) from e
+        content_type = request.headers.get("content-type", "application/octet-stream")
+
+        try:
+            with stage("receive"):
+                body = await _spool_body(request, length)
+        except BodyLengthError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+        try:
+            with stage("deliver"):
+                await bot.scheduler.submit(
+                    priority.value,
+                    uuid,
+                    bot.client.send_file,
+                    uuid,
+                    kind.value,
+                    filename,
+                    _file_chunks(body),
+                    length,
+                    caption,
+                    content_type,
+                )
+        except TelegramAPIError as e:
+            if e.chat_unreachable:
+                raise await mark_unreachable(api_key, uuid, e) from e
+            raise HTTPException(
+                status_code=500, detail=f"Failed to send Telegram {kind.value}: {e}"
+            ) from e
+        finally:
+            await asyncio.to_thread(body.close)
+
+        return {"status": "success", "message": "Attachment sent successfully."}
@@ -0,0 +1,138 @@
+"""
+Module: callback
+
+This module defines endpoints for managing the delivery callback of a subscriber.
+
+Endpoints:
+    - PUT /callbacks: Register or replace the callback URL and issue a new secret.
+    - DELETE /callbacks: Remove the callback.
+
+Usage:
+    ```bash
+    curl -X PUT -H "Content-Type: application/json" \
+        -d '{"api_key": "KEY", "url": "https://example.com/rapidnotify/outcomes"}' \
+        https://endpoint.com/callbacks
+    ```
+
+    The response holds the `secret` the callback requests are signed with; it is only
+    returned once, and registering again issues a new one. See `services.callbacks`
+    for the request format and signature.
+
+Notes:
+    - Callback URLs must be https and resolve to public addresses only (see
+      `services.callbacks`), so that subscribers cannot make the API send requests
+      to hosts of its own network.
+
+Exceptions:
+    - HTTPException: 400 for URLs that are not allowed, 503 when saturated and 500
+      for database errors.
+"""
+import asyncio
+import secrets
+
+from api.V1.deps import (
+    admit,
+    authenticate,
+    callback_configs,
+    enforce_quota,
+    subscription_store,
+)
+from fastapi import APIRouter, HTTPException
+from schemas.callback import CallbackDeleteInput, CallbackInput
+from services.apikeys import InvalidApiKey
+from services.callbacks import UnsafeCallbackUrl, check_url
+
+from .template import INVALID_API_KEY
+
+callbacks = APIRouter()
+
+
+@callbacks.put("/callbacks")
+async def register_callback(data: CallbackInput):
+    """
+    Handles PUT requests to the /callbacks endpoint.
+
+    Args:
+        data (CallbackInput): The API key and callback URL.
+
+    Returns:
+        dict: The status of the registration and the signing secret.
+
+    Raises:
+        HTTPException: Raised if the URL is not allowed or the callback cannot be
+            stored.
+    """
+    try:
+        authenticate(data.api_key)
+    except InvalidApiKey:
+        return INVALID_API_KEY
+
+    enforce_quota(data.api_key)
+
+    try:
+        await asyncio.to_thread(check_url, str(data.url))
+    except UnsafeCallbackUrl as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except OSError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Callback host cannot be resolved: {e}"
+        ) from e
+    secret = secrets.token_hex(32)
+
+    async with admit("callbacks"):
+        try:
+            stored = await asyncio.to_thread(
+                subscription_store().set_callback, data.api_key, str(data.url), secret
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to store callback: {e}"
+            ) from e
+
+    if not stored:
+        return INVALID_API_KEY
+
+    callback_configs.pop(data.api_key)
+    return {
+        "status": "success",
+        "message": "Callback registered.",
+        "secret": secret,
+    }
+
+
+@callbacks.delete("/callbacks")
+async def delete_callback(data: CallbackDeleteInput):
+    """
+    Handles DELETE requests to the /callbacks endpoint.
+
+    Args:
+        data (CallbackDeleteInput): The API key.
+
+    Returns:
+        dict: The status of the deletion.
+
+    Raises:
+        HTTPException: Raised if the callback cannot be removed.
+    """
+    try:
+        authenticate(data.api_key)
+    except InvalidApiKey:
+        return INVALID_API_KEY
+
+    enforce_quota(data.api_key)
+
+    async with admit("callbacks"):
+        try:
+            removed = await asyncio.to_thread(
+                subscription_store().delete_callback, data.api_key
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to delete callback: {e}"
+            ) from e
+
+    if not removed:
+        return INVALID_API_KEY
+
+    callback_configs.pop(data.api_key)
+    return {"status": "success", "message": "Callback deleted."}
@@ -15,33 +15,162 @@ Endpoint Function:
 
 Functions:
     - _get_user_data(api_key: str): Retrieve existing user data using the provided API key.
-    - _send_telegram_message(url: str): Send a Telegram message using the specified URL.
+    - _send_telegram_message(bot: Bot, api_key: str, chat_id: int, text: str, ...): Queue a Telegram message for the given chat.
+    - _stream_telegram_message(bot: Bot, api_key: str, chat_id: int, text: str, ...): Send or edit the message of a progress stream.
+    - _send_telegram_document(bot: Bot, api_key: str, chat_id: int, caption: str, ...): Send a large notification as a document.
+
+Delivery:
+    Messages are not sent inline. They are queued on the delivery lane matching the
+    request's `priority` and dispatched by the scheduler of the bot the subscriber
+    subscribed through, which enforces that bot's Telegram rate limits.
+
+Large Notifications:
+    A notification longer than one Telegram message (4096 characters) is split into
+    several messages. Above `LARGE_PAYLOAD_THRESHOLD` characters it is instead sent
+    with a single sendDocument call: the `data` as pretty JSON (or a rendered template
+    as text), streamed with bounded memory, with the start of the text as caption.
+    Documents are not stored for a retry; a transient failure gets a 503 with
+    `Retry-After`.
+
+Templates:
+    Instead of `data`, a request may name one of the subscriber's stored templates in
+    `template` and pass its variables in `vars`. Compiled templates are cached in
+    `template_cache`.
+
+Lookups:
+    Subscriptions are looked up through `subscription_loader`, which gathers the
+    lookups of concurrent requests for `LOOKUP_BATCH_WINDOW` seconds and resolves them
+    with one `$in` query, so concurrent requests for the same key share one lookup.
+
+Encodings:
+    The body is read by the `form_input` dependency: JSON by default, or MessagePack
+    with `Content-Type: application/msgpack`. Both are validated as `FormInput`.
+
+Authentication:
+    Signed API keys (see `services.apikeys`) are verified without I/O, and forged or
+    revoked keys are rejected before anything else. A signed key names the chat and
+    bot of the subscription, so plain messages are delivered without a lookup; only
+    templates need the subscription document. Random keys issued before signed keys
+    are looked up as before.
+
+Quotas:
+    Every API key is subject to a rate limit and a daily quota, enforced from in-memory
+    counters before the database is queried. Requests over a limit get a 429 response
+    with a `Retry-After` header.
+
+Unreachable Chats:
+    When Telegram reports that the subscriber blocked the bot, deleted the chat or was
+    deactivated, the subscription is flagged as unreachable and the request gets a 410.
+    Later requests for the key get a 410 without any outbound call, and without a
+    database lookup while the key is in `unreachable_chats`. The bot clears the flag
+    when the subscriber sends /start; the API notices on the next lookup, or within
+    `UNREACHABLE_RECHECK_INTERVAL` seconds when it rereads the flags of cached keys.
+
+Progress Streams:
+    Notifications sharing a `stream_id` update one message instead of sending new ones.
+    The first sends a message, whose id is kept in `stream_registry`; later ones edit
+    it with editMessageText. Edits are at least `STREAM_DEBOUNCE` seconds apart, and
+    updates arriving meanwhile are coalesced so only the latest text is pushed.
+    Updates longer than one Telegram message are truncated to fit it.
+
+Callbacks:
+    Every accepted notification gets a `notification_id`, returned in the response
+    body (or the `X-Notification-Id` header of an error). When the subscriber
+    registered a callback URL, its outcome ("sent", "failed" or "dead_lettered") is
+    also POSTed there asynchronously, batched with other outcomes for the same URL.
+
+History:
+    Every sent or queued notification is recorded, with its rendered text, through
+    `record_history`. Entries are buffered and written in batches in the background,
+    and can be read with GET /history or the bot's /history command.
+
+Retries:
+    A delivery failing with a timeout, a 429 or a Telegram 5xx is stored in the retry
+    collection and the request gets a 202 with status "queued". The retry worker in
+    `api.V1.deps` attempts it again with jittered exponential backoff and moves it to
+    the dead-letter collection after `RETRY_MAX_ATTEMPTS` attempts.
+
+Admission Control:
+    At most `ADMISSION_MAX_IN_FLIGHT` requests are processed at once, with a short wait
+    queue in front. Requests that cannot be admitted get a 503 with `Retry-After`.
+    Admission runs before the body is read, so the limiter of a priority is chosen by
+    the `X-Priority` header rather than the body's `priority`.
 
 Exceptions:
     - HTTPException: Raised in case of API or Telegram-related errors, providing appropriate status codes and details.
 
 """
-import requests
+import time
+from typing import Optional
+from uuid import uuid4
+
+from api.V1.deps import (
+    admission,
+    authenticate,
+    bot_pool,
+    enforce_quota,
+    form_input,
+    mark_unreachable,
+    quota_manager,
+    record_history,
+    reject_unreachable,
+    report_outcome,
+    resolve_callback,
+    retry_policy,
+    retry_store,
+    stream_registry,
+    subscription_callback,
+    subscription_loader,
+    template_cache,
+)
 from config.config import Config
-from fastapi import APIRouter, HTTPException
-from models.form import FormClass
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from schemas.form import FormInput
+from services.apikeys import InvalidApiKey
+from services.bots import Bot, UnknownBot
+from services.documents import (
+    MESSAGE_LIMIT,
+    json_document,
+    split_text,
+    summarize,
+    text_document,
+)
+from services.logs import annotate, stage
+from services.payloads import MEDIA_TYPES
+from services.telegram import TelegramAPIError
+from services.templates import TemplateError
 
+from .template import INVALID_API_KEY
 from .utils import join_dict_values
 
 contact_form = APIRouter()
 
 
-TELEGRAM_API_URL = "https://api.telegram.org/bot{}/sendMessage?chat_id={}&text={}"
+def _request_body(model) -> dict:
+    """Describe a body accepted in every media type of `MEDIA_TYPES` in OpenAPI."""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {"schema": schema} for media_type in MEDIA_TYPES},
+        }
+    }
 
 
-@contact_form.post("/RapidNotify")
-async def register_form_input(data: FormInput):
+@contact_form.post(
+    "/RapidNotify",
+    openapi_extra=_request_body(FormInput),
+    # Admit before `form_input` reads the body, so load is shed without receiving it
+    dependencies=[Depends(admission("RapidNotify"))],
+)
+async def register_form_input(data: FormInput = Depends(form_input)):
     """
     Handles POST requests to the /RapidNotify endpoint for rapid notification form input.
 
     Args:
-        data (FormInput): The input data received from the form.
+        data (FormInput): The input data received from the form, as JSON or MessagePack.
 
     Returns:
         str: The text response from the Telegram API after sending the notification.
@@ -50,9 +179,10 @@ async def register_form_input(data: FormInput):
         HTTPException: Raised in case of API or Telegram-related errors, providing appropriate status codes and details.
     """
 
-    def _get_user_data(api_key: str):
+    async def _get_user_data(api_key: str):
         """
-        Retrieve existing user data using the provided API key.
+        Retrieve existing user data using the provided API key, batched with the
+        lookups of concurrent requests.
 
         Args:
             api_key (str): The API key associated with the user.
@@ -63,36 +193,252 @@ async def register_form_input(data: FormInput):
         Raises:
             HTTPException: Raised if there's an error retrieving user data.
         """
-        form_instance = FormClass()
         try:
-            return form_instance.get(api_key)
+            return await subscription_loader.load(api_key)
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to retrieve existing user data: {e}"
             ) from e
 
-    def _send_telegram_message(url: str):
+    async def _send_telegram_message(
+        bot: Bot,
+        api_key: str,
+        chat_id: int,
+        text: str,
+        priority: str,
+        callback: Optional[dict],
+        notification_id: str,
+    ):
         """
-        Send a Telegram message using the specified URL.
+        Queue a Telegram message for the given chat and wait until it is sent.
 
         Args:
-            url (str): The URL for sending the Telegram message.
+            bot (Bot): The bot the message is sent by.
+            api_key (str): The API key of the subscriber.
+            chat_id (int): The chat the message is delivered to.
+            text (str): The message text.
+            priority (str): The delivery lane the message is queued on.
+            callback (Optional[dict]): The callback registration of the subscriber.
+            notification_id (str): The id the outcome is reported under.
+
+        A text longer than a Telegram message is sent as several messages, in order.
+        Transient failures are stored for a later retry instead of being raised,
+        together with the parts not sent yet. Other outcomes are reported to the
+        subscriber's callback.
 
         Returns:
-            requests.Response: The response from the Telegram API.
+            Optional[dict]: The (last) sent Telegram message, or None if it was queued
+                for a retry.
 
         Raises:
             HTTPException: Raised if there's an error sending the Telegram message.
         """
+        headers = {"X-Notification-Id": notification_id}
+        parts = split_text(text)
+        for index, part in enumerate(parts):
+            try:
+                sent = await bot.scheduler.submit(
+                    priority, chat_id, bot.client.send_message, chat_id, part
+                )
+            except TelegramAPIError as e:
+                if e.chat_unreachable:
+                    report_outcome(callback, notification_id, "failed", 1, str(e))
+                    exception = await mark_unreachable(api_key, chat_id, e)
+                    exception.headers = headers
+                    raise exception from e
+                if not retry_policy.should_retry(e, 1):
+                    report_outcome(callback, notification_id, "failed", 1, str(e))
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Failed to send Telegram message: {e}",
+                        headers=headers,
+                    ) from e
+                error = e
+                break
+        else:
+            report_outcome(callback, notification_id, "sent", 1)
+            return sent
+
+        try:
+            # The parts not sent yet are retried together, in order
+            retry_store().enqueue(
+                bot.client.bot_id,
+                chat_id,
+                text,
+                priority,
+                str(error),
+                1,
+                time.time() + retry_policy.delay(1, error.retry_after),
+                api_key=api_key,
+                notification_id=notification_id,
+                parts=parts if len(parts) > 1 else None,
+                part=index,
+            )
+        except Exception as e:
+            report_outcome(callback, notification_id, "failed", 1, str(error))
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to send Telegram message: {error}",
+                headers=headers,
+            ) from e
+
+    async def _send_telegram_document(
+        bot: Bot,
+        api_key: str,
+        chat_id: int,
+        caption: str,
+        priority: str,
+        callback: Optional[dict],
+        notification_id: str,
+        document: tuple,
+    ):
+        """
+        Send a large notification as one document, captioned with its summary.
+
+        Args:
+            bot (Bot): The bot the document is sent by.
+            api_key (str): The API key of the subscriber.
+            chat_id (int): The chat the document is delivered to.
+            caption (str): The summary shown with the document.
+            priority (str): The delivery lane the document is queued on.
+            callback (Optional[dict]): The callback registration of the subscriber.
+            notification_id (str): The id the outcome is reported under.
+            document (tuple): The file name, content type, chunks and size in bytes.
+
+        Returns:
+            dict: The sent Telegram message.
+
+        Raises:
+            HTTPException: Raised if the document could not be sent; 503 with
+                `Retry-After` for transient failures.
+        """
+        headers = {"X-Notification-Id": notification_id}
+        filename, content_type, chunks, size = document
         try:
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()  # Raise HTTPError for bad responses
-            return response
-        except requests.RequestException as e:
+            sent = await bot.scheduler.submit(
+                priority,
+                chat_id,
+                bot.client.send_file,
+                chat_id,
+                "document",
+                filename,
+                chunks,
+                size,
+                caption,
+                content_type,
+            )
+        except TelegramAPIError as e:
+            report_outcome(callback, notification_id, "failed", 1, str(e))
+            if e.chat_unreachable:
+                exception = await mark_unreachable(api_key, chat_id, e)
+                exception.headers = headers
+                raise exception from e
+            if retry_policy.is_transient(e):
+                headers["Retry-After"] = str(
+                    int(e.retry_after or retry_policy.delay(1))
+                )
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Failed to send Telegram document, retry later: {e}",
+                    headers=headers,
+                ) from e
             raise HTTPException(
-                status_code=500, detail=f"Failed to send Telegram message: {e}"
+                status_code=500,
+                detail=f"Failed to send Telegram document: {e}",
+                headers=headers,
             ) from e
 
+        report_outcome(callback, notification_id, "sent", 1)
+        return sent
+
+    async def _stream_telegram_message(
+        bot: Bot,
+        api_key: str,
+        chat_id: int,
+        text: str,
+        priority: str,
+        callback: Optional[dict],
+        notification_id: str,
+        stream_id: str,
+    ):
+        """
+        Send the first message of a progress stream, or edit it with the latest text.
+
+        A stream is one message, so text longer than a Telegram message is truncated
+        rather than split or sent as a document.
+
+        Args:
+            bot (Bot): The bot the message is sent by.
+            api_key (str): The API key of the subscriber.
+            chat_id (int): The chat the message is delivered to.
+            text (str): The message text.
+            priority (str): The delivery lane the message is queued on.
+            callback (Optional[dict]): The callback registration of the subscriber.
+            notification_id (str): The id the outcome is reported under.
+            stream_id (str): The stream the update belongs to.
+
+        Returns:
+            Optional[dict]: The sent or edited Telegram message, or None if the first
+                message was queued for a retry.
+
+        Raises:
+            HTTPException: Raised if the message could not be sent or edited.
+        """
+        headers = {"X-Notification-Id": notification_id}
+        if len(text) > MESSAGE_LIMIT:
+            text = text[: MESSAGE_LIMIT - 1] + "…"
+
+        async def send(text: str):
+            return await _send_telegram_message(
+                bot, api_key, chat_id, text, priority, None, notification_id
+            )
+
+        async def edit(message_id: int, text: str):
+            try:
+                return await bot.scheduler.submit(
+                    priority,
+                    chat_id,
+                    bot.client.edit_message_text,
+                    chat_id,
+                    message_id,
+                    text,
+                )
+            except TelegramAPIError as e:
+                if e.message_not_modified:
+                    return {"message_id": message_id}
+                if e.message_uneditable:
+                    # The message was deleted or is too old; continue in a new one
+                    return await send(text)
+                if e.chat_unreachable:
+                    exception = await mark_unreachable(api_key, chat_id, e)
+                    exception.headers = headers
+                    raise exception from e
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to edit Telegram message: {e}",
+                    headers=headers,
+                ) from e
+
+        try:
+            sent = await stream_registry.push((api_key, stream_id), text, send, edit)
+        except HTTPException as e:
+            report_outcome(callback, notification_id, "failed", 1, str(e.detail))
+            raise
+
+        if sent is not None:
+            report_outcome(callback, notification_id, "sent", 1)
+        return sent
+
+    # Reject forged and revoked keys with CPU only
+    try:
+        signed_key = authenticate(data.api_key)
+    except InvalidApiKey:
+        return INVALID_API_KEY
+
+    # Reject keys over their rate limit or daily quota before any lookup
+    enforce_quota(data.api_key)
+    reject_unreachable(data.api_key)
+
     try:
         user_dict = data.model_dump(exclude_unset=True)
     except Exception as e:
@@ -103,22 +449,107 @@ async def register_form_input(data: FormInput):
     api_key = user_dict["api_key"]
 
     try:
-        response = _get_user_data(api_key)
+        with stage("lookup"):
+            if signed_key is not None and data.template is None:
+                # A signed key names its chat and bot, so no lookup is needed
+                response = [{"_id": signed_key.chat_id, "bot_id": signed_key.bot_id}]
+                callback = await resolve_callback(api_key)
+            else:
+                response = await _get_user_data(api_key)
+                callback = response and subscription_callback(api_key, response[0])
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve existing user data: {e}"
         ) from e
 
     if not response:
-        return {
-            "status": "error",
-            "message": "Invalid API key. Please provide a valid API key.",
-        }
+        annotate(outcome="invalid_key")
+        return INVALID_API_KEY
+
+    quota_manager.record(api_key)
+    if signed_key is None or data.template is not None:
+        reject_unreachable(api_key, response[0])
 
     uuid = response[0]["_id"]
-    message = join_dict_values(user_dict["data"])
+    if data.template is not None:
+        source = response[0].get("templates", {}).get(data.template)
+        if source is None:
+            raise HTTPException(
+                status_code=404, detail=f"Unknown template: {data.template}"
+            )
+        try:
+            with stage("render"):
+                compiled = template_cache.get(api_key, data.template, source)
+                message = compiled.render(data.vars or {})
+        except TemplateError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+    else:
+        message = join_dict_values(user_dict["data"])
+
+    notification_id = uuid4().hex
+    try:
+        bot = bot_pool.for_subscription(response[0])
+    except UnknownBot as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    delivery = (
+        bot,
+        api_key,
+        uuid,
+        message,
+        data.priority.value,
+        callback,
+        notification_id,
+    )
+    with stage("deliver"):
+        if data.stream_id is not None:
+            sent = await _stream_telegram_message(*delivery, data.stream_id)
+        elif len(message) > Config.LARGE_PAYLOAD_THRESHOLD:
+            name = f"notification-{notification_id[:8]}"
+            if data.template is None:
+                chunks, size = json_document(user_dict["data"])
+                document = (f"{name}.json", "application/json", chunks, size)
+            else:
+                chunks, size = text_document(message)
+                document = (f"{name}.txt", "text/plain", chunks, size)
+            message = summarize(message, Config.LARGE_PAYLOAD_SUMMARY_LENGTH, size)
+            annotate(document_bytes=size)
+            sent = await _send_telegram_document(
+                bot,
+                api_key,
+                uuid,
+                message,
+                data.priority.value,
+                callback,
+                notification_id,
+                document,
+            )
+        else:
+            sent = await _send_telegram_message(*delivery)
+
+    # Large notifications are recorded with the caption of their document
+    record_history(
+        notification_id,
+        uuid,
+        bot.client.bot_id,
+        message,
+        data.priority.value,
+        "queued" if sent is None else "sent",
+        data.stream_id,
+    )
 
-    telegram_url = TELEGRAM_API_URL.format(Config.BOT_KEY, uuid, message)
-    _send_telegram_message(telegram_url)
+    if sent is None:
+        annotate(outcome="queued")
+        return JSONResponse(
+            status_code=202,
+            content={
+                "status": "queued",
+                "message": "Delivery failed temporarily and will be retried.",
+                "notification_id": notification_id,
+            },
+        )
 
-    return {"status": "success", "message": "Notification sent successfully."}
+    return {
+        "status": "success",
+        "message": "Notification sent successfully.",
+        "notification_id": notification_id,
+    }
@@ -0,0 +1,120 @@
+"""
+Module: history
+
+This module defines the endpoint reading the history of the notifications sent to a
+subscriber.
+
+Endpoints:
+    - GET /history: Read a page of the subscriber's notifications, newest first.
+
+Usage:
+    ```bash
+    curl "https://endpoint.com/history?api_key=KEY&limit=20"
+    curl "https://endpoint.com/history?api_key=KEY&limit=20&cursor=NEXT_CURSOR"
+    ```
+
+Pagination:
+    Pages are read with keyset pagination: `next_cursor` encodes the position of the
+    last entry of a page, and passing it back returns the entries after it. Every
+    page is an index range scan, however deep, and notifications recorded meanwhile
+    do not shift the pages. `next_cursor` is null on the last page.
+
+Notes:
+    - History is written in the background, so a notification shows up within
+      `HISTORY_FLUSH_INTERVAL` seconds of being sent.
+    - Entries older than `HISTORY_TTL` seconds are deleted.
+
+Exceptions:
+    - HTTPException: 400 for an invalid cursor, 503 when saturated and 500 for
+      database errors.
+"""
+import asyncio
+from typing import Optional
+
+from api.V1.deps import (
+    admit,
+    authenticate,
+    enforce_quota,
+    history_store,
+    subscription_loader,
+)
+from fastapi import APIRouter, HTTPException, Query
+from services.apikeys import InvalidApiKey
+from services.history import InvalidCursor, decode_cursor, encode_cursor, timestamp
+
+from .template import INVALID_API_KEY
+
+history = APIRouter()
+
+
+@history.get("/history")
+async def read_history(
+    api_key: str,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """
+    Handles GET requests to the /history endpoint.
+
+    Args:
+        api_key (str): The key identifying the subscriber.
+        limit (int): Maximum number of notifications returned.
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+
+    Returns:
+        dict: The notifications, newest first, and the cursor of the next page.
+
+    Raises:
+        HTTPException: Raised for an invalid cursor or if the history cannot be read.
+    """
+    try:
+        signed_key = authenticate(api_key)
+    except InvalidApiKey:
+        return INVALID_API_KEY
+
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    enforce_quota(api_key)
+
+    async with admit("history"):
+        try:
+            if signed_key is not None:
+                chat_id = signed_key.chat_id
+            else:
+                response = await subscription_loader.load(api_key)
+                if not response:
+                    return INVALID_API_KEY
+                chat_id = response[0]["_id"]
+
+            # One extra entry tells whether there is a next page
+            entries = await asyncio.to_thread(
+                history_store().page, chat_id, limit + 1, after
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to read history: {e}"
+            ) from e
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1]["sent_at"], entries[-1]["_id"])
+
+    return {
+        "status": "success",
+        "notifications": [
+            {
+                "notification_id": entry["_id"],
+                "text": entry["text"],
+                "status": entry.get("status"),
+                "priority": entry.get("priority"),
+                "stream_id": entry.get("stream_id"),
+                "sent_at": timestamp(entry["sent_at"]).isoformat(),
+            }
+            for entry in entries
+        ],
+        "next_cursor": next_cursor,
+    }
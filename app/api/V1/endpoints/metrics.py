@@ -0,0 +1,72 @@
+"""
+Module: metrics
+
+This module exposes runtime metrics of the RapidNotify service.
+
+Endpoints:
+    - GET /metrics/delivery: Per-bot call counters and per-lane queue depth and wait time
+      of outbound delivery.
+    - GET /metrics/admission: In-flight, rejected and queued requests per route.
+    - GET /metrics/callbacks: Pending, sent and failed delivery callbacks.
+    - GET /metrics/lookups: Subscription lookups and the batched queries resolving them.
+"""
+from api.V1.deps import (
+    admission_controller,
+    bot_pool,
+    callback_dispatcher,
+    subscription_loader,
+)
+from fastapi import APIRouter
+
+metrics = APIRouter()
+
+
+@metrics.get("/metrics/delivery")
+async def delivery_metrics():
+    """
+    Report the state of the outbound delivery lanes of every bot.
+
+    Returns:
+        dict: For every bot id, the number of Bot API calls and failed calls, the
+            number of in-flight deliveries and, for every lane, its queue depth,
+            enqueued/dispatched counters and average/maximum wait time in milliseconds.
+    """
+    return bot_pool.snapshot()
+
+
+@metrics.get("/metrics/admission")
+async def admission_metrics():
+    """
+    Report the state of the admission limiters.
+
+    Returns:
+        dict: For every route (or route and priority) with its own limits, the
+            in-flight and waiting requests, admitted/rejected counters and the
+            average/maximum time requests waited for a slot in milliseconds.
+    """
+    return admission_controller.snapshot()
+
+
+@metrics.get("/metrics/callbacks")
+async def callback_metrics():
+    """
+    Report the state of the delivery callbacks.
+
+    Returns:
+        dict: The outcome events waiting for their batch window, the batches in
+            flight, and the counters of queued events, delivered and failed batches
+            and events dropped because a receiver fell behind.
+    """
+    return callback_dispatcher.snapshot()
+
+
+@metrics.get("/metrics/lookups")
+async def lookup_metrics():
+    """
+    Report how subscription lookups are batched.
+
+    Returns:
+        dict: The lookups requested, the distinct API keys and the `$in` queries they
+            were resolved with, and the lookups waiting for their batch window.
+    """
+    return subscription_loader.snapshot()
@@ -0,0 +1,130 @@
+"""
+Module: template
+
+This module defines endpoints for managing the message templates of a subscriber.
+
+Endpoints:
+    - PUT /templates: Register or replace a named template.
+    - DELETE /templates: Remove a named template.
+
+Usage:
+    ```bash
+    curl -X PUT -H "Content-Type: application/json" \
+        -d '{"api_key": "KEY", "name": "deploy", "template": "Deployed {version} to {env}"}' \
+        https://endpoint.com/templates
+    ```
+
+    Registered templates are used by sending `template` and `vars` to /RapidNotify.
+
+Exceptions:
+    - HTTPException: 400 for templates that do not compile, 503 when saturated and
+      500 for database errors.
+"""
+import asyncio
+
+from api.V1.deps import (
+    admit,
+    authenticate,
+    enforce_quota,
+    subscription_store,
+    template_cache,
+)
+from fastapi import APIRouter, HTTPException
+from schemas.template import TemplateDeleteInput, TemplateInput
+from services.apikeys import InvalidApiKey
+from services.templates import TemplateError, compile_template
+
+templates = APIRouter()
+
+INVALID_API_KEY = {
+    "status": "error",
+    "message": "Invalid API key. Please provide a valid API key.",
+}
+
+
+@templates.put("/templates")
+async def register_template(data: TemplateInput):
+    """
+    Handles PUT requests to the /templates endpoint.
+
+    Args:
+        data (TemplateInput): The API key, template name and template source.
+
+    Returns:
+        dict: The status of the registration.
+
+    Raises:
+        HTTPException: Raised if the template is invalid or cannot be stored.
+    """
+    try:
+        authenticate(data.api_key)
+    except InvalidApiKey:
+        return INVALID_API_KEY
+
+    enforce_quota(data.api_key)
+
+    try:
+        compiled = compile_template(data.template)
+    except TemplateError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    async with admit("templates"):
+        try:
+            stored = await asyncio.to_thread(
+                subscription_store().set_template,
+                data.api_key,
+                data.name,
+                data.template,
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to store template: {e}"
+            ) from e
+
+    if not stored:
+        return INVALID_API_KEY
+
+    template_cache.invalidate(data.api_key, data.name)
+    return {
+        "status": "success",
+        "message": f"Template '{data.name}' saved.",
+        "variables": sorted(compiled.fields),
+    }
+
+
+@templates.delete("/templates")
+async def delete_template(data: TemplateDeleteInput):
+    """
+    Handles DELETE requests to the /templates endpoint.
+
+    Args:
+        data (TemplateDeleteInput): The API key and template name.
+
+    Returns:
+        dict: The status of the deletion.
+
+    Raises:
+        HTTPException: Raised if the template cannot be removed.
+    """
+    try:
+        authenticate(data.api_key)
+    except InvalidApiKey:
+        return INVALID_API_KEY
+
+    enforce_quota(data.api_key)
+
+    async with admit("templates"):
+        try:
+            removed = await asyncio.to_thread(
+                subscription_store().delete_template, data.api_key, data.name
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to delete template: {e}"
+            ) from e
+
+    if not removed:
+        return INVALID_API_KEY
+
+    template_cache.invalidate(data.api_key, data.name)
+    return {"status": "success", "message": f"Template '{data.name}' deleted."}
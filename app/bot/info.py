@@ -10,8 +10,17 @@ Functions:
 - `bot_help(name: str) -> str`: Generate a help message providing assistance and quick tips.
 - `bot_subscribe(name: str, api_key: str) -> str`: Generate a subscription confirmation message
   with the user's API key and instructions on getting started.
+- `bot_templates(name: str, templates: dict) -> str`: Generate a message listing the user's
+  stored message templates and how to add new ones.
+- `bot_template_saved(name: str, template_name: str, variables: list) -> str`: Generate a
+  confirmation message for a stored template.
+- `bot_history(name: str, entries: list, first_page: bool) -> str`: Generate a page of the
+  notifications sent to the user.
 """
 
+# Characters of every notification shown by /history, so a page fits in one message
+MAX_HISTORY_TEXT = 300
+
 
 def bot_welcome(name):
     """
@@ -81,6 +90,8 @@ If you ever find yourself in a bit of a pickle or just want to explore the full
    - /start - Begin your RapidNotifyBot journey.
    - /help - Access the command list and get assistance.
    - /subscribe - Obtain your personalized API key.
+   - /template - List or save message templates.
+   - /history - Review the notifications sent to you.
 
 🌐 **Connect with Us:**
 Your feedback and questions are valuable to us. Don't hesitate to reach out via t.me/amitdas99. – we're here to make your RapidNotifyBot experience smooth and enjoyable!
@@ -130,3 +141,88 @@ Simply use your API key in your POST requests and let the notifications flow. Th
 Best regards,
 The RapidNotifyBot Team
 """
+
+
+def bot_templates(name, templates):
+    """
+    Generate a message listing the user's stored message templates.
+
+    Parameters:
+    - name (str): The user's first name.
+    - templates (dict): The stored templates, keyed by template name.
+
+    Returns:
+    str: A formatted message listing the templates and explaining how to add one.
+    """
+
+    listing = "\n".join(
+        f"- `{template_name}`: `{source.replace('`', '')}`"
+        for template_name, source in templates.items()
+    )
+
+    return f"""
+📝 **Your Message Templates**
+
+Hello {name}! {"Here are your saved templates:" if templates else "You have no saved templates yet."}
+{listing}
+
+✨ **How to Add a Template:**
+Send `/template <name> <text>` and use `{{variable}}` for the values that change, e.g.
+`/template deploy Deployed {{version}} to {{env}}`
+
+Then send `{{"api_key": "...", "template": "deploy", "vars": {{"version": "1.2", "env": "prod"}}}}` to /RapidNotify.
+"""
+
+
+def bot_template_saved(name, template_name, variables):
+    """
+    Generate a confirmation message for a stored message template.
+
+    Parameters:
+    - name (str): The user's first name.
+    - template_name (str): The name of the stored template.
+    - variables (list): The variables used by the template.
+
+    Returns:
+    str: A formatted confirmation message.
+    """
+
+    return f"""
+✅ **Template Saved!**
+
+Thanks {name}! Your template `{template_name}` is ready to use.
+Variables: {", ".join(f"`{variable}`" for variable in variables) or "none"}
+"""
+
+
+def bot_history(name, entries, first_page=True):
+    """
+    Generate a page of the notifications sent to the user, newest first.
+
+    The message is meant to be sent without a parse mode, as notification texts may
+    contain any characters.
+
+    Parameters:
+    - name (str): The user's first name.
+    - entries (list): The history entries of the page, with `sent_at`, `status` and `text`.
+    - first_page (bool): Whether this is the newest page.
+
+    Returns:
+    str: A formatted message listing the notifications.
+    """
+
+    if not entries:
+        if first_page:
+            return f"📭 Hello {name}! No notifications were sent to you recently."
+        return "📭 There are no older notifications."
+
+    listing = "\n\n".join(
+        f"🕒 {entry['sent_at']:%Y-%m-%d %H:%M:%S} UTC · {entry.get('status', 'sent')}\n"
+        f"{entry['text'][:MAX_HISTORY_TEXT]}"
+        f"{'…' if len(entry['text']) > MAX_HISTORY_TEXT else ''}"
+        for entry in entries
+    )
+
+    return f"""📜 {"Your latest notifications" if first_page else "Older notifications"}
+
+{listing}"""
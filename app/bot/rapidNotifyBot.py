@@ -2,12 +2,13 @@
 rapidNotifyBot Module
 
 This module provides the necessary components for a Telegram bot application. It includes
-functionality for handling commands such as /start, /help, and /subscribe. The bot interacts
+functionality for handling commands such as /start, /help, /subscribe, /template and /history. The bot interacts
 with a MongoDB database for user subscriptions and retrieves configuration settings from
 environment variables using the `Config` class.
 
 Module Components:
-- Logging: Configures logging for the bot with INFO level.
+- Logging: Configures queue-based JSON logging with rotation, so handlers never block
+  on log file I/O.
 - UUID: Utilizes the `uuid` module for generating unique identifiers.
 - Typing: Defines optional and tuple types for type hints.
 - Telegram: Imports necessary classes and constants from the `telegram` library.
@@ -23,34 +24,67 @@ Bot Functions:
 - `bot_help`, `bot_subscribe`, and `bot_welcome`: Functions providing formatted messages
   for user interaction.
 
+API Keys:
+- When `Config.API_KEY_SECRET` is set, `/subscribe` issues signed keys embedding the
+  user's chat id and bot id (see `app.services.apikeys`), which the API verifies
+  without a database lookup. Otherwise random `uuid4` keys are issued. A signed key
+  is replaced, and the old one revoked, when the user moves to another bot. A key
+  revoked by an administrator is replaced with a new one on the next `/subscribe`.
+
+History:
+- `/history` shows the notifications the API sent to the user, newest first, from the
+  history collection. Further pages are read with keyset pagination: the "Older"
+  button carries the cursor of the last entry shown and edits the message in place.
+
+Bot Pool:
+- One application is run per token of `Config.BOT_KEYS`, all with the same handlers.
+  `/subscribe` records the id of the bot the user subscribed through, and the API
+  delivers the user's notifications through that bot.
+
 Configuration:
-- Retrieves bot key, database URL, database name, and table name from environment variables
+- Retrieves bot keys, database URL, database name, and table name from environment variables
   using the `Config` class, which loads values from environment variables.
 """
+import asyncio
 import logging
+import re
+import time
 import uuid
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
-from telegram import Update, constants
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update, constants
+from telegram.ext import (Application, CallbackQueryHandler, CommandHandler,
+                          ContextTypes)
 
 from app.config.config import Config
 from app.db.mongo import (DataBase, MongoDbClientConfig, QueryDataInput,
-                          UploadDataInput)
+                          ScanDataInput, UpdateDataInput, UploadDataInput)
+from app.services.apikeys import ApiKeySigner
+from app.services.history import (InvalidCursor, decode_cursor, encode_cursor,
+                                  page_query, timestamp)
+from app.services.logs import configure_logging
+from app.services.templates import (MAX_TEMPLATE_LENGTH, NAME_PATTERN,
+                                    TemplateError, compile_template)
 
 from .info import bot_help as bot_help_msg
-from .info import bot_subscribe, bot_welcome
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("rapidNotifyBot.log", mode="a"),
-        logging.StreamHandler(),
-    ],
+from .info import (bot_history, bot_subscribe, bot_template_saved,
+                   bot_templates, bot_welcome)
+
+configure_logging(
+    "rapidNotifyBot.log",
+    level=Config.LOG_LEVEL,
+    max_bytes=Config.LOG_MAX_BYTES,
+    backup_count=Config.LOG_BACKUP_COUNT,
+    rotate_when=Config.LOG_ROTATE_WHEN,
 )
 db = DataBase(MongoDbClientConfig(**{"db_url": Config.DB_URL}))
 rapidBotDB = {"db_name": Config.DB_NAME, "table_name": Config.TABLE_NAME}
+revokedKeysDB = {
+    "db_name": Config.DB_NAME,
+    "table_name": Config.REVOKED_KEYS_TABLE_NAME,
+}
+historyDB = {"db_name": Config.DB_NAME, "table_name": Config.HISTORY_TABLE_NAME}
+api_key_signer = ApiKeySigner(Config.API_KEY_SECRET)
 
 logger = logging.getLogger("rapidNotifyBot")
 
@@ -80,6 +114,9 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Handles the /start command in Telegram. Sends a welcome message in private chats.
 
+    Starting the bot again also clears the unreachable flag the API sets on the
+    user's subscription when the user blocked the bot.
+
     Parameters:
     - update (Update): The Telegram update object.
     - context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
@@ -91,13 +128,27 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Exception: If an error occurs during the execution of the function.
     """
     # Extract common user information
-    _, name, _ = await common_args(update)
+    user_id, name, _ = await common_args(update)
 
     # Determine the chat type (group or private)
     chat_type = update.message.chat.type
 
     if chat_type == "private":
         try:
+            # The user can be messaged again
+            data = {
+                "filter": {"_id": user_id, "unreachable": True},
+                "data": {
+                    "$unset": {
+                        "unreachable": "",
+                        "unreachable_reason": "",
+                        "unreachable_since": "",
+                    }
+                },
+            }
+            data.update(rapidBotDB)
+            db.update(UpdateDataInput(**data))
+
             # Typing Action
             await context.bot.send_chat_action(
                 update.effective_chat.id, action=constants.ChatAction.TYPING
@@ -154,6 +205,54 @@ async def bot_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
             logger.error(e)
 
 
+def issue_api_key(user_id: int, bot_id: int) -> str:
+    """
+    Issues an API key: signed when `API_KEY_SECRET` is set, a random uuid4 otherwise.
+
+    Parameters:
+    - user_id (int): The chat the key delivers to.
+    - bot_id (int): The bot the key delivers through.
+
+    Returns:
+    str: The API key.
+    """
+    if api_key_signer.enabled:
+        return api_key_signer.issue(user_id, bot_id)
+    return str(uuid.uuid4())
+
+
+def is_revoked(api_key: str) -> bool:
+    """
+    Checks whether an API key is on the revocation list.
+
+    Parameters:
+    - api_key (str): The API key.
+
+    Returns:
+    bool: True if the key was revoked.
+    """
+    data = {"data": {"_id": api_key_signer.key_id(api_key)}}
+    data.update(revokedKeysDB)
+    return bool(db.query(QueryDataInput(**data)))
+
+
+def revoke(api_key: str, user_id: int) -> None:
+    """
+    Adds an API key to the revocation list.
+
+    Parameters:
+    - api_key (str): The API key.
+    - user_id (int): The chat of its subscription.
+    """
+    data = {
+        "filter": {"_id": api_key_signer.key_id(api_key)},
+        "data": {"$set": {"chat_id": user_id, "revoked": time.time()}},
+        "upsert": True,
+    }
+    data.update(revokedKeysDB)
+    db.update(UpdateDataInput(**data))
+
+
 async def subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Handles the /subscribe command in Telegram. Manages user subscriptions in private chats.
@@ -175,6 +274,7 @@ async def subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
     to include at least the following fields:
         - "_id": User ID
         - "api_key": Unique API key for user subscription
+        - "bot_id": ID of the bot the user subscribed through
     """
     # Extract common user information
     user_id, name, _ = await common_args(update)
@@ -193,11 +293,42 @@ async def subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
             # If user is not subscribed, generate API key and store in the database
             if not query_result:
-                api_key = str(uuid.uuid4())
+                api_key = issue_api_key(user_id, context.bot.id)
                 data["data"]["api_key"] = api_key
+                data["data"]["bot_id"] = context.bot.id
                 db.upload(UploadDataInput(**data))
             else:
-                api_key = query_result[0]["api_key"]
+                api_key = query_result[0].get("api_key")
+                changes = {}
+
+                # A key revoked by an administrator is replaced
+                if api_key is not None and is_revoked(api_key):
+                    api_key = None
+
+                # Pin the subscription to the bot the user is talking to
+                if query_result[0].get("bot_id") != context.bot.id:
+                    changes["bot_id"] = context.bot.id
+
+                    # Signed keys name their bot, so they are replaced and revoked
+                    if (
+                        api_key is not None
+                        and api_key_signer.enabled
+                        and api_key_signer.is_signed(api_key)
+                    ):
+                        revoke(api_key, user_id)
+                        api_key = None
+
+                if api_key is None:
+                    api_key = issue_api_key(user_id, context.bot.id)
+                    changes["api_key"] = api_key
+
+                if changes:
+                    data = {
+                        "filter": {"_id": user_id},
+                        "data": {"$set": changes},
+                    }
+                    data.update(rapidBotDB)
+                    db.update(UpdateDataInput(**data))
 
             # Typing Action
             await context.bot.send_chat_action(
@@ -216,31 +347,210 @@ async def subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
             logger.error(e)
 
 
-def main() -> None:
+async def template(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
-    Entry point for the Telegram bot application.
+    Handles the /template command in Telegram. Lists or stores message templates.
+
+    `/template` lists the user's templates, `/template <name> <text>` stores a template
+    under `name` in the user's subscription document, replacing any existing one.
+
+    Parameters:
+    - update (Update): The Telegram update object.
+    - context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
 
     Returns:
     None
 
-    Configuration:
-    This function retrieves the bot key from the Config.BOT_KEY attribute.
+    Raises:
+    Exception: If an error occurs during the execution of the function.
+    """
+    # Extract common user information
+    user_id, name, _ = await common_args(update)
 
-    Telegram Bot Initialization:
-    The function initializes a Telegram bot using the `Application` class from the
-    underlying framework. The bot is configured with the retrieved bot key.
+    # Determine the chat type (group or private)
+    chat_type = update.message.chat.type
 
-    Command Handlers:
-    The function adds command handlers for the /start, /help, and /subscribe commands,
-    linking them to the corresponding functions: `start`, `help`, and `subscribe`.
+    if chat_type == "private":
+        try:
+            data = {"data": {"_id": user_id}}
+            data.update(rapidBotDB)
+            query_result = db.query(QueryDataInput(**data))
 
-    Polling:
-    The function starts the bot's polling mechanism with `application.run_polling`,
-    allowing the bot to actively listen for incoming updates. The `allowed_updates`
-    parameter is set to `Update.ALL_TYPES` to receive updates of all types.
+            # Templates are stored with the subscription
+            if not query_result:
+                await update.message.reply_text("Please /subscribe first.")
+                return
+
+            # Split "/template <name> <text>" keeping the newlines of the text
+            _, _, arguments = update.message.text.partition(" ")
+            template_name, _, source = arguments.strip().partition(" ")
+            source = source.strip()
+
+            if not template_name or not source:
+                text = bot_templates(name, query_result[0].get("templates", {}))
+            elif not re.match(NAME_PATTERN, template_name):
+                text = "Template names may only contain letters, digits, _ and -."
+            elif len(source) > MAX_TEMPLATE_LENGTH:
+                text = f"Templates may not exceed {MAX_TEMPLATE_LENGTH} characters."
+            else:
+                try:
+                    compiled = compile_template(source)
+                except TemplateError as e:
+                    text = str(e)
+                else:
+                    data = {
+                        "filter": {"_id": user_id},
+                        "data": {"$set": {f"templates.{template_name}": source}},
+                    }
+                    data.update(rapidBotDB)
+                    db.update(UpdateDataInput(**data))
+                    text = bot_template_saved(
+                        name, template_name, sorted(compiled.fields)
+                    )
+
+            # Typing Action
+            await context.bot.send_chat_action(
+                update.effective_chat.id, action=constants.ChatAction.TYPING
+            )
+
+            await update.message.reply_text(
+                text=text,
+                parse_mode="Markdown",
+                disable_web_page_preview=True,
+            )
+
+        # Handle the case if an error occurs
+        except Exception as e:
+            logger.error(e)
+
+
+def history_page(
+    user_id: int, name: str, after: Optional[Tuple] = None
+) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    """
+    Reads a page of the user's notification history and renders it.
+
+    Parameters:
+    - user_id (int): The user, whose chat id the notifications were sent to.
+    - name (str): The user's first name.
+    - after (Optional[Tuple]): The position decoded from the cursor of the previous
+      page, None for the newest page.
+
+    Returns:
+    Tuple[str, Optional[InlineKeyboardMarkup]]: The message text, and the "Older"
+    button if there are more notifications.
+    """
+    page_size = Config.HISTORY_PAGE_SIZE
+
+    # One extra entry tells whether there is an older page
+    data = page_query(user_id, page_size + 1, after)
+    data.update(historyDB)
+    entries = list(db.iterate(ScanDataInput(**data)))
+
+    markup = None
+    if len(entries) > page_size:
+        entries = entries[:page_size]
+        cursor = encode_cursor(entries[-1]["sent_at"], entries[-1]["_id"])
+        markup = InlineKeyboardMarkup(
+            [[InlineKeyboardButton("Older ▶", callback_data=f"history:{cursor}")]]
+        )
+
+    for entry in entries:
+        entry["sent_at"] = timestamp(entry["sent_at"])
+    return bot_history(name, entries, after is None), markup
+
+
+async def history(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Handles the /history command in Telegram. Shows the latest notifications sent to the user.
+
+    Parameters:
+    - update (Update): The Telegram update object.
+    - context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
+
+    Returns:
+    None
+
+    Raises:
+    Exception: If an error occurs during the execution of the function.
+    """
+    # Extract common user information
+    user_id, name, _ = await common_args(update)
+
+    # Determine the chat type (group or private)
+    chat_type = update.message.chat.type
+
+    if chat_type == "private":
+        try:
+            text, markup = history_page(user_id, name)
+
+            # Typing Action
+            await context.bot.send_chat_action(
+                update.effective_chat.id, action=constants.ChatAction.TYPING
+            )
+
+            await update.message.reply_text(
+                text=text,
+                reply_markup=markup,
+                disable_web_page_preview=True,
+            )
+
+        # Handle the case if an error occurs
+        except Exception as e:
+            logger.error(e)
+
+
+async def history_older(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Handles the "Older" button of a /history message by showing the next page in its place.
+
+    The page is read for the user who pressed the button, so a cursor only ever pages
+    through the user's own history.
+
+    Parameters:
+    - update (Update): The Telegram update object.
+    - context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
+
+    Returns:
+    None
+
+    Raises:
+    Exception: If an error occurs during the execution of the function.
     """
-    bot_key = Config.BOT_KEY
+    query = update.callback_query
+
+    try:
+        await query.answer()
+        try:
+            after = decode_cursor(query.data.partition(":")[2])
+        except InvalidCursor:
+            return
+
+        text, markup = history_page(
+            query.from_user.id, query.from_user.first_name, after
+        )
+        await query.edit_message_text(
+            text=text,
+            reply_markup=markup,
+            disable_web_page_preview=True,
+        )
 
+    # Handle the case if an error occurs
+    except Exception as e:
+        logger.error(e)
+
+
+def build_application(bot_key: str) -> Application:
+    """
+    Build the Telegram bot application of one bot token.
+
+    Parameters:
+    - bot_key (str): The bot token.
+
+    Returns:
+    Application: The application with the /start, /help, /subscribe, /template and
+    /history command handlers.
+    """
     # Initialize the Telegram bot application
     application = Application.builder().token(bot_key).build()
 
@@ -248,9 +558,67 @@ def main() -> None:
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", bot_help))
     application.add_handler(CommandHandler("subscribe", subscribe))
+    application.add_handler(CommandHandler("template", template))
+    application.add_handler(CommandHandler("history", history))
+    application.add_handler(CallbackQueryHandler(history_older, pattern="^history:"))
+
+    return application
+
+
+async def run(bot_keys: List[str]) -> None:
+    """
+    Poll every bot of the pool until the task is cancelled.
+
+    Parameters:
+    - bot_keys (List[str]): The bot tokens.
+
+    Returns:
+    None
+    """
+    applications = [build_application(bot_key) for bot_key in bot_keys]
+
+    for application in applications:
+        await application.initialize()
+        await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+        await application.start()
+
+    try:
+        # Serve until interrupted
+        await asyncio.Event().wait()
+    finally:
+        for application in applications:
+            await application.updater.stop()
+            await application.stop()
+            await application.shutdown()
+
 
-    # Start bot polling
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+def main() -> None:
+    """
+    Entry point for the Telegram bot application.
+
+    Returns:
+    None
+
+    Configuration:
+    This function retrieves the bot keys from the Config.BOT_KEYS attribute.
+
+    Telegram Bot Initialization:
+    The function initializes one Telegram bot application per bot key using the
+    `Application` class from the underlying framework, see `build_application`.
+
+    Command Handlers:
+    Every application handles the /start, /help, /subscribe, /template and /history
+    commands, linking them to the corresponding functions: `start`, `help`,
+    `subscribe`, `template` and `history`.
+
+    Polling:
+    The function starts the polling mechanism of every application, allowing the bots
+    to actively listen for incoming updates of all types, until interrupted.
+    """
+    try:
+        asyncio.run(run(Config.BOT_KEYS))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
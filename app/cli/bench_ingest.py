@@ -0,0 +1,145 @@
+"""
+bench_ingest Module
+
+Command line tool comparing the JSON and MessagePack encodings of `/RapidNotify`.
+
+Usage:
+    python -m app.cli.bench_ingest [--iterations N]
+
+For a set of typical alert payloads, prints the size of each encoding and the time
+to turn the body into a validated `FormInput`:
+- json (FastAPI): `json.loads` followed by `model_validate`, as FastAPI parses a
+  body declared as a model.
+- json: `model_validate_json`, as done by the `form_input` dependency.
+- msgpack: `msgpack.unpackb` followed by `model_validate`.
+"""
+import argparse
+import json
+import sys
+import timeit
+
+import msgpack
+
+from app.schemas.form import FormInput
+from app.services.payloads import decode
+
+API_KEY = "rn1.123456789.987654321.Xq3b9Jd2LkP0.f3Ghk2Lx9QpRt8Vw0ZaYbQ"
+
+PAYLOADS = {
+    "minimal": {"api_key": API_KEY, "data": {"message": "Backup finished"}},
+    "alert": {
+        "api_key": API_KEY,
+        "priority": "high",
+        "data": {
+            "service": "checkout-api",
+            "severity": "critical",
+            "host": "web-07.eu-west-1",
+            "metric": "p99_latency_ms",
+            "value": 2315.4,
+            "threshold": 800,
+            "message": "p99 latency above threshold for 5 minutes",
+        },
+    },
+    "progress": {
+        "api_key": API_KEY,
+        "stream_id": "nightly-etl-2023-11-20",
+        "priority": "low",
+        "data": {"job": "nightly-etl", "step": "load", "done": 734, "total": 1200},
+    },
+    "template": {
+        "api_key": API_KEY,
+        "template": "deploy",
+        "vars": {
+            "service": "billing",
+            "version": "2.14.3",
+            "environment": "production",
+            "author": "ci",
+            "duration_s": 182,
+            "changes": ["Fix VAT rounding", "Retry card declines", "Bump pymongo"],
+        },
+    },
+}
+
+
+def measure(function, iterations: int) -> float:
+    """
+    Time a function.
+
+    Parameters:
+    - function (Callable): The function, called without arguments.
+    - iterations (int): Calls per measurement; the best of five is kept.
+
+    Returns:
+    float: Microseconds per call.
+    """
+    best = min(timeit.repeat(function, number=iterations, repeat=5))
+    return best / iterations * 1e6
+
+
+def benchmark(payload: dict, iterations: int) -> dict:
+    """
+    Measure the size and parse cost of a payload in both encodings.
+
+    Parameters:
+    - payload (dict): The `FormInput` document.
+    - iterations (int): Parses per measurement.
+
+    Returns:
+    dict: The sizes in bytes and the parse times in microseconds.
+    """
+    json_body = json.dumps(payload, separators=(",", ":")).encode()
+    msgpack_body = msgpack.packb(payload)
+    # Both encodings must yield the same input
+    assert decode(FormInput, json_body, "application/json") == decode(
+        FormInput, msgpack_body, "application/msgpack"
+    )
+
+    return {
+        "json_bytes": len(json_body),
+        "msgpack_bytes": len(msgpack_body),
+        "fastapi_us": measure(
+            lambda: FormInput.model_validate(json.loads(json_body)), iterations
+        ),
+        "json_us": measure(
+            lambda: decode(FormInput, json_body, "application/json"), iterations
+        ),
+        "msgpack_us": measure(
+            lambda: decode(FormInput, msgpack_body, "application/msgpack"),
+            iterations,
+        ),
+    }
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the command line tool.
+
+    Parameters:
+    - argv (Optional[list]): The command line arguments, defaults to `sys.argv`.
+
+    Returns:
+    int: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the JSON and MessagePack encodings of /RapidNotify."
+    )
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'payload':<10} {'json B':>7} {'msgpack B':>9} {'saved':>6} "
+        f"{'json (FastAPI) us':>17} {'json us':>8} {'msgpack us':>10}"
+    )
+    for name, payload in PAYLOADS.items():
+        result = benchmark(payload, args.iterations)
+        saved = 1 - result["msgpack_bytes"] / result["json_bytes"]
+        print(
+            f"{name:<10} {result['json_bytes']:>7} {result['msgpack_bytes']:>9} "
+            f"{saved:>6.0%} {result['fastapi_us']:>17.2f} {result['json_us']:>8.2f} "
+            f"{result['msgpack_us']:>10.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
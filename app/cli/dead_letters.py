@@ -0,0 +1,89 @@
+"""
+dead_letters Module
+
+Command line tool to replay the deliveries that exhausted their retries.
+
+Usage:
+    python -m app.cli.dead_letters replay [--batch-size N]
+
+The dead-lettered deliveries are moved back to the retry collection, due
+immediately, with one bulk write per batch. The running API picks them up and sends
+them through its delivery scheduler, so the replay is rate limited like any other
+traffic. An interrupted replay can be run again.
+
+Configuration:
+- Reads the database URL, database name and collection names from the `Config` class.
+"""
+import argparse
+import sys
+import time
+
+from app.config.config import Config
+from app.db.mongo import BulkWriteInput, DataBase, MongoDbClientConfig, ScanDataInput
+from app.services.retry import requeue_dead_letters
+
+retryDB = {"db_name": Config.DB_NAME, "table_name": Config.RETRY_TABLE_NAME}
+deadLetterDB = {"db_name": Config.DB_NAME, "table_name": Config.DEAD_LETTER_TABLE_NAME}
+
+
+def replay(db: DataBase, batch_size: int) -> int:
+    """
+    Requeue every dead-lettered delivery.
+
+    Parameters:
+    - db (DataBase): The database.
+    - batch_size (int): Documents per bulk write.
+
+    Returns:
+    int: The number of requeued deliveries.
+    """
+
+    def writer(table):
+        def write_batch(operations):
+            data = {"operations": operations, "ordered": False}
+            data.update(table)
+            db.bulk_write(BulkWriteInput(**data))
+
+        return write_batch
+
+    data = {"batch_size": batch_size, "sort": [["_id", 1]]}
+    data.update(deadLetterDB)
+    return requeue_dead_letters(
+        db.iterate(ScanDataInput(**data)),
+        writer(retryDB),
+        writer(deadLetterDB),
+        batch_size,
+        time.time(),
+    )
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the command line tool.
+
+    Parameters:
+    - argv (Optional[list]): The command line arguments, defaults to `sys.argv`.
+
+    Returns:
+    int: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        description="Replay the RapidNotifyBot dead-lettered deliveries."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser(
+        "replay", help="requeue every dead-lettered delivery"
+    )
+    replay_parser.add_argument("--batch-size", type=int, default=1000)
+
+    args = parser.parse_args(argv)
+    db = DataBase(MongoDbClientConfig(**{"db_url": Config.DB_URL}))
+
+    count = replay(db, args.batch_size)
+    print(f"requeued {count} deliveries", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
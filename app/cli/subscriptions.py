@@ -0,0 +1,140 @@
+"""
+subscriptions Module
+
+Command line tool to export and import the subscriptions collection, e.g. to move a
+subscriber base between clusters or environments.
+
+Usage:
+    python -m app.cli.subscriptions export --output subscriptions.ndjson
+    python -m app.cli.subscriptions import --input subscriptions.ndjson [--offset N]
+        [--batch-size N] [--unordered]
+
+Both commands stream: the export reads a server-side cursor batch by batch and the
+import reads the file line by line, writing each batch with one bulk write of
+upserts. Progress is reported on stderr. When an import fails, the offset printed
+can be passed to `--offset` to resume it.
+
+Configuration:
+- Reads the database URL, database name and table name from the `Config` class.
+"""
+import argparse
+import sys
+
+from app.config.config import Config
+from app.db.mongo import BulkWriteInput, DataBase, MongoDbClientConfig, ScanDataInput
+from app.services.transfer import ImportFailed, export_lines, import_documents
+
+rapidBotDB = {"db_name": Config.DB_NAME, "table_name": Config.TABLE_NAME}
+
+
+def export_subscriptions(db: DataBase, output, batch_size: int) -> int:
+    """
+    Write every subscription to `output` as NDJSON.
+
+    Parameters:
+    - db (DataBase): The source database.
+    - output (BinaryIO): The file the documents are written to.
+    - batch_size (int): Documents fetched per round trip.
+
+    Returns:
+    int: The number of exported documents.
+    """
+    data = {"batch_size": batch_size, "sort": [["_id", 1]]}
+    data.update(rapidBotDB)
+
+    count = 0
+    for line in export_lines(db.iterate(ScanDataInput(**data))):
+        output.write(line)
+        count += 1
+        if count % batch_size == 0:
+            print(f"exported {count} documents", file=sys.stderr)
+    return count
+
+
+def import_subscriptions(
+    db: DataBase, source, batch_size: int, offset: int, ordered: bool
+) -> int:
+    """
+    Upsert the NDJSON documents of `source` into the subscriptions collection.
+
+    Parameters:
+    - db (DataBase): The target database.
+    - source (BinaryIO): The file the documents are read from.
+    - batch_size (int): Documents per bulk write.
+    - offset (int): Number of leading lines to skip.
+    - ordered (bool): Whether each bulk write stops at its first error.
+
+    Returns:
+    int: 0 on success, 1 if the import failed.
+    """
+
+    def write_batch(operations, ordered):
+        data = {"operations": operations, "ordered": ordered}
+        data.update(rapidBotDB)
+        db.bulk_write(BulkWriteInput(**data))
+
+    def on_progress(stats):
+        print(
+            f"offset {stats.offset}: {stats.written} written, {stats.invalid} invalid",
+            file=sys.stderr,
+        )
+
+    try:
+        import_documents(source, write_batch, batch_size, offset, ordered, on_progress)
+    except ImportFailed as e:
+        print(f"{e}\nResume with --offset {e.stats.offset}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the command line tool.
+
+    Parameters:
+    - argv (Optional[list]): The command line arguments, defaults to `sys.argv`.
+
+    Returns:
+    int: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export and import the RapidNotifyBot subscriptions."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="export subscriptions as NDJSON")
+    export_parser.add_argument("--output", default="-", help="file path, - for stdout")
+    export_parser.add_argument("--batch-size", type=int, default=1000)
+
+    import_parser = commands.add_parser(
+        "import", help="import subscriptions from NDJSON"
+    )
+    import_parser.add_argument("--input", default="-", help="file path, - for stdin")
+    import_parser.add_argument("--batch-size", type=int, default=1000)
+    import_parser.add_argument("--offset", type=int, default=0)
+    import_parser.add_argument("--unordered", action="store_true")
+
+    args = parser.parse_args(argv)
+    db = DataBase(MongoDbClientConfig(**{"db_url": Config.DB_URL}))
+
+    if args.command == "export":
+        if args.output == "-":
+            count = export_subscriptions(db, sys.stdout.buffer, args.batch_size)
+        else:
+            with open(args.output, "wb") as output:
+                count = export_subscriptions(db, output, args.batch_size)
+        print(f"exported {count} documents", file=sys.stderr)
+        return 0
+
+    if args.input == "-":
+        return import_subscriptions(
+            db, sys.stdin.buffer, args.batch_size, args.offset, not args.unordered
+        )
+    with open(args.input, "rb") as source:
+        return import_subscriptions(
+            db, source, args.batch_size, args.offset, not args.unordered
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,9 +12,86 @@ class Config:
     file in the project root directory.
 
     Attributes:
-        - DB_URL (str): The URL for connecting to the database.
+        - DB_URL (str): The URL for connecting to the database. A "sqlite:///path.db"
+          URL uses an embedded SQLite file instead of MongoDB.
         - DB_NAME (str): The name of the database.
         - TABLE_NAME (str): The name of the table within the database.
+        - BOT_KEY (str): The Telegram bot token of the default bot, which delivers to
+          subscriptions that do not record the bot they subscribed through.
+        - BOT_KEYS (list): The tokens of every bot, `BOT_KEY` first; extra tokens are
+          read from the comma separated `BOT_KEYS` variable.
+        - API_KEY_SECRET (str): HMAC secret of signed API keys, which embed the chat and
+          bot of a subscription; when unset, random keys are issued and looked up.
+        - REVOKED_KEYS_TABLE_NAME (str): The collection holding the revoked API keys.
+        - API_KEY_REVOCATION_REFRESH (float): Seconds between reloads of the revoked keys.
+        - TELEGRAM_GLOBAL_RATE (float): Messages per second allowed for each bot across all chats.
+        - TELEGRAM_CHAT_RATE (float): Messages per second allowed for each bot and chat.
+        - DELIVERY_WORKERS (int): Number of concurrent delivery workers of each bot.
+        - DELIVERY_STARVATION_TIMEOUT (float): Seconds a queued notification may wait
+          before it is served ahead of higher priority lanes.
+        - MAX_DOCUMENT_BYTES (int): Size limit of a document attachment.
+        - MAX_PHOTO_BYTES (int): Size limit of a photo attachment.
+        - ATTACHMENT_SPOOL_BYTES (int): Bytes of an attachment kept in memory while it
+          is received; larger attachments are spooled to a temporary file.
+        - USAGE_TABLE_NAME (str): The collection holding per-key daily usage counters.
+        - QUOTA_RATE_PER_MINUTE (float): Requests per minute allowed for one API key (0 disables).
+        - QUOTA_DAILY_LIMIT (int): Requests per UTC day allowed for one API key (0 disables).
+        - QUOTA_FLUSH_INTERVAL (float): Seconds between flushes of the usage counters.
+        - TEMPLATE_CACHE_SIZE (int): Number of compiled message templates kept in memory.
+        - ADMISSION_MAX_IN_FLIGHT (int): Requests a route processes concurrently.
+        - ADMISSION_QUEUE_SIZE (int): Requests allowed to wait for a free slot.
+        - ADMISSION_QUEUE_TIMEOUT (float): Seconds a request may wait before it is rejected.
+        - ADMIN_TOKEN (str): Token required in the `X-Admin-Token` header of admin endpoints;
+          admin endpoints are disabled when unset.
+        - ADMISSION_LIMITS (str): Per-route/per-priority overrides, e.g.
+          "RapidNotify:high=128/256/1,attachment=4/0/0" (in_flight/queue/timeout).
+        - PROFILING_ENABLED (bool): Whether a sample of requests is profiled from startup.
+        - PROFILING_SAMPLE_RATE (float): Fraction of requests profiled while enabled.
+        - PROFILING_MAX_PROFILES (int): Number of request profiles kept in memory.
+        - UNREACHABLE_CACHE_TTL (float): Seconds an API key whose chat blocked the bot is
+          rejected without a database lookup while its flag is not rechecked.
+        - UNREACHABLE_RECHECK_INTERVAL (float): Seconds between rereads of the stored
+          flags of those API keys, which drop the keys of subscribers who sent /start.
+        - UNREACHABLE_CACHE_SIZE (int): Number of such API keys kept in memory.
+        - RETRY_TABLE_NAME (str): The collection holding deliveries pending a retry.
+        - DEAD_LETTER_TABLE_NAME (str): The collection holding deliveries which gave up.
+        - RETRY_MAX_ATTEMPTS (int): Delivery attempts, including the first, before giving up.
+        - RETRY_BASE_DELAY (float): Backoff of the first retry in seconds.
+        - RETRY_MAX_DELAY (float): Upper bound of the retry backoff in seconds.
+        - RETRY_POLL_INTERVAL (float): Seconds between polls of the retry collection.
+        - RETRY_BATCH_SIZE (int): Retries processed per poll.
+        - STREAM_DEBOUNCE (float): Minimum seconds between two edits of a progress message.
+        - STREAM_TTL (float): Seconds a `stream_id` keeps editing the same message after
+          its last update.
+        - STREAM_CACHE_SIZE (int): Number of progress streams tracked in memory.
+        - LARGE_PAYLOAD_THRESHOLD (int): Characters above which a notification is sent
+          as a summary plus a document instead of split into messages.
+        - LARGE_PAYLOAD_SUMMARY_LENGTH (int): Characters of a large notification shown
+          in the caption of its document.
+        - CALLBACK_BATCH_WINDOW (float): Seconds a delivery outcome waits for others to
+          the same callback URL before they are sent together.
+        - CALLBACK_MAX_BATCH (int): Outcomes sent in one callback request.
+        - CALLBACK_MAX_PENDING (int): Outcomes held per callback URL before the oldest are dropped.
+        - CALLBACK_MAX_ATTEMPTS (int): Attempts of a callback request before it is given up.
+        - CALLBACK_TIMEOUT (float): Timeout in seconds of a callback request.
+        - CALLBACK_POOL_SIZE (int): Callback requests sent concurrently.
+        - CALLBACK_CACHE_TTL (float): Seconds the callback registration of an API key is
+          cached by the retry worker.
+        - CALLBACK_CACHE_SIZE (int): Number of such callback registrations kept in memory.
+        - LOOKUP_BATCH_WINDOW (float): Seconds a subscription lookup waits for concurrent
+          ones, which are then resolved with a single query.
+        - LOOKUP_BATCH_SIZE (int): API keys resolved by one subscription query.
+        - HISTORY_TABLE_NAME (str): The collection holding the history of sent notifications.
+        - HISTORY_TTL (int): Seconds a notification is kept in the history.
+        - HISTORY_FLUSH_INTERVAL (float): Seconds between writes of the buffered history.
+        - HISTORY_BATCH_SIZE (int): History entries written per batch.
+        - HISTORY_MAX_PENDING (int): History entries buffered before the oldest are dropped.
+        - HISTORY_PAGE_SIZE (int): Notifications per page of the bot's /history command.
+        - LOG_LEVEL (str): The minimum level logged.
+        - LOG_MAX_BYTES (int): Size at which log files are rotated.
+        - LOG_BACKUP_COUNT (int): Number of rotated log files kept.
+        - LOG_ROTATE_WHEN (str): Rotate log files by time instead of size, e.g. "midnight".
+        - LOG_SUCCESS_SAMPLE_RATE (float): Fraction of successful request logs kept.
 
     Note:
         Ensure that you have a .env file in the project root directory with the
@@ -27,3 +104,95 @@ class Config:
     DB_NAME = os.environ.get("DB_NAME")
     TABLE_NAME = os.environ.get("TABLE_NAME")
     BOT_KEY = os.environ.get("BOT_KEY")
+    BOT_KEYS = list(
+        dict.fromkeys(
+            key.strip()
+            for key in [BOT_KEY or "", *os.environ.get("BOT_KEYS", "").split(",")]
+            if key.strip()
+        )
+    )
+
+    API_KEY_SECRET = os.environ.get("API_KEY_SECRET")
+    REVOKED_KEYS_TABLE_NAME = os.environ.get("REVOKED_KEYS_TABLE_NAME", "revoked_keys")
+    API_KEY_REVOCATION_REFRESH = float(os.environ.get("API_KEY_REVOCATION_REFRESH", 30))
+
+    TELEGRAM_GLOBAL_RATE = float(os.environ.get("TELEGRAM_GLOBAL_RATE", 30))
+    TELEGRAM_CHAT_RATE = float(os.environ.get("TELEGRAM_CHAT_RATE", 1))
+    DELIVERY_WORKERS = int(os.environ.get("DELIVERY_WORKERS", 8))
+    DELIVERY_STARVATION_TIMEOUT = float(
+        os.environ.get("DELIVERY_STARVATION_TIMEOUT", 5)
+    )
+
+    MAX_DOCUMENT_BYTES = int(os.environ.get("MAX_DOCUMENT_BYTES", 50 * 1024 * 1024))
+    MAX_PHOTO_BYTES = int(os.environ.get("MAX_PHOTO_BYTES", 10 * 1024 * 1024))
+    ATTACHMENT_SPOOL_BYTES = int(os.environ.get("ATTACHMENT_SPOOL_BYTES", 1024 * 1024))
+
+    USAGE_TABLE_NAME = os.environ.get("USAGE_TABLE_NAME", "usage")
+    QUOTA_RATE_PER_MINUTE = float(os.environ.get("QUOTA_RATE_PER_MINUTE", 120))
+    QUOTA_DAILY_LIMIT = int(os.environ.get("QUOTA_DAILY_LIMIT", 10000))
+    QUOTA_FLUSH_INTERVAL = float(os.environ.get("QUOTA_FLUSH_INTERVAL", 10))
+
+    TEMPLATE_CACHE_SIZE = int(os.environ.get("TEMPLATE_CACHE_SIZE", 1024))
+
+    ADMISSION_MAX_IN_FLIGHT = int(os.environ.get("ADMISSION_MAX_IN_FLIGHT", 64))
+    ADMISSION_QUEUE_SIZE = int(os.environ.get("ADMISSION_QUEUE_SIZE", 128))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 0.5))
+    ADMISSION_LIMITS = os.environ.get("ADMISSION_LIMITS", "")
+
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0.01))
+    PROFILING_MAX_PROFILES = int(os.environ.get("PROFILING_MAX_PROFILES", 50))
+
+    UNREACHABLE_CACHE_TTL = float(os.environ.get("UNREACHABLE_CACHE_TTL", 3600))
+    UNREACHABLE_CACHE_SIZE = int(os.environ.get("UNREACHABLE_CACHE_SIZE", 100000))
+    UNREACHABLE_RECHECK_INTERVAL = float(
+        os.environ.get("UNREACHABLE_RECHECK_INTERVAL", 10)
+    )
+
+    RETRY_TABLE_NAME = os.environ.get("RETRY_TABLE_NAME", "retries")
+    DEAD_LETTER_TABLE_NAME = os.environ.get("DEAD_LETTER_TABLE_NAME", "dead_letters")
+    RETRY_MAX_ATTEMPTS = int(os.environ.get("RETRY_MAX_ATTEMPTS", 8))
+    RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", 2))
+    RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", 600))
+    RETRY_POLL_INTERVAL = float(os.environ.get("RETRY_POLL_INTERVAL", 5))
+    RETRY_BATCH_SIZE = int(os.environ.get("RETRY_BATCH_SIZE", 100))
+
+    STREAM_DEBOUNCE = float(os.environ.get("STREAM_DEBOUNCE", 1))
+    STREAM_TTL = float(os.environ.get("STREAM_TTL", 3600))
+    STREAM_CACHE_SIZE = int(os.environ.get("STREAM_CACHE_SIZE", 10000))
+
+    LARGE_PAYLOAD_THRESHOLD = int(os.environ.get("LARGE_PAYLOAD_THRESHOLD", 12288))
+    LARGE_PAYLOAD_SUMMARY_LENGTH = int(
+        os.environ.get("LARGE_PAYLOAD_SUMMARY_LENGTH", 300)
+    )
+
+    CALLBACK_BATCH_WINDOW = float(os.environ.get("CALLBACK_BATCH_WINDOW", 1))
+    CALLBACK_MAX_BATCH = int(os.environ.get("CALLBACK_MAX_BATCH", 100))
+    CALLBACK_MAX_PENDING = int(os.environ.get("CALLBACK_MAX_PENDING", 10000))
+    CALLBACK_MAX_ATTEMPTS = int(os.environ.get("CALLBACK_MAX_ATTEMPTS", 5))
+    CALLBACK_TIMEOUT = float(os.environ.get("CALLBACK_TIMEOUT", 10))
+    CALLBACK_POOL_SIZE = int(os.environ.get("CALLBACK_POOL_SIZE", 20))
+    CALLBACK_CACHE_TTL = float(os.environ.get("CALLBACK_CACHE_TTL", 60))
+    CALLBACK_CACHE_SIZE = int(os.environ.get("CALLBACK_CACHE_SIZE", 100000))
+
+    LOOKUP_BATCH_WINDOW = float(os.environ.get("LOOKUP_BATCH_WINDOW", 0.002))
+    LOOKUP_BATCH_SIZE = int(os.environ.get("LOOKUP_BATCH_SIZE", 100))
+
+    HISTORY_TABLE_NAME = os.environ.get("HISTORY_TABLE_NAME", "history")
+    HISTORY_TTL = int(os.environ.get("HISTORY_TTL", 30 * 24 * 3600))
+    HISTORY_FLUSH_INTERVAL = float(os.environ.get("HISTORY_FLUSH_INTERVAL", 1))
+    HISTORY_BATCH_SIZE = int(os.environ.get("HISTORY_BATCH_SIZE", 500))
+    HISTORY_MAX_PENDING = int(os.environ.get("HISTORY_MAX_PENDING", 10000))
+    HISTORY_PAGE_SIZE = int(os.environ.get("HISTORY_PAGE_SIZE", 10))
+
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+    LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", 5))
+    LOG_ROTATE_WHEN = os.environ.get("LOG_ROTATE_WHEN", "")
+    LOG_SUCCESS_SAMPLE_RATE = float(os.environ.get("LOG_SUCCESS_SAMPLE_RATE", 1))
@@ -38,6 +38,14 @@ Classes and Methods:
         - query(input_data: QueryDataInput) -> pymongo.cursor.Cursor or dict: Retrieves data based on provided filters.
         - update(input_data: UpdateDataInput) -> pymongo.UpdateResult: Updates data based on provided filters.
         - delete(input_data: DeleteDataInput) -> pymongo.DeleteResult: Deletes data based on provided filters.
+        - bulk_write(input_data: BulkWriteInput) -> pymongo.BulkWriteResult: Executes a batch of writes in one round trip.
+        - iterate(input_data: ScanDataInput) -> Iterator[dict]: Streams matching documents from a server-side cursor.
+        - create_index(input_data: IndexInput) -> None: Creates an index once per process.
+
+Backends:
+    - A `db_url` with the "sqlite" scheme (e.g. "sqlite:///rapidnotify.db") makes
+      `DataBase` return an embedded `SQLiteDataBase` (see `db.sqlite`) with the same
+      methods, for single-node deployments, tests and benchmarks.
 
 Notes:
     - This class is designed for MongoDB database interactions.
@@ -45,19 +53,27 @@ Notes:
     - The provided methods handle data validation and various database operations.
 """
 
+from typing import Iterator, Set, Tuple
+
 import pymongo
 from pydantic import ValidationError
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
 from pymongo.results import (
+    BulkWriteResult,
     DeleteResult,
     InsertManyResult,
     InsertOneResult,
     UpdateResult,
 )
 
+from .sqlite import SQLiteDataBase
 from .validator import (
+    BulkWriteInput,
     DeleteDataInput,
+    IndexInput,
     MongoDbClientConfig,
     QueryDataInput,
+    ScanDataInput,
     UpdateDataInput,
     UploadDataInput,
 )
@@ -83,13 +99,25 @@ class DataBase:
         - query(input_data: QueryDataInput) -> pymongo.cursor.Cursor or dict: Retrieves data based on provided filters.
         - update(input_data: UpdateDataInput) -> pymongo.UpdateResult: Updates data based on provided filters.
         - delete(input_data: DeleteDataInput) -> pymongo.DeleteResult: Deletes data based on provided filters.
+        - bulk_write(input_data: BulkWriteInput) -> pymongo.BulkWriteResult: Executes a batch of writes in one round trip.
+        - iterate(input_data: ScanDataInput) -> Iterator[dict]: Streams matching documents from a server-side cursor.
+        - create_index(input_data: IndexInput) -> None: Creates an index once per process.
 
     Notes:
         - This class is designed for MongoDB database interactions.
         - You can connect to a MongoDB instance by providing the `db_url` parameter during initialization.
         - The provided methods handle data validation and various database operations.
+        - A "sqlite://" `db_url` returns a `SQLiteDataBase` instead.
     """
 
+    # Indexes already ensured by this process, keyed by url, database, table and keys
+    _indexes: Set[Tuple] = set()
+
+    def __new__(cls, config: MongoDbClientConfig):
+        if cls is DataBase and str(config.db_url).startswith("sqlite:"):
+            return SQLiteDataBase(config)
+        return super().__new__(cls)
+
     def __init__(self, config: MongoDbClientConfig) -> None:
         """Initialize the MongoDB client instance.
 
@@ -167,6 +195,10 @@ class DataBase:
     def update(self, input_data: UpdateDataInput) -> UpdateResult:
         """Update data in a specified database and collection based on filters.
 
+        When `input_data.filter` is set, `input_data.data` is applied verbatim as the
+        update document (e.g. {"$set": {...}, "$unset": {...}}) to the first matching
+        document. Otherwise `data` must hold "user_uuid" and "user_data".
+
         Args:
             input_data (UpdateDataInput): The input data including the database name,
                 collection name, and the data to be updated.
@@ -186,6 +218,13 @@ class DataBase:
         database = self.mongod[validated_input.db_name]
         dataset = database[validated_input.table_name]
 
+        if validated_input.filter is not None:
+            return dataset.update_one(
+                validated_input.filter,
+                validated_input.data,
+                upsert=validated_input.upsert,
+            )
+
         return dataset.update_one(
             {"user_uuid": validated_input.data["user_uuid"]},
             {"$set": validated_input.data["user_data"]},
@@ -213,3 +252,124 @@ class DataBase:
         database = self.mongod[validated_input.db_name]
         dataset = database[validated_input.table_name]
         return dataset.delete_one(validated_input.data)
+
+    def bulk_write(self, input_data: BulkWriteInput) -> BulkWriteResult:
+        """
+        Execute a batch of insert, update, replace and delete operations in a single round trip.
+
+        Args:
+            input_data (BulkWriteInput): The input data including the database name,
+                collection name, the operations and whether they are ordered.
+
+        Returns:
+            BulkWriteResult: The response object indicating the result of the batch.
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        try:
+            validated_input = BulkWriteInput(**input_data.model_dump())
+        except ValidationError as e:
+            error_message = f"Invalid input data: {e.errors()}"
+            raise ValueError(error_message) from e
+
+        requests = []
+        for operation in validated_input.operations:
+            upsert = operation.get("upsert", False)
+            if "insert" in operation:
+                requests.append(InsertOne(operation["insert"]))
+            elif "delete" in operation:
+                requests.append(DeleteOne(operation["delete"]))
+            elif "replacement" in operation:
+                requests.append(
+                    ReplaceOne(operation["filter"], operation["replacement"], upsert)
+                )
+            else:
+                requests.append(
+                    UpdateOne(operation["filter"], operation["update"], upsert)
+                )
+
+        database = self.mongod[validated_input.db_name]
+        dataset = database[validated_input.table_name]
+        return dataset.bulk_write(requests, ordered=validated_input.ordered)
+
+    def iterate(self, input_data: ScanDataInput) -> Iterator[dict]:
+        """
+        Stream the documents matching a filter without materialising the result set.
+
+        Documents are read from a server-side cursor `batch_size` at a time, so memory
+        use is bounded by one batch regardless of the number of matches.
+
+        Args:
+            input_data (ScanDataInput): The input data including the database name,
+                collection name, filter, batch size, optional sort and limit.
+
+        Returns:
+            Iterator[dict]: The matching documents.
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        try:
+            validated_input = ScanDataInput(**input_data.model_dump())
+        except ValidationError as e:
+            error_message = f"Invalid input data: {e.errors()}"
+            raise ValueError(error_message) from e
+
+        database = self.mongod[validated_input.db_name]
+        dataset = database[validated_input.table_name]
+        cursor = dataset.find(
+            validated_input.data,
+            batch_size=validated_input.batch_size,
+            limit=validated_input.limit,
+        )
+        if validated_input.sort:
+            cursor = cursor.sort([tuple(key) for key in validated_input.sort])
+
+        def stream():
+            with cursor:
+                yield from cursor
+
+        return stream()
+
+    def create_index(self, input_data: IndexInput) -> None:
+        """
+        Create an index on a collection, once per process.
+
+        Creating an existing index is a no-op on the server, but still a round trip,
+        so indexes ensured by this process are remembered. With `expire_after`, the
+        index is a TTL index and the server deletes expired documents.
+
+        Args:
+            input_data (IndexInput): The input data including the database name,
+                collection name, the indexed keys, whether they are unique and the
+                optional expiry.
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        try:
+            validated_input = IndexInput(**input_data.model_dump())
+        except ValidationError as e:
+            error_message = f"Invalid input data: {e.errors()}"
+            raise ValueError(error_message) from e
+
+        keys = [tuple(key) for key in validated_input.keys]
+        index = (
+            self.database_url,
+            validated_input.db_name,
+            validated_input.table_name,
+            tuple(keys),
+            validated_input.unique,
+            validated_input.expire_after,
+        )
+        if index in DataBase._indexes:
+            return
+
+        database = self.mongod[validated_input.db_name]
+        dataset = database[validated_input.table_name]
+        options = {"unique": validated_input.unique}
+        if validated_input.expire_after is not None:
+            options["expireAfterSeconds"] = validated_input.expire_after
+        dataset.create_index(keys, **options)
+        DataBase._indexes.add(index)
@@ -0,0 +1,694 @@
+"""
+Module: sqlite
+
+This module defines an embedded SQLite storage backend with the interface of the
+MongoDB `DataBase`, for single-node deployments, tests and benchmarks.
+
+Classes:
+    - SQLiteDataBase: Stores collections as JSON documents in a local SQLite file.
+
+Usage:
+    `DataBase` returns this backend when `db_url` uses the "sqlite" scheme:
+
+    ```python
+    from module.mongo import DataBase
+    from module.validator import MongoDbClientConfig, QueryDataInput
+
+    database = DataBase(MongoDbClientConfig(db_url="sqlite:///rapidnotify.db"))
+    result = database.query(QueryDataInput(db_name="bot", table_name="users", data={"api_key": "..."}))
+    ```
+
+    "sqlite:///relative/path.db" and "sqlite:////absolute/path.db" name a file, while
+    "sqlite://" and "sqlite:///:memory:" name an in-memory database shared by the
+    whole process and lost when it exits.
+
+Storage:
+    - Every collection is a table "<db_name>.<table_name>" with an `id` primary key
+      holding `_id` and a `doc` column holding the document as JSON.
+    - Fields are read with `json_extract(doc, '$.field')`. `create_index` builds
+      expression indexes over exactly these expressions, so filters on indexed fields
+      are index lookups.
+    - Files are opened in WAL mode, so readers (e.g. the bot and the API) do not block
+      each other or a writer. Each thread uses its own connection.
+
+Supported Operations:
+    - Filters: equality, `$eq`, `$ne`, `$gt`, `$gte`, `$lt`, `$lte`, `$in`, `$nin`,
+      `$exists`, `$and` and `$or`, on top-level or dotted fields. Equality against an
+      array field does not match its elements.
+    - Updates: `$set`, `$unset`, `$inc` and `$setOnInsert`, with dotted fields.
+    - TTL indexes: documents whose indexed field is older than `expire_after` seconds
+      are deleted by the process which created the index, when it accesses the
+      collection and at most every `EXPIRY_INTERVAL` seconds.
+
+Notes:
+    - `upload`, `query`, `update`, `delete`, `bulk_write`, `iterate` and `create_index`
+      accept the same validated inputs as the MongoDB backend and return results with
+      the attributes used from the pymongo results.
+    - Documents must be JSON serialisable, except for datetimes, which are stored and
+      compared as Unix timestamps (naive ones are UTC) and read back as floats.
+"""
+import copy
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .validator import (
+    BulkWriteInput,
+    DeleteDataInput,
+    IndexInput,
+    MongoDbClientConfig,
+    QueryDataInput,
+    ScanDataInput,
+    UpdateDataInput,
+    UploadDataInput,
+)
+
+FIELD_PATTERN = re.compile(r"^[A-Za-z0-9_-]+(\.[A-Za-z0-9_-]+)*$")
+
+_COMPARISONS = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<"}
+_COMPARISONS["$lte"] = "<="
+
+MEMORY_PATH = "file:rapidnotify?mode=memory&cache=shared"
+
+EXPIRY_INTERVAL = 60
+
+_local = threading.local()
+# Keeps the in-memory database alive while no thread holds a connection to it
+_memory_keeper: Optional[sqlite3.Connection] = None
+# (path, table) -> (field, expire_after) of the TTL indexes, and their last expiry
+_expiries: Dict[Tuple[str, str], Tuple[str, int]] = {}
+_expired_at: Dict[Tuple[str, str], float] = {}
+
+
+class InsertResult:
+    """The result of an insert, mirroring `pymongo.results.InsertOneResult`."""
+
+    def __init__(self, inserted_id: Any) -> None:
+        self.inserted_id = inserted_id
+
+
+class UpdateResult:
+    """The result of an update, mirroring `pymongo.results.UpdateResult`."""
+
+    def __init__(
+        self, matched_count: int, modified_count: int, upserted_id: Any = None
+    ) -> None:
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class DeleteResult:
+    """The result of a delete, mirroring `pymongo.results.DeleteResult`."""
+
+    def __init__(self, deleted_count: int) -> None:
+        self.deleted_count = deleted_count
+
+
+class BulkWriteResult:
+    """The result of a bulk write, mirroring `pymongo.results.BulkWriteResult`."""
+
+    def __init__(self) -> None:
+        self.inserted_count = 0
+        self.matched_count = 0
+        self.modified_count = 0
+        self.deleted_count = 0
+        self.upserted_count = 0
+
+
+def _database_path(db_url: str) -> str:
+    path = db_url[len("sqlite://") :]
+    if path.startswith("/"):
+        path = path[1:]
+    return path or ":memory:"
+
+
+def _table(db_name: str, table_name: str) -> str:
+    return '"{}"'.format(f"{db_name}.{table_name}".replace('"', '""'))
+
+
+def _field(name: str) -> str:
+    """Return the SQL expression reading a (dotted) field of a document."""
+    if name == "_id":
+        return "id"
+    if not FIELD_PATTERN.match(name):
+        raise ValueError(f"Unsupported field name: {name}")
+    return f"json_extract(doc, '$.{name}')"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(document: Dict) -> str:
+    return json.dumps(document, default=_json_default)
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"Unsupported filter value: {value}")
+    if isinstance(value, datetime):
+        return _json_default(value)
+    return value
+
+
+def _where(filter: Dict) -> Tuple[str, List]:
+    """Translate a MongoDB filter into an SQL condition and its parameters."""
+    clauses, params = [], []
+    for key, condition in filter.items():
+        if key in ("$and", "$or"):
+            parts = [_where(item) for item in condition]
+            if not parts:
+                raise ValueError(f"{key} cannot be empty")
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + joiner.join(f"({sql})" for sql, _ in parts) + ")")
+            for _, part_params in parts:
+                params.extend(part_params)
+            continue
+
+        field = _field(key)
+        if not (
+            isinstance(condition, dict)
+            and condition
+            and all(op.startswith("$") for op in condition)
+        ):
+            if condition is None:
+                clauses.append(f"{field} IS NULL")
+            else:
+                clauses.append(f"{field} = ?")
+                params.append(_value(condition))
+            continue
+
+        for op, argument in condition.items():
+            if op in _COMPARISONS:
+                if argument is None and op in ("$eq", "$ne"):
+                    negate = "NOT " if op == "$ne" else ""
+                    clauses.append(f"{field} IS {negate}NULL")
+                elif op == "$ne":
+                    clauses.append(f"({field} IS NULL OR {field} != ?)")
+                    params.append(_value(argument))
+                else:
+                    clauses.append(f"{field} {_COMPARISONS[op]} ?")
+                    params.append(_value(argument))
+            elif op in ("$in", "$nin"):
+                values = [_value(item) for item in argument]
+                if not values:
+                    clauses.append("0" if op == "$in" else "1")
+                    continue
+                marks = ", ".join("?" * len(values))
+                if op == "$in":
+                    clauses.append(f"{field} IN ({marks})")
+                else:
+                    clauses.append(f"({field} IS NULL OR {field} NOT IN ({marks}))")
+                params.extend(values)
+            elif op == "$exists":
+                if key == "_id":
+                    clauses.append("1" if argument else "0")
+                else:
+                    path = f"'$.{key}'"
+                    exists = f"json_type(doc, {path}) IS NOT NULL"
+                    clauses.append(exists if argument else f"NOT ({exists})")
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+
+    return " AND ".join(clauses) or "1", params
+
+
+def _order_by(sort: Optional[List[List]]) -> str:
+    if not sort:
+        return ""
+    keys = [
+        f"{_field(key)} {'DESC' if direction == -1 else 'ASC'}"
+        for key, direction in sort
+    ]
+    return " ORDER BY " + ", ".join(keys)
+
+
+def _set_path(document: Dict, path: str, value: Any) -> None:
+    *parents, last = path.split(".")
+    for name in parents:
+        document = document.setdefault(name, {})
+    document[last] = value
+
+
+def _get_path(document: Dict, path: str, default: Any = None) -> Any:
+    for name in path.split("."):
+        if not isinstance(document, dict) or name not in document:
+            return default
+        document = document[name]
+    return document
+
+
+def _unset_path(document: Dict, path: str) -> None:
+    *parents, last = path.split(".")
+    for name in parents:
+        document = document.get(name)
+        if not isinstance(document, dict):
+            return
+    document.pop(last, None)
+
+
+def _apply_update(document: Dict, update: Dict, inserting: bool) -> Dict:
+    """Apply a MongoDB update document to a copy of `document`."""
+    document = copy.deepcopy(document)
+    for op, fields in update.items():
+        if op == "$set" or (op == "$setOnInsert" and inserting):
+            for path, value in fields.items():
+                _set_path(document, path, value)
+        elif op == "$unset":
+            for path in fields:
+                _unset_path(document, path)
+        elif op == "$inc":
+            for path, amount in fields.items():
+                _set_path(document, path, _get_path(document, path, 0) + amount)
+        elif op != "$setOnInsert":
+            raise ValueError(f"Unsupported update operator: {op}")
+    return document
+
+
+def _upsert_base(filter: Dict) -> Dict:
+    """Return the document an upsert starts from: the equality fields of its filter."""
+    document = {}
+    for key, condition in filter.items():
+        if key.startswith("$"):
+            continue
+        if isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+            if "$eq" in condition:
+                _set_path(document, key, condition["$eq"])
+            continue
+        _set_path(document, key, condition)
+    return document
+
+
+class SQLiteDataBase:
+    """
+    An embedded storage backend keeping JSON documents in SQLite.
+
+    Args:
+        config (MongoDbClientConfig): The configuration holding a "sqlite://" URL.
+
+    Attributes:
+        database_url (str): The URL of the database.
+        path (str): The SQLite database file, or ":memory:".
+
+    Methods:
+        - upload(input_data: UploadDataInput) -> InsertResult: Inserts a document.
+        - query(input_data: QueryDataInput) -> list: Retrieves documents based on a filter.
+        - update(input_data: UpdateDataInput) -> UpdateResult: Updates the first matching document.
+        - delete(input_data: DeleteDataInput) -> DeleteResult: Deletes the first matching document.
+        - bulk_write(input_data: BulkWriteInput) -> BulkWriteResult: Executes a batch of writes in one transaction.
+        - iterate(input_data: ScanDataInput) -> Iterator[dict]: Streams matching documents.
+        - create_index(input_data: IndexInput) -> None: Creates an expression index.
+    """
+
+    def __init__(self, config: MongoDbClientConfig) -> None:
+        """Initialize the SQLite backend.
+
+        Args:
+            config (MongoDbClientConfig): The configuration for the database.
+
+        Raises:
+            ValueError: If `config` is not valid.
+        """
+        try:
+            validated_config = MongoDbClientConfig(**config.model_dump())
+        except ValidationError as e:
+            raise ValueError(f"Invalid configuration: {e.errors()}") from e
+
+        self.database_url = validated_config.db_url
+        self.path = _database_path(self.database_url)
+        if self.path == ":memory:":
+            global _memory_keeper
+            self.path = MEMORY_PATH
+            if _memory_keeper is None:
+                _memory_keeper = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            uri=self.path.startswith("file:"),
+            timeout=5,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _connection(self) -> Tuple[sqlite3.Connection, set]:
+        """Return this thread's connection and the tables it has created."""
+        connections = getattr(_local, "connections", None)
+        if connections is None:
+            connections = _local.connections = {}
+        entry = connections.get(self.path)
+        if entry is None:
+            entry = connections[self.path] = (self._open(), set())
+        return entry
+
+    def _table(self, db_name: str, table_name: str) -> Tuple[sqlite3.Connection, str]:
+        connection, tables = self._connection()
+        table = _table(db_name, table_name)
+        if table not in tables:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (id PRIMARY KEY, doc TEXT NOT NULL)"
+            )
+            tables.add(table)
+        if (self.path, table) in _expiries:
+            self._expire(connection, table)
+        return connection, table
+
+    def _expire(self, connection: sqlite3.Connection, table: str) -> None:
+        """Delete the expired documents of a collection with a TTL index."""
+        key = (self.path, table)
+        now = time.monotonic()
+        if now - _expired_at.get(key, float("-inf")) < EXPIRY_INTERVAL:
+            return
+        _expired_at[key] = now
+        field, expire_after = _expiries[key]
+        connection.execute(
+            f"DELETE FROM {table} WHERE {field} < ?", (time.time() - expire_after,)
+        )
+
+    @staticmethod
+    def _validate(model, input_data):
+        try:
+            return model(**input_data.model_dump())
+        except ValidationError as e:
+            error_message = f"Invalid input data: {e.errors()}"
+            raise ValueError(error_message) from e
+
+    @staticmethod
+    def _insert(connection, table: str, document: Dict) -> Any:
+        document = dict(document)
+        document.setdefault("_id", uuid.uuid4().hex)
+        connection.execute(
+            f"INSERT INTO {table} (id, doc) VALUES (?, ?)",
+            (document["_id"], _dumps(document)),
+        )
+        return document["_id"]
+
+    @staticmethod
+    def _find_one(connection, table: str, filter: Dict) -> Optional[Tuple[Any, Dict]]:
+        where, params = _where(filter)
+        row = connection.execute(
+            f"SELECT id, doc FROM {table} WHERE {where} LIMIT 1", params
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def _update_one(
+        self, connection, table: str, filter: Dict, update: Dict, upsert: bool
+    ) -> UpdateResult:
+        found = self._find_one(connection, table, filter)
+        if found is None:
+            if not upsert:
+                return UpdateResult(0, 0)
+            document = _apply_update(_upsert_base(filter), update, inserting=True)
+            return UpdateResult(0, 0, self._insert(connection, table, document))
+
+        row_id, document = found
+        updated = _apply_update(document, update, inserting=False)
+        if updated == document:
+            return UpdateResult(1, 0)
+        connection.execute(
+            f"UPDATE {table} SET id = ?, doc = ? WHERE id = ?",
+            (updated.get("_id", row_id), _dumps(updated), row_id),
+        )
+        return UpdateResult(1, 1)
+
+    def _replace_one(
+        self, connection, table: str, filter: Dict, replacement: Dict, upsert: bool
+    ) -> UpdateResult:
+        found = self._find_one(connection, table, filter)
+        if found is None:
+            if not upsert:
+                return UpdateResult(0, 0)
+            document = {**_upsert_base(filter), **replacement}
+            return UpdateResult(0, 0, self._insert(connection, table, document))
+
+        row_id, document = found
+        replacement = {**replacement, "_id": replacement.get("_id", row_id)}
+        connection.execute(
+            f"UPDATE {table} SET id = ?, doc = ? WHERE id = ?",
+            (replacement["_id"], _dumps(replacement), row_id),
+        )
+        return UpdateResult(1, int(replacement != document))
+
+    @staticmethod
+    def _delete_one(connection, table: str, filter: Dict) -> int:
+        where, params = _where(filter)
+        cursor = connection.execute(
+            f"DELETE FROM {table} WHERE id IN (SELECT id FROM {table} WHERE {where} LIMIT 1)",
+            params,
+        )
+        return cursor.rowcount
+
+    def upload(self, input_data: UploadDataInput) -> InsertResult:
+        """Insert a document into a specified database and collection.
+
+        Args:
+            input_data (UploadDataInput): The input data including the database name,
+                collection name, and the document to be inserted.
+
+        Returns:
+            InsertResult: The id of the inserted document.
+
+        Raises:
+            ValueError: If the input data is invalid.
+            sqlite3.IntegrityError: If a document with the same `_id` exists.
+        """
+        validated_input = self._validate(UploadDataInput, input_data)
+        connection, table = self._table(
+            validated_input.db_name, validated_input.table_name
+        )
+        return InsertResult(self._insert(connection, table, validated_input.data))
+
+    def query(self, input_data: QueryDataInput) -> list:
+        """Retrieve the documents of a collection matching a filter.
+
+        Args:
+            input_data (QueryDataInput): The input data including the database name,
+                collection name, filter
+
+        Returns:
+            list: The matching documents.
+
+        Raises:
+            ValueError: If the input data or filter is invalid.
+        """
+        validated_input = self._validate(QueryDataInput, input_data)
+        connection, table = self._table(
+            validated_input.db_name, validated_input.table_name
+        )
+        where, params = _where(validated_input.data)
+        rows = connection.execute(f"SELECT doc FROM {table} WHERE {where}", params)
+        return [json.loads(doc) for doc, in rows]
+
+    def update(self, input_data: UpdateDataInput) -> UpdateResult:
+        """Update the first document matching a filter.
+
+        Same semantics as the MongoDB backend: with `filter`, `data` is an update
+        document; otherwise `data` holds "user_uuid" and "user_data".
+
+        Args:
+            input_data (UpdateDataInput): The input data including the database name,
+                collection name, and the data to be updated.
+
+        Returns:
+            UpdateResult: The matched, modified and upserted documents.
+
+        Raises:
+            ValueError: If the input data or update is invalid.
+        """
+        validated_input = self._validate(UpdateDataInput, input_data)
+        connection, table = self._table(
+            validated_input.db_name, validated_input.table_name
+        )
+
+        if validated_input.filter is not None:
+            filter, update = validated_input.filter, validated_input.data
+        else:
+            filter = {"user_uuid": validated_input.data["user_uuid"]}
+            update = {"$set": validated_input.data["user_data"]}
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            return self._update_one(
+                connection, table, filter, update, validated_input.upsert
+            )
+
+    def delete(self, input_data: DeleteDataInput) -> DeleteResult:
+        """Delete the first document matching a filter.
+
+        Args:
+            input_data (DeleteDataInput): The input data including the database name,
+                collection name, and the filter to be applied for deletion.
+
+        Returns:
+            DeleteResult: The number of deleted documents.
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        validated_input = self._validate(DeleteDataInput, input_data)
+        connection, table = self._table(
+            validated_input.db_name, validated_input.table_name
+        )
+        return DeleteResult(self._delete_one(connection, table, validated_input.data))
+
+    def bulk_write(self, input_data: BulkWriteInput) -> BulkWriteResult:
+        """
+        Execute a batch of insert, update, replace and delete operations in one transaction.
+
+        Ordered batches stop at the first failing operation; unordered batches attempt
+        every operation. Operations applied before a failure are kept, as in MongoDB,
+        and the first error is raised afterwards.
+
+        Args:
+            input_data (BulkWriteInput): The input data including the database name,
+                collection name, the operations and whether they are ordered.
+
+        Returns:
+            BulkWriteResult: The counts of the applied operations.
+
+        Raises:
+            ValueError: If any input is invalid.
+            sqlite3.Error: If an operation failed.
+        """
+        validated_input = self._validate(BulkWriteInput, input_data)
+        connection, table = self._table(
+            validated_input.db_name, validated_input.table_name
+        )
+
+        result = BulkWriteResult()
+        error = None
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            for operation in validated_input.operations:
+                upsert = operation.get("upsert", False)
+                try:
+                    if "insert" in operation:
+                        self._insert(connection, table, operation["insert"])
+                        result.inserted_count += 1
+                        continue
+                    if "delete" in operation:
+                        result.deleted_count += self._delete_one(
+                            connection, table, operation["delete"]
+                        )
+                        continue
+                    if "replacement" in operation:
+                        outcome = self._replace_one(
+                            connection,
+                            table,
+                            operation["filter"],
+                            operation["replacement"],
+                            upsert,
+                        )
+                    else:
+                        outcome = self._update_one(
+                            connection,
+                            table,
+                            operation["filter"],
+                            operation["update"],
+                            upsert,
+                        )
+                except (sqlite3.Error, ValueError) as e:
+                    error = error or e
+                    if validated_input.ordered:
+                        break
+                    continue
+
+                result.matched_count += outcome.matched_count
+                result.modified_count += outcome.modified_count
+                result.upserted_count += int(outcome.upserted_id is not None)
+
+        if error is not None:
+            raise error
+        return result
+
+    def iterate(self, input_data: ScanDataInput) -> Iterator[dict]:
+        """
+        Stream the documents matching a filter without materialising the result set.
+
+        Rows are fetched `batch_size` at a time on a connection of its own, so the
+        stream may be consumed from any thread.
+
+        Args:
+            input_data (ScanDataInput): The input data including the database name,
+                collection name, filter, batch size, optional sort and limit.
+
+        Returns:
+            Iterator[dict]: The matching documents.
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        validated_input = self._validate(ScanDataInput, input_data)
+        self._table(validated_input.db_name, validated_input.table_name)
+        table = _table(validated_input.db_name, validated_input.table_name)
+        where, params = _where(validated_input.data)
+        sql = f"SELECT doc FROM {table} WHERE {where}{_order_by(validated_input.sort)}"
+        if validated_input.limit:
+            sql += f" LIMIT {int(validated_input.limit)}"
+
+        def stream():
+            connection = self._open()
+            try:
+                cursor = connection.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(validated_input.batch_size)
+                    if not rows:
+                        break
+                    for (doc,) in rows:
+                        yield json.loads(doc)
+            finally:
+                connection.close()
+
+        return stream()
+
+    def create_index(self, input_data: IndexInput) -> None:
+        """
+        Create an expression index over the given fields if it does not exist.
+
+        With `expire_after`, this process also deletes the expired documents of the
+        collection, see "TTL indexes" above.
+
+        Args:
+            input_data (IndexInput): The input data including the database name,
+                collection name, the indexed keys, whether they are unique and the
+                optional expiry.
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        validated_input = self._validate(IndexInput, input_data)
+        connection, table = self._table(
+            validated_input.db_name, validated_input.table_name
+        )
+        keys = ", ".join(
+            f"{_field(key)} {'DESC' if direction == -1 else 'ASC'}"
+            for key, direction in validated_input.keys
+        )
+        name = "_".join(
+            [validated_input.db_name, validated_input.table_name]
+            + [f"{key}_{direction}" for key, direction in validated_input.keys]
+        )
+        unique = "UNIQUE " if validated_input.unique else ""
+        connection.execute(
+            f'CREATE {unique}INDEX IF NOT EXISTS "{name.replace(chr(34), "")}" '
+            f"ON {table} ({keys})"
+        )
+        if validated_input.expire_after is not None:
+            field = _field(validated_input.keys[0][0])
+            _expiries[(self.path, table)] = (field, validated_input.expire_after)
+            self._expire(connection, table)
@@ -16,6 +16,12 @@ Classes:
 
     - DeleteDataInput: Pydantic model for input data to delete records from MongoDB, inheriting from QueryDataInput.
 
+    - BulkWriteInput: Pydantic model for a batch of write operations executed in a single round trip.
+
+    - ScanDataInput: Pydantic model for streaming the documents matching a (possibly empty) filter.
+
+    - IndexInput: Pydantic model describing an index of a collection.
+
 Usage:
     1. Import the required classes from this module.
     2. Use these classes as Pydantic models to validate and handle input data in MongoDB-related operations.
@@ -36,9 +42,9 @@ Note:
 
 """
 
-from typing import Dict
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 
 
 class MongoDbClientConfig(BaseModel):
@@ -133,16 +139,23 @@ class UpdateDataInput(BaseInput):
     Pydantic model for input data to update existing records in MongoDB.
 
     Attributes:
-        data (Dict): The data to be updated.
+        data (Dict): The data to be updated, or the update document when `filter` is set.
+        filter (Optional[Dict]): The filter selecting the document to update.
+        upsert (bool): Whether to insert a document when none matches `filter`.
 
     Usage:
         ```python
         update_data_input = UpdateDataInput(db_name="example_db", table_name="example_table", data={"key": "new_value"})
+        update_data_input = UpdateDataInput(
+            db_name="example_db", table_name="example_table", filter={"_id": 1}, data={"$set": {"key": "new_value"}}
+        )
         ```
 
     """
 
     data: Dict
+    filter: Optional[Dict] = None
+    upsert: bool = False
 
 
 class DeleteDataInput(QueryDataInput):
@@ -158,3 +171,145 @@ class DeleteDataInput(QueryDataInput):
         ```
 
     """
+
+
+class BulkWriteInput(BaseInput):
+    """
+    Pydantic model for a batch of write operations executed in a single round trip.
+
+    Every operation is a plain dictionary in one of the following forms:
+        - {"insert": document}
+        - {"filter": filter, "update": update_document, "upsert": bool}
+        - {"filter": filter, "replacement": document, "upsert": bool}
+        - {"delete": filter}
+
+    Attributes:
+        operations (List[Dict]): The write operations.
+        ordered (bool): Whether to stop at the first failing operation.
+
+    Usage:
+        ```python
+        bulk_input = BulkWriteInput(
+            db_name="example_db",
+            table_name="example_table",
+            operations=[{"filter": {"_id": 1}, "update": {"$inc": {"count": 2}}, "upsert": True}],
+        )
+        ```
+
+    """
+
+    operations: List[Dict]
+    ordered: bool = True
+
+    @validator("operations")
+    def validate_operations(cls, value):
+        """
+        Validator to ensure that every operation has a supported shape.
+
+        Args:
+            value (List[Dict]): The operations to be validated.
+
+        Returns:
+            List[Dict]: The validated operations.
+
+        Raises:
+            ValueError: If there are no operations or one of them is malformed.
+
+        """
+        if not value:
+            raise ValueError("Operations cannot be blank")
+        for operation in value:
+            if "insert" in operation or "delete" in operation:
+                continue
+            if "filter" not in operation or not (
+                "update" in operation or "replacement" in operation
+            ):
+                raise ValueError(f"Unsupported bulk operation: {operation}")
+        return value
+
+
+class ScanDataInput(BaseInput):
+    """
+    Pydantic model for streaming the documents matching a (possibly empty) filter.
+
+    Attributes:
+        data (Dict): The filter; an empty filter matches every document.
+        batch_size (int): Documents fetched from the server per round trip.
+        sort (Optional[List[List]]): Sort specification, e.g. [["_id", 1]].
+        limit (int): Maximum number of documents returned; 0 means no limit.
+
+    Usage:
+        ```python
+        scan_input = ScanDataInput(db_name="example_db", table_name="example_table", batch_size=500)
+        ```
+
+    """
+
+    data: Dict = {}
+    batch_size: int = Field(default=1000, gt=0)
+    sort: Optional[List[List]] = None
+    limit: int = Field(default=0, ge=0)
+
+
+class IndexInput(BaseInput):
+    """
+    Pydantic model describing an index of a collection.
+
+    Attributes:
+        keys (List[List]): The indexed fields and directions, e.g. [["api_key", 1]].
+        unique (bool): Whether the indexed values must be unique.
+        expire_after (Optional[int]): Makes a TTL index: documents are deleted this many
+            seconds after the datetime in its single key field.
+
+    Usage:
+        ```python
+        index_input = IndexInput(db_name="example_db", table_name="example_table", keys=[["api_key", 1]])
+        ```
+
+    """
+
+    keys: List[List]
+    unique: bool = False
+    expire_after: Optional[int] = Field(default=None, ge=0)
+
+    @validator("keys")
+    def validate_keys(cls, value):
+        """
+        Validator to ensure that every key is a field name and a direction of 1 or -1.
+
+        Args:
+            value (List[List]): The keys to be validated.
+
+        Returns:
+            List[List]: The validated keys.
+
+        Raises:
+            ValueError: If there are no keys or one of them is malformed.
+
+        """
+        if not value:
+            raise ValueError("Keys cannot be blank")
+        for key in value:
+            if len(key) != 2 or not isinstance(key[0], str) or key[1] not in (1, -1):
+                raise ValueError(f"Unsupported index key: {key}")
+        return value
+
+    @validator("expire_after")
+    def validate_expire_after(cls, value, values):
+        """
+        Validator to ensure that TTL indexes have a single key, as MongoDB requires.
+
+        Args:
+            value (Optional[int]): The expiry to be validated.
+            values (dict): The fields validated before.
+
+        Returns:
+            Optional[int]: The validated expiry.
+
+        Raises:
+            ValueError: If a TTL index has more than one key.
+
+        """
+        if value is not None and len(values.get("keys") or []) != 1:
+            raise ValueError("A TTL index must have exactly one key")
+        return value
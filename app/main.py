@@ -20,17 +20,49 @@ Attributes:
     - docs_url (str): The URL path for accessing the FastAPI documentation.
     - api_router (APIRouter): The router containing the API endpoints for the RapidNotify service.
     - prefix (str): The URL prefix for the included router, set to "/api/v1".
+    - RequestLoggingMiddleware: Writes one structured log line per request through the
+      queue-based logging pipeline configured at import.
+    - ProfilingMiddleware: Profiles the requests selected by `api.V1.deps.request_profiler`.
+    - startup / shutdown handlers: Start and stop the background tasks defined in `api.V1.deps`.
 
 See Also:
     - FastAPI documentation for creating applications: https://fastapi.tiangolo.com/tutorial/first-steps/
 """
+import logging
+
+from api.V1 import deps
 from api.V1.api import api_router
+from config.config import Config
 from fastapi import FastAPI
+from services.logs import RequestLoggingMiddleware, configure_logging
+from services.profiling import ProfilingMiddleware
+
+# Log through a queue so that request handlers never block on file I/O
+configure_logging(
+    "rapidNotifyAPI.log",
+    level=Config.LOG_LEVEL,
+    max_bytes=Config.LOG_MAX_BYTES,
+    backup_count=Config.LOG_BACKUP_COUNT,
+    rotate_when=Config.LOG_ROTATE_WHEN,
+    success_sample_rate=Config.LOG_SUCCESS_SAMPLE_RATE,
+)
 
 # Create an instance of the FastAPI application
 app = FastAPI(title="RapidNotify", docs_url="/")
 app.include_router(api_router, prefix="/api/v1")
 
+# Profile the requests selected on demand; a no-op unless profiling is requested
+app.add_middleware(ProfilingMiddleware, profiler=deps.request_profiler)
+
+# Log every request with its id, hashed API key, stage timings and outcome
+app.add_middleware(
+    RequestLoggingMiddleware, logger=logging.getLogger("rapidNotifyAPI.requests")
+)
+
+# Start and stop the background tasks (usage counter flushes, ...)
+app.add_event_handler("startup", deps.startup)
+app.add_event_handler("shutdown", deps.shutdown)
+
 # Run the FastAPI application when the script is executed
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,64 @@
+import time
+from typing import List, Optional
+
+from config.config import Config
+from db.mongo import DataBase, MongoDbClientConfig, ScanDataInput, UpdateDataInput
+
+
+class ApiKeyClass:
+    """
+    Persists the revocation list of API keys.
+
+    Revocation documents are keyed by the key id of the revoked key (see
+    `services.apikeys`) and hold the `chat_id` of its subscription, if known, and the
+    Unix time it was `revoked` at.
+
+    Attributes:
+        - __db (DataBase): An instance of the `DataBase` class for handling database operations.
+
+    Methods:
+        - revoke(key_id: str, chat_id: int) -> None: Add a key to the revocation list.
+        - revoked() -> list: Read the key ids of every revoked key.
+    """
+
+    def __init__(self):
+        """
+        Initialize an ApiKeyClass instance for the revocation collection from `Config`.
+        """
+        self.__db = DataBase(MongoDbClientConfig(**{"db_url": Config.DB_URL}))
+        self.__revoked_db = {
+            "db_name": Config.DB_NAME,
+            "table_name": Config.REVOKED_KEYS_TABLE_NAME,
+        }
+
+    def revoke(self, key_id: str, chat_id: Optional[int] = None) -> None:
+        """
+        Add a key to the revocation list.
+
+        Args:
+            key_id (str): The key id of the revoked key.
+            chat_id (Optional[int]): The chat of its subscription.
+        """
+        data = {
+            "filter": {"_id": key_id},
+            "data": {"$set": {"chat_id": chat_id, "revoked": time.time()}},
+            "upsert": True,
+        }
+        data.update(self.__revoked_db)
+        self.__db.update(UpdateDataInput(**data))
+
+    def revoked(self, batch_size: int = 1000) -> List[str]:
+        """
+        Read the key ids of every revoked key.
+
+        Args:
+            batch_size (int): Documents fetched per round trip.
+
+        Returns:
+            List[str]: The key ids.
+        """
+        data = {"batch_size": batch_size}
+        data.update(self.__revoked_db)
+        return [
+            document["_id"] for document in self.__db.iterate(ScanDataInput(**data))
+        ]
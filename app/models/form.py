@@ -1,5 +1,16 @@
+import time
+from typing import Dict, Iterator, List
+
 from config.config import Config
-from db.mongo import DataBase, MongoDbClientConfig, QueryDataInput
+from db.mongo import (
+    BulkWriteInput,
+    DataBase,
+    IndexInput,
+    MongoDbClientConfig,
+    QueryDataInput,
+    ScanDataInput,
+    UpdateDataInput,
+)
 
 
 class FormClass:
@@ -17,10 +28,19 @@ class FormClass:
     Methods:
         - save(data: dict) -> str: Inserts data into the database table.
         - get(data_id: int) -> dict: Retrieves data by data ID from the database table.
+        - get_many(uuids: list) -> dict: Retrieves the subscriptions of several API keys in one query.
         - get_all() -> list[dict]: Retrieves all data from the database table.
         - filter(filter: dict) -> list[dict]: Retrieves data based on filter criteria from the database table.
         - update(data: dict) -> str: Updates data in the database table.
         - delete(data_id: int) -> str: Deletes data based on data ID from the database table.
+        - set_template(uuid: str, name: str, template: str) -> bool: Stores a message template.
+        - delete_template(uuid: str, name: str) -> bool: Removes a message template.
+        - set_callback(uuid: str, url: str, secret: str) -> bool: Registers a delivery callback.
+        - delete_callback(uuid: str) -> bool: Removes the delivery callback.
+        - release_api_key(uuid: str) -> bool: Detaches a revoked API key from its subscription.
+        - export(batch_size: int) -> Iterator[dict]: Streams every subscription ordered by `_id`.
+        - write_batch(operations: list, ordered: bool) -> None: Applies bulk write operations.
+        - mark_unreachable(chat_id: int, reason: str) -> None: Flags a chat the bot cannot message.
 
     Note:
         - The class initializes database-related attributes from environment variables loaded via `load_dotenv()`.
@@ -43,6 +63,10 @@ class FormClass:
             "db_name": self.__db_name,
             "table_name": self.__table_name,
         }
+        # Every API request looks its subscription up by API key
+        index = {"keys": [["api_key", 1]]}
+        index.update(self.__rapid_bot_db)
+        self.__db.create_index(IndexInput(**index))
 
     def get(self, uuid: int) -> dict:
         """
@@ -57,3 +81,161 @@ class FormClass:
         data = {"data": {"api_key": uuid}}
         data.update(self.__rapid_bot_db)
         return self.__db.query(QueryDataInput(**data))
+
+    def get_many(self, uuids: List[str]) -> Dict[str, List[dict]]:
+        """
+        Retrieves the subscriptions of several API keys with a single `$in` query.
+
+        Args:
+            uuids (List[str]): The API keys.
+
+        Returns:
+            Dict[str, List[dict]]: The documents of every API key found, in the shape
+                returned by `get`; keys without a subscription are left out.
+        """
+        data = {"data": {"api_key": {"$in": list(uuids)}}}
+        data.update(self.__rapid_bot_db)
+        subscriptions = {}
+        for document in self.__db.query(QueryDataInput(**data)):
+            subscriptions.setdefault(document["api_key"], []).append(document)
+        return subscriptions
+
+    def set_template(self, uuid: str, name: str, template: str) -> bool:
+        """
+        Stores a named message template in the subscription document.
+
+        Args:
+            uuid (str): The API key identifying the subscription.
+            name (str): The template name.
+            template (str): The template source.
+
+        Returns:
+            bool: True if a subscription with this API key exists.
+        """
+        data = {
+            "filter": {"api_key": uuid},
+            "data": {"$set": {f"templates.{name}": template}},
+        }
+        data.update(self.__rapid_bot_db)
+        return self.__db.update(UpdateDataInput(**data)).matched_count > 0
+
+    def delete_template(self, uuid: str, name: str) -> bool:
+        """
+        Removes a named message template from the subscription document.
+
+        Args:
+            uuid (str): The API key identifying the subscription.
+            name (str): The template name.
+
+        Returns:
+            bool: True if a subscription with this API key exists.
+        """
+        data = {
+            "filter": {"api_key": uuid},
+            "data": {"$unset": {f"templates.{name}": ""}},
+        }
+        data.update(self.__rapid_bot_db)
+        return self.__db.update(UpdateDataInput(**data)).matched_count > 0
+
+    def set_callback(self, uuid: str, url: str, secret: str) -> bool:
+        """
+        Registers the URL delivery outcomes of a subscription are POSTed to.
+
+        Args:
+            uuid (str): The API key identifying the subscription.
+            url (str): The callback URL.
+            secret (str): The secret the callback requests are signed with.
+
+        Returns:
+            bool: True if a subscription with this API key exists.
+        """
+        data = {
+            "filter": {"api_key": uuid},
+            "data": {"$set": {"callback": {"url": url, "secret": secret}}},
+        }
+        data.update(self.__rapid_bot_db)
+        return self.__db.update(UpdateDataInput(**data)).matched_count > 0
+
+    def delete_callback(self, uuid: str) -> bool:
+        """
+        Removes the delivery callback of a subscription.
+
+        Args:
+            uuid (str): The API key identifying the subscription.
+
+        Returns:
+            bool: True if a subscription with this API key exists.
+        """
+        data = {
+            "filter": {"api_key": uuid},
+            "data": {"$unset": {"callback": ""}},
+        }
+        data.update(self.__rapid_bot_db)
+        return self.__db.update(UpdateDataInput(**data)).matched_count > 0
+
+    def release_api_key(self, uuid: str) -> bool:
+        """
+        Detaches a revoked API key from its subscription, so that /subscribe issues a
+        new one.
+
+        Args:
+            uuid (str): The revoked API key.
+
+        Returns:
+            bool: True if a subscription with this API key exists.
+        """
+        data = {
+            "filter": {"api_key": uuid},
+            "data": {"$unset": {"api_key": ""}},
+        }
+        data.update(self.__rapid_bot_db)
+        return self.__db.update(UpdateDataInput(**data)).matched_count > 0
+
+    def export(self, batch_size: int = 1000) -> Iterator[dict]:
+        """
+        Streams every subscription document, ordered by `_id`.
+
+        Args:
+            batch_size (int): Documents fetched per round trip.
+
+        Returns:
+            Iterator[dict]: The subscription documents.
+        """
+        data = {"batch_size": batch_size, "sort": [["_id", 1]]}
+        data.update(self.__rapid_bot_db)
+        return self.__db.iterate(ScanDataInput(**data))
+
+    def write_batch(self, operations: List[dict], ordered: bool = True) -> None:
+        """
+        Applies a batch of bulk write operations to the subscriptions.
+
+        Args:
+            operations (List[dict]): The operations, see `BulkWriteInput`.
+            ordered (bool): Whether to stop at the first failing operation.
+        """
+        data = {"operations": operations, "ordered": ordered}
+        data.update(self.__rapid_bot_db)
+        self.__db.bulk_write(BulkWriteInput(**data))
+
+    def mark_unreachable(self, chat_id: int, reason: str) -> None:
+        """
+        Flags a subscription whose chat blocked or deleted the bot.
+
+        The flag is cleared by the bot when the user sends /start again.
+
+        Args:
+            chat_id (int): The chat id, i.e. the `_id` of the subscription.
+            reason (str): The Telegram error.
+        """
+        data = {
+            "filter": {"_id": chat_id},
+            "data": {
+                "$set": {
+                    "unreachable": True,
+                    "unreachable_reason": reason,
+                    "unreachable_since": time.time(),
+                }
+            },
+        }
+        data.update(self.__rapid_bot_db)
+        self.__db.update(UpdateDataInput(**data))
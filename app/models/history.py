@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from config.config import Config
+from db.mongo import (
+    BulkWriteInput,
+    DataBase,
+    IndexInput,
+    MongoDbClientConfig,
+    ScanDataInput,
+)
+from services.history import page_query
+
+
+class HistoryClass:
+    """
+    Persists the history of the notifications sent to every chat.
+
+    History documents are keyed by the `notification_id` of the notification and hold
+    the `chat_id` and `bot_id` it was delivered to, the rendered `text`, its `priority`,
+    `stream_id` and delivery `status`, and the UTC datetime `sent_at`.
+
+    Indexes:
+        - (chat_id, sent_at, _id): Serves the newest-first pages of a chat, including
+          the keyset condition of the following pages, as one index range scan.
+        - sent_at: A TTL index deleting entries `Config.HISTORY_TTL` seconds old.
+
+    Attributes:
+        - __db (DataBase): An instance of the `DataBase` class for handling database operations.
+
+    Methods:
+        - write(entries: list) -> None: Store a batch of history entries.
+        - page(chat_id: int, limit: int, after: tuple) -> list: Read a page of a chat's history.
+    """
+
+    def __init__(self):
+        """
+        Initialize a HistoryClass instance for the history collection from `Config`.
+        """
+        self.__db = DataBase(MongoDbClientConfig(**{"db_url": Config.DB_URL}))
+        self.__history_db = {
+            "db_name": Config.DB_NAME,
+            "table_name": Config.HISTORY_TABLE_NAME,
+        }
+        for index in (
+            {"keys": [["chat_id", 1], ["sent_at", -1], ["_id", -1]]},
+            {"keys": [["sent_at", 1]], "expire_after": Config.HISTORY_TTL},
+        ):
+            index.update(self.__history_db)
+            self.__db.create_index(IndexInput(**index))
+
+    def write(self, entries: List[dict]) -> None:
+        """
+        Store a batch of history entries with one unordered bulk write.
+
+        Entries are upserted by `_id`, so writing a batch again after a failure, or a
+        newer status of a notification, does not create duplicates.
+
+        Args:
+            entries (List[dict]): The history documents.
+        """
+        operations = [
+            {"filter": {"_id": entry["_id"]}, "replacement": entry, "upsert": True}
+            for entry in entries
+        ]
+        data = {"operations": operations, "ordered": False}
+        data.update(self.__history_db)
+        self.__db.bulk_write(BulkWriteInput(**data))
+
+    def page(
+        self,
+        chat_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> List[dict]:
+        """
+        Read a page of a chat's history, newest first.
+
+        Args:
+            chat_id (int): The chat.
+            limit (int): Maximum number of entries.
+            after (Optional[Tuple[datetime, str]]): The (`sent_at`, `_id`) of the last
+                entry of the previous page, None for the first page.
+
+        Returns:
+            List[dict]: The entries following `after`.
+        """
+        data = page_query(chat_id, limit, after)
+        data.update(self.__history_db)
+        return list(self.__db.iterate(ScanDataInput(**data)))
@@ -0,0 +1,246 @@
+import time
+import uuid
+from typing import List, Optional
+
+from config.config import Config
+from db.mongo import (
+    BulkWriteInput,
+    DataBase,
+    DeleteDataInput,
+    IndexInput,
+    MongoDbClientConfig,
+    ScanDataInput,
+    UpdateDataInput,
+    UploadDataInput,
+)
+from services.retry import requeue_dead_letters
+
+
+class RetryClass:
+    """
+    Persists failed Telegram deliveries which are retried, and those which gave up.
+
+    The document layout is described in `services.retry`.
+
+    Attributes:
+        - __db (DataBase): An instance of the `DataBase` class for handling database operations.
+
+    Methods:
+        - enqueue(...) -> str: Store a delivery to be retried at `next_attempt`.
+        - due(now: float, limit: int) -> list: Read the deliveries due for a retry.
+        - claim(retry: dict, lease_until: float) -> bool: Take a due delivery for this worker.
+        - reschedule(retry_id: str, attempts: int, next_attempt: float, error: str, part: int) -> None
+        - complete(retry_id: str) -> None: Remove a delivered retry.
+        - dead_letter(retry: dict, attempts: int, error: str) -> None: Give up on a delivery.
+        - replay(batch_size: int) -> int: Requeue every dead-lettered delivery.
+    """
+
+    def __init__(self):
+        """
+        Initialize a RetryClass instance for the retry and dead-letter collections from `Config`.
+        """
+        self.__db = DataBase(MongoDbClientConfig(**{"db_url": Config.DB_URL}))
+        self.__retry_db = {
+            "db_name": Config.DB_NAME,
+            "table_name": Config.RETRY_TABLE_NAME,
+        }
+        self.__dead_letter_db = {
+            "db_name": Config.DB_NAME,
+            "table_name": Config.DEAD_LETTER_TABLE_NAME,
+        }
+        index = {"keys": [["next_attempt", 1]]}
+        index.update(self.__retry_db)
+        self.__db.create_index(IndexInput(**index))
+
+    def enqueue(
+        self,
+        bot_id: str,
+        chat_id: int,
+        text: str,
+        priority: str,
+        error: str,
+        attempts: int,
+        next_attempt: float,
+        api_key: Optional[str] = None,
+        notification_id: Optional[str] = None,
+        parts: Optional[List[str]] = None,
+        part: int = 0,
+    ) -> str:
+        """
+        Store a failed delivery to be retried.
+
+        Args:
+            bot_id (str): The bot the message is sent by.
+            chat_id (int): The chat the message is delivered to.
+            text (str): The message text.
+            priority (str): The delivery lane of the message.
+            error (str): The last failure.
+            attempts (int): Attempts made so far.
+            next_attempt (float): The Unix time of the next attempt.
+            api_key (Optional[str]): The API key whose callback is told the outcome.
+            notification_id (Optional[str]): The id reported to the callback.
+            parts (Optional[List[str]]): The messages a long `text` is sent as, if it
+                was split.
+            part (int): The index of the first part not sent yet.
+
+        Returns:
+            str: The id of the retry.
+        """
+        retry_id = uuid.uuid4().hex
+        data = {
+            "data": {
+                "_id": retry_id,
+                "bot_id": bot_id,
+                "chat_id": chat_id,
+                "text": text,
+                "priority": priority,
+                "attempts": attempts,
+                "next_attempt": next_attempt,
+                "last_error": error,
+                "created": time.time(),
+                "api_key": api_key,
+                "notification_id": notification_id,
+            }
+        }
+        if parts is not None:
+            data["data"].update({"parts": parts, "part": part})
+        data.update(self.__retry_db)
+        self.__db.upload(UploadDataInput(**data))
+        return retry_id
+
+    def due(self, now: float, limit: int) -> List[dict]:
+        """
+        Read the deliveries whose next attempt is due, oldest first.
+
+        Args:
+            now (float): The current Unix time.
+            limit (int): Maximum number of deliveries returned.
+
+        Returns:
+            List[dict]: The retry documents.
+        """
+        data = {
+            "data": {"next_attempt": {"$lte": now}},
+            "sort": [["next_attempt", 1]],
+            "batch_size": limit,
+            "limit": limit,
+        }
+        data.update(self.__retry_db)
+        return list(self.__db.iterate(ScanDataInput(**data)))
+
+    def claim(self, retry: dict, lease_until: float) -> bool:
+        """
+        Take a due delivery, pushing its next attempt to `lease_until`.
+
+        The claim only succeeds if no other worker moved the delivery since it was
+        read, and a delivery whose worker died is picked up again once the lease ends.
+
+        Args:
+            retry (dict): The retry document returned by `due`.
+            lease_until (float): The Unix time until which the delivery is reserved.
+
+        Returns:
+            bool: True if this worker owns the attempt.
+        """
+        data = {
+            "filter": {"_id": retry["_id"], "next_attempt": retry["next_attempt"]},
+            "data": {"$set": {"next_attempt": lease_until}},
+        }
+        data.update(self.__retry_db)
+        return self.__db.update(UpdateDataInput(**data)).modified_count == 1
+
+    def reschedule(
+        self,
+        retry_id: str,
+        attempts: int,
+        next_attempt: float,
+        error: str,
+        part: Optional[int] = None,
+    ) -> None:
+        """
+        Record a failed attempt and the time of the next one.
+
+        Args:
+            retry_id (str): The id of the retry.
+            attempts (int): Attempts made so far.
+            next_attempt (float): The Unix time of the next attempt.
+            error (str): The last failure.
+            part (Optional[int]): The first part not sent yet, for a split message.
+        """
+        fields = {
+            "attempts": attempts,
+            "next_attempt": next_attempt,
+            "last_error": error,
+        }
+        if part is not None:
+            fields["part"] = part
+        data = {"filter": {"_id": retry_id}, "data": {"$set": fields}}
+        data.update(self.__retry_db)
+        self.__db.update(UpdateDataInput(**data))
+
+    def complete(self, retry_id: str) -> None:
+        """
+        Remove a retry whose delivery succeeded.
+
+        Args:
+            retry_id (str): The id of the retry.
+        """
+        data = {"data": {"_id": retry_id}}
+        data.update(self.__retry_db)
+        self.__db.delete(DeleteDataInput(**data))
+
+    def dead_letter(self, retry: dict, attempts: int, error: str) -> None:
+        """
+        Move a delivery which will not be retried to the dead-letter collection.
+
+        Args:
+            retry (dict): The retry document.
+            attempts (int): Attempts made.
+            error (str): The last failure.
+        """
+        letter = {
+            **retry,
+            "attempts": attempts,
+            "last_error": error,
+            "failed_at": time.time(),
+        }
+        data = {
+            "operations": [
+                {"filter": {"_id": retry["_id"]}, "replacement": letter, "upsert": True}
+            ]
+        }
+        data.update(self.__dead_letter_db)
+        self.__db.bulk_write(BulkWriteInput(**data))
+        self.complete(retry["_id"])
+
+    def replay(self, batch_size: int = 1000) -> int:
+        """
+        Requeue every dead-lettered delivery, due immediately.
+
+        The running API retries them through the delivery scheduler, so the replay is
+        subject to the same rate limits as any other traffic.
+
+        Args:
+            batch_size (int): Documents per bulk write.
+
+        Returns:
+            int: The number of deliveries requeued.
+        """
+
+        def write(table: dict):
+            def write_batch(operations):
+                data = {"operations": operations, "ordered": False}
+                data.update(table)
+                self.__db.bulk_write(BulkWriteInput(**data))
+
+            return write_batch
+
+        data = {"batch_size": batch_size, "sort": [["_id", 1]]}
+        data.update(self.__dead_letter_db)
+        return requeue_dead_letters(
+            self.__db.iterate(ScanDataInput(**data)),
+            write(self.__retry_db),
+            write(self.__dead_letter_db),
+            batch_size,
+            time.time(),
+        )
@@ -0,0 +1,70 @@
+from typing import Dict, List, Tuple
+
+from config.config import Config
+from db.mongo import BulkWriteInput, DataBase, MongoDbClientConfig, QueryDataInput
+
+
+class UsageClass:
+    """
+    Persists per-API-key daily usage counters.
+
+    Usage documents are keyed by "<api_key>:<YYYY-MM-DD>" and hold the `api_key`, the
+    UTC `day` and the request `count` of that day.
+
+    Attributes:
+        - __db (DataBase): An instance of the `DataBase` class for handling database operations.
+
+    Methods:
+        - increment(counts: dict) -> None: Add aggregated counts with a single bulk write.
+        - totals(day: str, api_keys: list) -> dict: Read the counts of a day for the given keys.
+    """
+
+    def __init__(self):
+        """
+        Initialize a UsageClass instance for the usage collection from `Config`.
+        """
+        self.__db = DataBase(MongoDbClientConfig(**{"db_url": Config.DB_URL}))
+        self.__usage_db = {
+            "db_name": Config.DB_NAME,
+            "table_name": Config.USAGE_TABLE_NAME,
+        }
+
+    def increment(self, counts: Dict[Tuple[str, str], int]) -> None:
+        """
+        Add aggregated counts to the usage documents with one unordered bulk write.
+
+        Args:
+            counts (Dict[Tuple[str, str], int]): Increments keyed by (day, api_key).
+        """
+        operations = [
+            {
+                "filter": {"_id": f"{api_key}:{day}"},
+                "update": {
+                    "$inc": {"count": count},
+                    "$setOnInsert": {"api_key": api_key, "day": day},
+                },
+                "upsert": True,
+            }
+            for (day, api_key), count in counts.items()
+        ]
+        data = {"operations": operations, "ordered": False}
+        data.update(self.__usage_db)
+        self.__db.bulk_write(BulkWriteInput(**data))
+
+    def totals(self, day: str, api_keys: List[str]) -> Dict[str, int]:
+        """
+        Read the request counts of a day for the given API keys.
+
+        Args:
+            day (str): The UTC day in ISO format.
+            api_keys (List[str]): The API keys.
+
+        Returns:
+            Dict[str, int]: The count of each key that has a usage document.
+        """
+        data = {"data": {"_id": {"$in": [f"{key}:{day}" for key in api_keys]}}}
+        data.update(self.__usage_db)
+        return {
+            document["api_key"]: document["count"]
+            for document in self.__db.query(QueryDataInput(**data))
+        }
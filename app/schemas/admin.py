@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+
+
+class ProfilingInput(BaseModel):
+    """
+    Pydantic model representing the request profiling settings.
+
+    Attributes:
+        enabled (bool): Whether a sample of requests is profiled.
+        sample_rate (float): Fraction of requests profiled while enabled, 0 to 1.
+
+    Example:
+        ```python
+        ProfilingInput(enabled=True, sample_rate=0.05)
+        ```
+    """
+
+    enabled: bool
+    sample_rate: float = Field(default=0.01, ge=0, le=1)
+
+
+class RevokeKeyInput(BaseModel):
+    """
+    Pydantic model identifying an API key to revoke.
+
+    Attributes:
+        api_key (str): The signed or legacy API key.
+    """
+
+    api_key: str = Field(min_length=1)
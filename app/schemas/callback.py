@@ -0,0 +1,38 @@
+from pydantic import AnyHttpUrl, BaseModel, field_validator
+
+
+class CallbackInput(BaseModel):
+    """
+    Pydantic model representing the callback URL registered by a subscriber.
+
+    Attributes:
+        api_key (str): The key identifying the subscriber.
+        url (AnyHttpUrl): The https URL delivery outcomes are POSTed to.
+
+    Example:
+        ```python
+        CallbackInput(api_key="...", url="https://example.com/rapidnotify/outcomes")
+        ```
+    """
+
+    api_key: str
+    url: AnyHttpUrl
+
+    @field_validator("url")
+    @classmethod
+    def require_https(cls, url: AnyHttpUrl) -> AnyHttpUrl:
+        """Reject plain http callback URLs."""
+        if url.scheme != "https":
+            raise ValueError("Callback URLs must be https.")
+        return url
+
+
+class CallbackDeleteInput(BaseModel):
+    """
+    Pydantic model identifying the subscriber whose callback is removed.
+
+    Attributes:
+        api_key (str): The key identifying the subscriber.
+    """
+
+    api_key: str
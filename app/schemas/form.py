@@ -1,4 +1,30 @@
-from pydantic import BaseModel
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class Priority(str, Enum):
+    """
+    Delivery lane of a notification, from most to least urgent.
+
+    High-priority notifications are dispatched ahead of queued normal and low
+    priority traffic. Lower lanes are still served once their oldest entry has
+    waited longer than the configured starvation timeout.
+    """
+
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+class AttachmentKind(str, Enum):
+    """
+    How an attachment is delivered: as a generic document or as a compressed photo.
+    """
+
+    DOCUMENT = "document"
+    PHOTO = "photo"
 
 
 class FormInput(BaseModel):
@@ -6,8 +32,13 @@ class FormInput(BaseModel):
     Pydantic model representing the input data for RapidNotify endpoint.
 
     Attributes:
-        bot_key (str): The key identifying the bot.
-        data (dict): A dictionary containing the data associated with the bot.
+        api_key (str): The key identifying the subscriber.
+        data (Optional[dict]): A dictionary containing the data associated with the bot.
+        template (Optional[str]): The name of a stored template, used instead of `data`.
+        vars (Optional[dict]): The variables the template is rendered with.
+        priority (Priority): The delivery lane of the notification, defaults to "normal".
+        stream_id (Optional[str]): Groups progress updates; the first notification of a
+            stream sends a message and later ones edit it in place.
 
     Example:
         Example usage of this model in a FastAPI endpoint:
@@ -26,4 +57,20 @@ class FormInput(BaseModel):
     """
 
     api_key: str
-    data: dict
+    data: Optional[dict] = None
+    template: Optional[str] = None
+    vars: Optional[dict] = None
+    priority: Priority = Priority.NORMAL
+    stream_id: Optional[str] = Field(default=None, min_length=1, max_length=64)
+
+    @model_validator(mode="after")
+    def validate_content(self):
+        """
+        Validator to ensure that exactly one of `data` and `template` is provided.
+
+        Raises:
+            ValueError: If both or neither are provided.
+        """
+        if (self.data is None) == (self.template is None):
+            raise ValueError("Provide either 'data' or 'template'.")
+        return self
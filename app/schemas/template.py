@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from services.templates import MAX_TEMPLATE_LENGTH, NAME_PATTERN
+
+
+class TemplateInput(BaseModel):
+    """
+    Pydantic model representing a message template registered by a subscriber.
+
+    Attributes:
+        api_key (str): The key identifying the subscriber.
+        name (str): The template name; letters, digits, "_" and "-" only.
+        template (str): The template source, e.g. "Build {build} is {status}".
+
+    Example:
+        ```python
+        TemplateInput(api_key="...", name="deploy", template="Deployed {version} to {env}")
+        ```
+    """
+
+    api_key: str
+    name: str = Field(pattern=NAME_PATTERN)
+    template: str = Field(min_length=1, max_length=MAX_TEMPLATE_LENGTH)
+
+
+class TemplateDeleteInput(BaseModel):
+    """
+    Pydantic model identifying a stored template to delete.
+
+    Attributes:
+        api_key (str): The key identifying the subscriber.
+        name (str): The template name.
+    """
+
+    api_key: str
+    name: str = Field(pattern=NAME_PATTERN)
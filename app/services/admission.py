@@ -0,0 +1,246 @@
+"""
+Module: admission
+
+This module provides admission control for the ingest API: a bounded number of
+requests in flight, an optional short wait queue with a deadline, and immediate
+rejection once both are exhausted.
+
+Classes:
+    - Overloaded: Raised when a request is not admitted.
+    - AdmissionLimit: The limits of one admission pool.
+    - AdmissionLimiter: A pool of in-flight slots with a bounded wait queue.
+    - AdmissionController: Maps routes and priorities to their limiters.
+
+Functions:
+    - parse_limits(spec: str) -> dict: Parse per-route/per-priority limit overrides.
+
+Example:
+    ```python
+    controller = AdmissionController(AdmissionLimit(64, 128, 0.5))
+    limiter = controller.limiter("RapidNotify", "high")
+    await limiter.acquire()  # raises Overloaded when saturated
+    try:
+        ...
+    finally:
+        limiter.release()
+    ```
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Dict, NamedTuple, Optional
+
+
+class Overloaded(Exception):
+    """
+    Raised when a request cannot be admitted.
+
+    Attributes:
+        retry_after (int): Seconds after which the request may be retried.
+    """
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Service overloaded, please retry later.")
+        self.retry_after = retry_after
+
+
+class AdmissionLimit(NamedTuple):
+    """
+    The limits of one admission pool.
+
+    Attributes:
+        max_in_flight (int): Requests processed concurrently.
+        queue_size (int): Requests allowed to wait for a slot; 0 disables queueing.
+        queue_timeout (float): Seconds a request may wait before it is rejected.
+    """
+
+    max_in_flight: int
+    queue_size: int = 0
+    queue_timeout: float = 0.0
+
+
+def parse_limits(spec: str) -> Dict[str, AdmissionLimit]:
+    """Parse limit overrides of the form "route[:priority]=in_flight/queue/timeout,...".
+
+    Args:
+        spec (str): The overrides, e.g. "RapidNotify:high=128/256/1,attachment=4".
+
+    Returns:
+        Dict[str, AdmissionLimit]: The limits keyed by "route" or "route:priority".
+
+    Raises:
+        ValueError: If the spec is malformed.
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, _, values = item.partition("=")
+        fields = values.split("/")
+        if not key or not values or len(fields) > 3:
+            raise ValueError(f"Invalid admission limit: {item}")
+        limits[key.strip()] = AdmissionLimit(
+            int(fields[0]),
+            int(fields[1]) if len(fields) > 1 else 0,
+            float(fields[2]) if len(fields) > 2 else 0.0,
+        )
+    return limits
+
+
+class AdmissionLimiter:
+    """
+    A pool of in-flight slots with a bounded, deadline-limited wait queue.
+
+    Freed slots are handed directly to the oldest waiter, so queued requests are
+    admitted in arrival order.
+
+    Args:
+        limit (AdmissionLimit): The limits of the pool.
+
+    Methods:
+        - acquire(): Take a slot, waiting in the queue if allowed.
+        - release(): Return a slot.
+        - snapshot() -> dict: Counters and queue wait times.
+    """
+
+    def __init__(self, limit: AdmissionLimit) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: deque = deque()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.queued = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.limit.queue_timeout))
+
+    async def acquire(self) -> None:
+        """Take an in-flight slot.
+
+        Raises:
+            Overloaded: If no slot is free and the queue is full, or the queue
+                deadline passed before a slot was handed over.
+        """
+        if self.in_flight < self.limit.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.limit.queue_size:
+            self.rejected += 1
+            raise Overloaded(self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.limit.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                self.rejected += 1
+                self.timed_out += 1
+                raise Overloaded(self._retry_after())
+        except asyncio.CancelledError:
+            # The slot may have been handed over while we were being cancelled
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        # The slot was handed over by `release`, which kept `in_flight` unchanged
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Return a slot, handing it to the oldest waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        """Return the counters and queue wait times of the pool.
+
+        Returns:
+            dict: Limits, in-flight and queued requests, admitted/rejected counters
+                and average/maximum queue wait in milliseconds.
+        """
+        return {
+            "max_in_flight": self.limit.max_in_flight,
+            "queue_size": self.limit.queue_size,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "queued": self.queued,
+            "avg_queue_wait_ms": round(self._wait_total / self.queued * 1000, 2)
+            if self.queued
+            else 0.0,
+            "max_queue_wait_ms": round(self._wait_max * 1000, 2),
+        }
+
+
+class AdmissionController:
+    """
+    Map routes and priorities to admission limiters.
+
+    A request for `route` with `priority` uses the limiter configured for
+    "route:priority" if there is one, otherwise the limiter of "route", which uses
+    `default` unless it was overridden.
+
+    Args:
+        default (AdmissionLimit): The limits of routes without an override.
+        overrides (Optional[Dict[str, AdmissionLimit]]): Limits keyed by "route" or
+            "route:priority".
+
+    Methods:
+        - limiter(route: str, priority: Optional[str]) -> AdmissionLimiter: Pick the limiter.
+        - snapshot() -> dict: Metrics of every limiter in use.
+    """
+
+    def __init__(
+        self,
+        default: AdmissionLimit,
+        overrides: Optional[Dict[str, AdmissionLimit]] = None,
+    ) -> None:
+        self.default = default
+        self.overrides = overrides or {}
+        self._limiters: Dict[str, AdmissionLimiter] = {}
+
+    def limiter(self, route: str, priority: Optional[str] = None) -> AdmissionLimiter:
+        """Return the limiter of a route and priority, creating it on first use.
+
+        Args:
+            route (str): The route name, e.g. "RapidNotify".
+            priority (Optional[str]): The priority of the request.
+
+        Returns:
+            AdmissionLimiter: The limiter to acquire a slot from.
+        """
+        key = f"{route}:{priority}"
+        if priority is None or key not in self.overrides:
+            key = route
+
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = AdmissionLimiter(self.overrides.get(key, self.default))
+            self._limiters[key] = limiter
+        return limiter
+
+    def snapshot(self) -> dict:
+        """Return the metrics of every limiter, keyed by "route" or "route:priority"."""
+        return {key: limiter.snapshot() for key, limiter in self._limiters.items()}
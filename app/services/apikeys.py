@@ -0,0 +1,163 @@
+"""
+Module: apikeys
+
+This module issues and verifies signed API keys, which carry the chat and bot of a
+subscription so that requests can be authenticated and routed without a lookup.
+
+Classes:
+    - SignedKey: The fields of a verified key.
+    - InvalidApiKey: Raised for forged, malformed or revoked keys.
+    - ApiKeySigner: Issues and verifies keys with an HMAC secret and keeps the
+      revocation list.
+
+Key Format:
+    "rn1.<chat_id>.<bot_id>.<key_id>.<mac>" where `key_id` is a random identifier of
+    the key and `mac` the first 16 bytes of the HMAC-SHA256 of everything before it,
+    both URL-safe base64 without padding. `bot_id` is empty for keys of the default bot.
+
+Usage:
+    ```python
+    signer = ApiKeySigner(secret="...")
+    api_key = signer.issue(chat_id=42, bot_id="123456")
+    signer.verify(api_key)  # SignedKey(key_id="...", chat_id=42, bot_id="123456")
+    ```
+
+Notes:
+    - Keys without the "rn1." prefix are the random keys issued before signed keys;
+      `verify` returns None for them and they are still looked up in the database.
+    - Revoked keys, signed or not, are kept in memory by their `key_id` (the whole key
+      for unsigned ones), so they are rejected without a lookup too.
+"""
+import base64
+import hashlib
+import hmac
+import os
+from typing import Iterable, NamedTuple, Optional, Set
+
+PREFIX = "rn1"
+MAC_BYTES = 16
+
+
+class SignedKey(NamedTuple):
+    """
+    The fields of a verified signed API key.
+
+    Attributes:
+        key_id (str): The random identifier of the key, used to revoke it.
+        chat_id (int): The chat notifications are delivered to.
+        bot_id (Optional[str]): The bot delivering them, None for the default bot.
+    """
+
+    key_id: str
+    chat_id: int
+    bot_id: Optional[str]
+
+
+class InvalidApiKey(ValueError):
+    """Raised when an API key is forged, malformed or revoked."""
+
+
+def _encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class ApiKeySigner:
+    """
+    Issue and verify signed API keys.
+
+    Args:
+        secret (Optional[str]): The HMAC secret. Without one, no keys are issued and
+            every key is treated as unsigned.
+
+    Attributes:
+        revoked (Set[str]): The key ids of the revoked keys.
+
+    Methods:
+        - issue(chat_id: int, bot_id) -> str: A new signed key.
+        - is_signed(api_key: str) -> bool: Whether a key has the signed format.
+        - key_id(api_key: str) -> str: The identifier a key is revoked by.
+        - verify(api_key: str) -> Optional[SignedKey]: Check a key using only CPU.
+        - revoke(key_id: str): Reject a key from now on.
+        - load_revoked(key_ids: Iterable[str]): Replace the revocation list.
+    """
+
+    def __init__(self, secret: Optional[str]) -> None:
+        self.secret = secret.encode() if secret else None
+        self.revoked: Set[str] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether signed keys are issued and verified."""
+        return self.secret is not None
+
+    def _mac(self, payload: str) -> str:
+        digest = hmac.new(self.secret, payload.encode(), hashlib.sha256).digest()
+        return _encode(digest[:MAC_BYTES])
+
+    def issue(self, chat_id: int, bot_id=None) -> str:
+        """Return a new signed key for a chat.
+
+        Args:
+            chat_id (int): The chat of the subscription.
+            bot_id (Optional[Union[int, str]]): The bot the subscription is pinned to.
+
+        Returns:
+            str: The signed key.
+
+        Raises:
+            RuntimeError: If no secret is configured.
+        """
+        if not self.enabled:
+            raise RuntimeError("Signed API keys require a secret.")
+        key_id = _encode(os.urandom(9))
+        payload = f"{PREFIX}.{int(chat_id)}.{bot_id or ''}.{key_id}"
+        return f"{payload}.{self._mac(payload)}"
+
+    @staticmethod
+    def is_signed(api_key: str) -> bool:
+        """Whether a key has the signed key format; its signature is not checked."""
+        return api_key.startswith(PREFIX + ".")
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        """Return the identifier a key is revoked by: its `key_id` part when signed."""
+        parts = api_key.split(".")
+        if len(parts) == 5 and parts[0] == PREFIX:
+            return parts[3]
+        return api_key
+
+    def verify(self, api_key: str) -> Optional[SignedKey]:
+        """Check an API key without any I/O.
+
+        Args:
+            api_key (str): The key of a request.
+
+        Returns:
+            Optional[SignedKey]: The fields of a valid signed key, or None for an
+                unsigned key which has to be looked up.
+
+        Raises:
+            InvalidApiKey: If the key is revoked, or claims to be signed but its
+                signature or format is invalid.
+        """
+        if self.key_id(api_key) in self.revoked:
+            raise InvalidApiKey("The API key was revoked.")
+        if not self.enabled or not self.is_signed(api_key):
+            return None
+
+        payload, _, mac = api_key.rpartition(".")
+        if not hmac.compare_digest(mac.encode(), self._mac(payload).encode()):
+            raise InvalidApiKey("The API key signature is invalid.")
+        try:
+            _, chat_id, bot_id, key_id = payload.split(".")
+            return SignedKey(key_id, int(chat_id), bot_id or None)
+        except ValueError as e:
+            raise InvalidApiKey("The API key is malformed.") from e
+
+    def revoke(self, key_id: str) -> None:
+        """Reject the key with this identifier from now on."""
+        self.revoked.add(key_id)
+
+    def load_revoked(self, key_ids: Iterable[str]) -> None:
+        """Replace the revocation list, e.g. with the one stored in the database."""
+        self.revoked = set(key_ids)
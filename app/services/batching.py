@@ -0,0 +1,133 @@
+"""
+Module: batching
+
+This module coalesces concurrent lookups by key into batched queries, in the manner
+of a DataLoader.
+
+Classes:
+    - KeyBatcher: Gathers the keys requested within a short window and resolves them
+      with one call of a bulk loader.
+
+Usage:
+    ```python
+    batcher = KeyBatcher(FormClass().get_many, window=0.002, max_batch=100)
+    subscriptions = await batcher.load(api_key)
+    ```
+
+Notes:
+    - The bulk loader is a blocking function mapping a list of distinct keys to a dict
+      of their results; it runs in a worker thread. Keys missing from the dict resolve
+      to `default`.
+    - A batch is dispatched `window` seconds after its first key arrived, or as soon
+      as `max_batch` distinct keys are waiting.
+    - Concurrent lookups of the same key share one result: a key that is waiting or
+      already being resolved is not requested again.
+    - When the loader raises, every lookup of the batch raises the same exception.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class KeyBatcher:
+    """
+    Coalesce concurrent lookups into batched calls of a bulk loader.
+
+    Args:
+        load_many (Callable[[List[Hashable]], Dict[Hashable, Any]]): Resolves a batch
+            of distinct keys.
+        window (float): Seconds the first key of a batch waits for others.
+        max_batch (int): Distinct keys resolved by one call.
+        default (Any): The result of keys missing from the loader's dict.
+
+    Methods:
+        - load(key) -> Any: The result of a key, resolved in the next batch.
+        - snapshot() -> dict: Lookup and batch counters.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[List[Hashable]], Dict[Hashable, Any]],
+        window: float = 0.002,
+        max_batch: int = 100,
+        default: Any = None,
+    ) -> None:
+        self.load_many = load_many
+        self.window = window
+        self.max_batch = max_batch
+        self.default = default
+
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+        self.lookups = 0
+        self.keys = 0
+        self.batches = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """Resolve a key together with the other keys requested meanwhile.
+
+        Args:
+            key (Hashable): The key to look up.
+
+        Returns:
+            Any: The loader's result for the key, or `default`.
+
+        Raises:
+            Exception: Whatever the loader raised for the batch.
+        """
+        self.lookups += 1
+        future = self._pending.get(key) or self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # Shielded so that a cancelled request does not fail the other waiters
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Start resolving the waiting keys as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            self._in_flight.update(batch)
+            task = asyncio.create_task(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        self.batches += 1
+        self.keys += len(batch)
+        try:
+            results = await asyncio.to_thread(self.load_many, list(batch))
+        except Exception as e:
+            results, error = {}, e
+        else:
+            error = None
+        finally:
+            for key in batch:
+                self._in_flight.pop(key, None)
+
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(key, self.default))
+
+    def snapshot(self) -> dict:
+        """Return the lookups, the distinct keys and the batches they were resolved in."""
+        return {
+            "lookups": self.lookups,
+            "keys": self.keys,
+            "batches": self.batches,
+            "pending": len(self._pending),
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,147 @@
+"""
+Module: bots
+
+This module shards outbound Telegram traffic across a pool of bot tokens.
+
+Classes:
+    - Bot: A bot token's client and delivery scheduler.
+    - BotPool: The bots of the deployment, keyed by bot id.
+    - UnknownBot: Raised for a subscription pinned to a bot which is not in the pool.
+
+Usage:
+    Every subscription records the id of the bot it subscribed through in `bot_id`,
+    since a bot can only message users who started it. Deliveries for a subscription
+    go through that bot's client and scheduler:
+
+    ```python
+    bot = pool.for_subscription(subscription)
+    await bot.scheduler.submit("normal", chat_id, bot.client.send_message, chat_id, text)
+    ```
+
+Notes:
+    - Each bot has its own HTTP connection pool and its own global and per-chat rate
+      limit buckets, because Telegram applies its limits per bot. Aggregate throughput
+      therefore grows with the number of tokens.
+    - Subscriptions without a `bot_id` use the default bot, i.e. the first token.
+    - Subscriptions pinned to a bot no longer in the pool (e.g. after its token was
+      removed) raise `UnknownBot`: no other bot can message their chat, and trying
+      would make Telegram report the chat as blocked.
+"""
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from .scheduler import DeliveryScheduler
+from .telegram import TelegramClient
+
+
+class UnknownBot(LookupError):
+    """Raised when a subscription is pinned to a bot which is not in the pool."""
+
+
+class Bot(NamedTuple):
+    """
+    A bot token's Bot API client and delivery scheduler.
+
+    Attributes:
+        client (TelegramClient): The client of the token.
+        scheduler (DeliveryScheduler): The scheduler rate limiting the token's calls.
+    """
+
+    client: TelegramClient
+    scheduler: DeliveryScheduler
+
+
+class BotPool:
+    """
+    The bots of the deployment, each with independent rate limits and HTTP pool.
+
+    Args:
+        tokens (Iterable[str]): The bot tokens; the first one is the default bot.
+        lanes (Iterable[str]): The delivery lanes, from most to least urgent.
+        rate (float): Messages per second allowed for each bot across all chats.
+        chat_rate (float): Messages per second allowed for each bot and chat.
+        workers (int): Concurrent delivery workers of each bot.
+        starvation_timeout (float): See `DeliveryScheduler`.
+
+    Methods:
+        - get(bot_id) -> Bot: A bot by id, or the default bot.
+        - for_subscription(subscription: dict) -> Bot: The bot of a subscription.
+        - stop(): Stop the delivery workers of every bot.
+        - snapshot() -> dict: Per-bot call counters and delivery lane metrics.
+    """
+
+    def __init__(
+        self,
+        tokens: Iterable[str],
+        lanes: Iterable[str],
+        rate: float,
+        chat_rate: float,
+        workers: int,
+        starvation_timeout: float,
+    ) -> None:
+        lanes = list(lanes)
+        self.bots: Dict[str, Bot] = {}
+        for token in tokens:
+            client = TelegramClient(token)
+            self.bots[client.bot_id] = Bot(
+                client,
+                DeliveryScheduler(
+                    lanes=lanes,
+                    rate=rate,
+                    chat_rate=chat_rate,
+                    workers=workers,
+                    starvation_timeout=starvation_timeout,
+                ),
+            )
+        self.default = next(iter(self.bots.values()), None)
+
+    def get(self, bot_id=None) -> Bot:
+        """Return the bot with the given id, or the default bot for None.
+
+        Args:
+            bot_id (Optional[Union[int, str]]): The numeric bot id.
+
+        Returns:
+            Bot: The bot.
+
+        Raises:
+            UnknownBot: If no bot has this id, or the pool is empty.
+        """
+        bot = self.default if bot_id is None else self.bots.get(str(bot_id))
+        if bot is None:
+            raise UnknownBot(f"Bot {bot_id} is not configured.")
+        return bot
+
+    def for_subscription(self, subscription: dict) -> Bot:
+        """Return the bot a subscription is pinned to.
+
+        Args:
+            subscription (dict): The subscription document.
+
+        Returns:
+            Bot: The bot.
+
+        Raises:
+            UnknownBot: If the subscription's bot is not in the pool.
+        """
+        return self.get(subscription.get("bot_id"))
+
+    async def stop(self) -> None:
+        """Stop the delivery workers of every bot."""
+        for bot in self.bots.values():
+            await bot.scheduler.stop()
+
+    def snapshot(self) -> dict:
+        """Return per-bot metrics.
+
+        Returns:
+            dict: For every bot id, the number of Bot API calls and failed calls and
+                the delivery lane metrics of its scheduler.
+        """
+        return {
+            bot_id: {
+                "calls": bot.client.calls,
+                "failures": bot.client.failures,
+                **bot.scheduler.snapshot(),
+            }
+            for bot_id, bot in self.bots.items()
+        }
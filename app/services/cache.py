@@ -0,0 +1,111 @@
+"""
+Module: cache
+
+This module provides a small in-process cache used by the API services.
+
+Classes:
+    - LRUCache: A size-bounded mapping which evicts the least recently used entry.
+    - TTLCache: An `LRUCache` whose entries also expire after a fixed time.
+
+Example:
+    ```python
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.get("a")  # 1
+    ```
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A size-bounded mapping which evicts the least recently used entry.
+
+    Args:
+        max_size (int): Maximum number of entries kept.
+
+    Methods:
+        - get(key, default=None) -> Any: Return an entry and mark it as recently used.
+        - set(key, value): Store an entry, evicting the oldest one when full.
+        - pop(key, default=None) -> Any: Remove an entry.
+        - keys() -> List[Hashable]: The cached keys, least recently used first.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the entry for `key`, or `default` when it is not cached."""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key`, evicting the least recently used entry if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return the entry for `key`, or `default` when it is not cached."""
+        return self._data.pop(key, default)
+
+    def keys(self) -> List[Hashable]:
+        """Return the cached keys, least recently used first."""
+        return list(self._data)
+
+
+class TTLCache(LRUCache):
+    """
+    A size-bounded mapping whose entries expire `ttl` seconds after they were set.
+
+    Args:
+        max_size (int): Maximum number of entries kept.
+        ttl (float): Seconds an entry stays valid.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        super().__init__(max_size)
+        self.ttl = ttl
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the unexpired entry for `key`, or `default`."""
+        entry = super().get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires <= time.monotonic():
+            self.pop(key)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key` for `ttl` seconds."""
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return the entry for `key`, or `default` when it is not cached."""
+        entry = super().pop(key)
+        return default if entry is None else entry[1]
+
+    def keys(self) -> List[Hashable]:
+        """Return the unexpired keys, least recently used first."""
+        now = time.monotonic()
+        return [key for key, (expires, _) in self._data.items() if expires > now]
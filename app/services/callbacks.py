@@ -0,0 +1,270 @@
+"""
+Module: callbacks
+
+This module pushes delivery outcomes to the callback URLs registered by subscribers.
+
+Classes:
+    - CallbackDispatcher: Batches outcome events per callback URL and POSTs them,
+      signed, over a pooled HTTP session.
+    - UnsafeCallbackUrl: Raised for callback URLs the API must not send requests to.
+
+Functions:
+    - sign(secret: str, timestamp: str, body: bytes) -> str: The signature of a batch.
+    - check_url(url: str): Reject URLs which are not https or resolve to internal hosts.
+
+Usage:
+    ```python
+    dispatcher = CallbackDispatcher(window=1, max_batch=100)
+    dispatcher.emit(url, secret, {"notification_id": "...", "status": "sent"})
+    ```
+
+Requests:
+    Each batch is a POST of `{"events": [...]}` with the headers
+    `X-RapidNotify-Timestamp: <unix time>` and
+    `X-RapidNotify-Signature: sha256=<hex>`, where the signature is the HMAC-SHA256 of
+    "<timestamp>." followed by the raw body, keyed with the callback secret. Receivers
+    should recompute it and reject stale timestamps.
+
+Allowed URLs:
+    Callback URLs are chosen by subscribers, so they must not make the API send
+    requests into its own network. A URL must be https, and every address its host
+    resolves to must be a public one: loopback, private, link-local (e.g. the cloud
+    metadata service at 169.254.169.254), multicast and reserved addresses are
+    rejected. URLs are checked when they are registered and again before every
+    request, as DNS records may change; redirects are not followed.
+
+Notes:
+    - Events for the same URL and secret are held for at most `window` seconds, or
+      until `max_batch` of them are pending, and then sent as one request.
+    - Timeouts, connection errors, 408, 429 and 5xx responses are retried with
+      jittered exponential backoff. Other responses are final.
+    - At most `max_pending` events are held per URL; the oldest are dropped when a
+      receiver falls that far behind.
+"""
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import socket
+import time
+from collections import deque
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .retry import RetryPolicy
+
+logger = logging.getLogger("rapidNotifyAPI.callbacks")
+
+RETRIED_STATUSES = {408, 429}
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """Return the `X-RapidNotify-Signature` value of a callback body.
+
+    Args:
+        secret (str): The callback secret.
+        timestamp (str): The `X-RapidNotify-Timestamp` value.
+        body (bytes): The raw request body.
+
+    Returns:
+        str: "sha256=" followed by the hex HMAC-SHA256 of "<timestamp>.<body>".
+    """
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256)
+    return f"sha256={digest.hexdigest()}"
+
+
+class UnsafeCallbackUrl(ValueError):
+    """Raised when a callback URL is not https or points at an internal address."""
+
+
+def check_url(url: str) -> None:
+    """Check that a callback URL is https and only resolves to public addresses.
+
+    Args:
+        url (str): The callback URL.
+
+    Raises:
+        UnsafeCallbackUrl: If the URL is not https or resolves to a loopback, private,
+            link-local, multicast or reserved address.
+        OSError: If the host cannot be resolved.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https" or not parts.hostname:
+        raise UnsafeCallbackUrl("Callback URLs must be https.")
+    addresses = socket.getaddrinfo(
+        parts.hostname, parts.port or 443, proto=socket.IPPROTO_TCP
+    )
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split("%", 1)[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise UnsafeCallbackUrl(
+                f"Callback host {parts.hostname} resolves to a non-public address."
+            )
+
+
+class CallbackDispatcher:
+    """
+    Batch delivery outcome events per callback URL and POST them asynchronously.
+
+    Args:
+        window (float): Seconds an event may wait for others to the same URL.
+        max_batch (int): Events sent in one request.
+        max_pending (int): Events held per URL before the oldest are dropped.
+        max_attempts (int): Attempts of a batch before it is given up.
+        base_delay (float): Backoff of the first retry, in seconds.
+        max_delay (float): Upper bound of the backoff, in seconds.
+        timeout (float): Timeout in seconds of each request.
+        pool_size (int): Requests sent concurrently, and pooled connections per host.
+
+    Methods:
+        - emit(url: str, secret: str, event: dict): Queue an event for a URL.
+        - stop(): Send the pending events and wait for the in-flight requests.
+        - snapshot() -> dict: Pending events and request counters.
+    """
+
+    def __init__(
+        self,
+        window: float = 1.0,
+        max_batch: int = 100,
+        max_pending: int = 10000,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        timeout: float = 10.0,
+        pool_size: int = 20,
+    ) -> None:
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.policy = RetryPolicy(max_attempts, base_delay, max_delay)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._slots = asyncio.Semaphore(pool_size)
+
+        self._pending: Dict[Tuple[str, str], deque] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._tasks = set()
+
+        self.events = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def emit(self, url: str, secret: str, event: dict) -> None:
+        """Queue an event for a callback URL; must be called from the event loop.
+
+        Args:
+            url (str): The callback URL.
+            secret (str): The secret the batch is signed with.
+            event (dict): The JSON serialisable event.
+        """
+        key = (url, secret)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = deque(maxlen=self.max_pending)
+        if len(pending) == self.max_pending:
+            self.dropped += 1
+        pending.append(event)
+        self.events += 1
+
+        if len(pending) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        """Start sending the pending events of a URL in batches of `max_batch`."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(key, None)
+        while pending:
+            batch = [
+                pending.popleft() for _ in range(min(self.max_batch, len(pending)))
+            ]
+            task = asyncio.create_task(self._deliver(*key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _post(self, url: str, secret: str, body: bytes) -> int:
+        # Checked on every request, as the host may since resolve elsewhere
+        check_url(url)
+        timestamp = str(int(time.time()))
+        response = self.session.post(
+            url,
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "X-RapidNotify-Timestamp": timestamp,
+                "X-RapidNotify-Signature": sign(secret, timestamp, body),
+            },
+            timeout=self.timeout,
+            allow_redirects=False,
+        )
+        # Reading the (small) body returns the connection to the pool
+        response.content
+        return response.status_code
+
+    async def _deliver(self, url: str, secret: str, events: list) -> bool:
+        """POST one batch, retrying transient failures with backoff."""
+        body = json.dumps({"events": events}, default=str).encode()
+        attempts = 0
+        while True:
+            attempts += 1
+            async with self._slots:
+                try:
+                    status = await asyncio.to_thread(self._post, url, secret, body)
+                    error = f"HTTP {status}"
+                except UnsafeCallbackUrl as e:
+                    error = str(e)
+                    break
+                except (requests.RequestException, OSError) as e:
+                    status, error = None, str(e)
+
+            if status is not None and status < 300:
+                self.batches += 1
+                return True
+            transient = status is None or status in RETRIED_STATUSES or status >= 500
+            if not transient or attempts >= self.policy.max_attempts:
+                break
+            await asyncio.sleep(self.policy.delay(attempts))
+
+        self.failures += 1
+        logger.error(
+            f"Gave up on {len(events)} callback events for {url} after "
+            f"{attempts} attempts: {error}"
+        )
+        return False
+
+    async def stop(self) -> None:
+        """Send every pending event and wait up to `timeout` for in-flight requests."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            _, unfinished = await asyncio.wait(list(self._tasks), timeout=self.timeout)
+            for task in unfinished:
+                task.cancel()
+        self.session.close()
+
+    def snapshot(self) -> dict:
+        """Return the pending events and the event and request counters."""
+        return {
+            "pending": sum(len(pending) for pending in self._pending.values()),
+            "in_flight": len(self._tasks),
+            "events": self.events,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
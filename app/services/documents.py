@@ -0,0 +1,122 @@
+"""
+Module: documents
+
+This module prepares notifications which are too long for a single Telegram message:
+it splits mid-sized texts into messages and renders large payloads as documents.
+
+Functions:
+    - split_text(text: str, limit: int) -> List[str]: Split a text into message-sized parts.
+    - summarize(text: str, length: int, size: int) -> str: The caption of a payload document.
+    - json_document(data) -> Tuple[Iterator[bytes], int]: Stream a payload as pretty JSON.
+    - text_document(text: str) -> Tuple[Iterator[bytes], int]: Stream a text as UTF-8.
+
+Usage:
+    ```python
+    chunks, size = json_document(payload)
+    client.send_file(chat_id, "document", "notification.json", chunks, size, caption)
+    ```
+
+Notes:
+    - `sendDocument` needs the exact size of the file up front. `json_document` runs
+      `JSONEncoder.iterencode` twice, once to count the bytes and once while the file
+      is uploaded, so the pretty-printed document is never held in memory; only
+      pieces of up to `CHUNK_SIZE` bytes are.
+    - The payload must not change between the two passes.
+"""
+import json
+from typing import Any, Iterable, Iterator, List, Tuple
+
+MESSAGE_LIMIT = 4096
+CAPTION_LIMIT = 1024
+CHUNK_SIZE = 64 * 1024
+
+
+def split_text(text: str, limit: int = MESSAGE_LIMIT) -> List[str]:
+    """Split a text into parts of at most `limit` characters, at line breaks if possible.
+
+    Args:
+        text (str): The text.
+        limit (int): The maximum length of a part.
+
+    Returns:
+        List[str]: The parts, in order; a single part if the text fits.
+    """
+    parts = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        parts.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text or not parts:
+        parts.append(text)
+    return parts
+
+
+def summarize(text: str, length: int, size: int) -> str:
+    """Return the caption of a payload document: the start of the text and its size.
+
+    Args:
+        text (str): The rendered notification.
+        length (int): Characters of the text shown.
+        size (int): The size of the document in bytes.
+
+    Returns:
+        str: The caption, within Telegram's caption limit.
+    """
+    note = f"\n\n📎 Full notification ({len(text)} characters, {size} bytes) attached."
+    length = min(length, CAPTION_LIMIT - len(note) - 1)
+    preview = text[:length].rstrip()
+    if len(text) > length:
+        preview += "…"
+    return preview + note
+
+
+def _coalesce(pieces: Iterable[bytes], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Join small pieces into chunks of about `size` bytes."""
+    buffer, buffered = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _json_pieces(data: Any) -> Iterator[bytes]:
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=str)
+    for piece in encoder.iterencode(data):
+        yield piece.encode()
+
+
+def json_document(data: Any) -> Tuple[Iterator[bytes], int]:
+    """Render a payload as a pretty-printed JSON document without materialising it.
+
+    Args:
+        data (Any): The JSON serialisable payload; other values are rendered with `str`.
+
+    Returns:
+        Tuple[Iterator[bytes], int]: The chunks of the document, and its size in bytes.
+    """
+    size = sum(len(piece) for piece in _json_pieces(data))
+    return _coalesce(_json_pieces(data)), size
+
+
+def text_document(text: str) -> Tuple[Iterator[bytes], int]:
+    """Render a text as a UTF-8 document.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        Tuple[Iterator[bytes], int]: The chunks of the document, and its size in bytes.
+    """
+    size = len(text.encode())
+
+    def chunks():
+        for start in range(0, len(text), CHUNK_SIZE):
+            yield text[start : start + CHUNK_SIZE].encode()
+
+    return chunks(), size
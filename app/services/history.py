@@ -0,0 +1,222 @@
+"""
+Module: history
+
+This module buffers the history of sent notifications for batched writes and encodes
+the cursors its pages are read with.
+
+Classes:
+    - HistoryBuffer: Holds history entries in memory until they are written in batches.
+    - InvalidCursor: Raised for a cursor which cannot be decoded.
+
+Functions:
+    - timestamp(value) -> datetime: The UTC time of a stored `sent_at` value, to the millisecond.
+    - encode_cursor(sent_at, notification_id: str) -> str: The cursor of a history entry.
+    - decode_cursor(cursor: str) -> Tuple[datetime, str]: The position a cursor points at.
+    - page_query(chat_id: int, limit: int, after) -> dict: The scan reading a page.
+
+Usage:
+    ```python
+    buffer = HistoryBuffer(max_pending=10000, batch_size=500)
+    buffer.record({"_id": notification_id, "chat_id": chat_id, "text": text, ...})
+    write(buffer.drain())
+    ```
+
+Pagination:
+    History is read newest first, ordered by (`sent_at`, `_id`). A cursor encodes the
+    position of the last entry of a page, and the next page holds the entries strictly
+    after it in that order. Unlike an offset, this is an index range scan, so reading a
+    deep page costs as much as reading the first one, and entries recorded meanwhile
+    do not shift the pages.
+
+Notes:
+    - Entries are dropped, oldest first, when `max_pending` of them wait for a write.
+    - `sent_at` is stored to the millisecond, so that it compares equal across backends
+      and survives the round trip through a cursor.
+    - Cursors are "<milliseconds>.<notification_id>", URL-safe and short enough for the
+      callback data of a Telegram button (64 bytes); clients should treat them as opaque.
+"""
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Union
+
+
+class InvalidCursor(ValueError):
+    """Raised when a history cursor cannot be decoded."""
+
+
+def timestamp(value: Union[datetime, float, None] = None) -> datetime:
+    """Return a `sent_at` value as an aware UTC datetime truncated to milliseconds.
+
+    Args:
+        value (Union[datetime, float, None]): A datetime (naive ones are UTC, as read
+            from MongoDB), Unix time (as read from SQLite) or None for now.
+
+    Returns:
+        datetime: The UTC time.
+    """
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif not isinstance(value, datetime):
+        value = datetime.fromtimestamp(value, timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def encode_cursor(sent_at: Union[datetime, float], notification_id: str) -> str:
+    """Return the opaque cursor pointing after a history entry.
+
+    Args:
+        sent_at (Union[datetime, float]): The `sent_at` value of the entry.
+        notification_id (str): The `_id` of the entry.
+
+    Returns:
+        str: The cursor.
+    """
+    millis = round(timestamp(sent_at).timestamp() * 1000)
+    return f"{millis}.{notification_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Return the (`sent_at`, `_id`) position a cursor points after.
+
+    Args:
+        cursor (str): A cursor returned by `encode_cursor`.
+
+    Returns:
+        Tuple[datetime, str]: The position.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    try:
+        millis, notification_id = cursor.split(".", 1)
+        sent_at = datetime.fromtimestamp(int(millis) / 1000, timezone.utc)
+    except (ValueError, OverflowError, OSError) as e:
+        raise InvalidCursor("Invalid history cursor.") from e
+    return timestamp(sent_at), notification_id
+
+
+def page_query(
+    chat_id: int, limit: int, after: Optional[Tuple[datetime, str]] = None
+) -> dict:
+    """Return the filter, sort and limit of a `ScanDataInput` reading a history page.
+
+    Args:
+        chat_id (int): The chat.
+        limit (int): Maximum number of entries.
+        after (Optional[Tuple[datetime, str]]): The (`sent_at`, `_id`) of the last
+            entry of the previous page, None for the first page.
+
+    Returns:
+        dict: The `data`, `sort`, `limit` and `batch_size` fields of the scan.
+    """
+    filter = {"chat_id": chat_id}
+    if after is not None:
+        sent_at, notification_id = after
+        # The bound makes the condition a range of the (chat_id, sent_at) index
+        filter["sent_at"] = {"$lte": sent_at}
+        filter["$or"] = [
+            {"sent_at": {"$lt": sent_at}},
+            {"sent_at": sent_at, "_id": {"$lt": notification_id}},
+        ]
+    return {
+        "data": filter,
+        "sort": [["sent_at", -1], ["_id", -1]],
+        "limit": limit,
+        "batch_size": limit,
+    }
+
+
+class HistoryBuffer:
+    """
+    Buffer history entries so that they are written off the request path, in batches.
+
+    Args:
+        max_pending (int): Entries held before the oldest are dropped.
+        batch_size (int): Entries written per batch; a full batch wakes the writer.
+
+    Methods:
+        - record(entry: dict): Queue an entry for writing.
+        - drain(limit: int) -> List[dict]: Take up to `limit` entries for writing.
+        - restore(entries: List[dict]): Put back entries whose write failed.
+        - wait(timeout: float): Wait until a batch is full or `timeout` elapsed.
+        - snapshot() -> dict: Pending entries and counters.
+    """
+
+    def __init__(self, max_pending: int = 10000, batch_size: int = 500) -> None:
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._pending = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._ready = asyncio.Event()
+
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, entry: dict) -> None:
+        """Queue a history entry; must be called from the event loop.
+
+        Args:
+            entry (dict): The history document.
+        """
+        with self._lock:
+            if len(self._pending) == self.max_pending:
+                self.dropped += 1
+            self._pending.append(entry)
+            self.recorded += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._ready.set()
+
+    def drain(self, limit: int = 0) -> List[dict]:
+        """Take the oldest pending entries for writing.
+
+        Args:
+            limit (int): Maximum number of entries, 0 for `batch_size`.
+
+        Returns:
+            List[dict]: The entries, oldest first.
+        """
+        with self._lock:
+            count = min(limit or self.batch_size, len(self._pending))
+            entries = [self._pending.popleft() for _ in range(count)]
+            self.written += len(entries)
+        return entries
+
+    def restore(self, entries: List[dict]) -> None:
+        """Put back entries whose write failed, ahead of the newer ones.
+
+        Args:
+            entries (List[dict]): Entries returned by `drain`.
+        """
+        with self._lock:
+            self.written -= len(entries)
+            room = self.max_pending - len(self._pending)
+            if room < len(entries):
+                self.dropped += len(entries) - room
+                entries = entries[len(entries) - room :] if room > 0 else []
+            self._pending.extendleft(reversed(entries))
+
+    async def wait(self, timeout: float) -> None:
+        """Wait until a batch is full or `timeout` seconds elapsed."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._ready.clear()
+
+    def snapshot(self) -> dict:
+        """Return the pending entries and the recorded, written and dropped counters."""
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,270 @@
+"""
+Module: logs
+
+This module provides the non-blocking, structured logging pipeline of the bot and API.
+
+Classes:
+    - JsonFormatter: Formats records as one JSON object per line.
+    - SuccessSampler: Drops a share of the successful request logs at high volume.
+    - RequestLoggingMiddleware: A pure ASGI middleware writing one log line per request.
+
+Functions:
+    - configure_logging(filename: str, ...) -> QueueListener: Route every log record
+      through a queue to rotating file and console handlers.
+    - annotate(**fields): Attach fields to the log line of the current request.
+    - stage(name: str): Time a stage of the current request.
+    - hash_api_key(api_key: str) -> str: A stable, non-reversible API key identifier.
+
+Usage:
+    ```python
+    configure_logging("rapidNotifyAPI.log", level="INFO", max_bytes=10 * 1024 * 1024)
+    app.add_middleware(RequestLoggingMiddleware, logger=logging.getLogger("rapidNotifyAPI.requests"))
+
+    with stage("lookup"):
+        response = FormClass().get(api_key)
+    ```
+
+Notes:
+    - Loggers only put records on an in-memory queue; a listener thread formats them
+      and does the file and console I/O, so the event loop never blocks on logging.
+    - Records are filtered before they are enqueued, so sampled-out success logs cost
+      a single random draw.
+"""
+import atexit
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_request_context: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "request_context", default=None
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as single-line JSON objects.
+
+    The object holds the time, level, logger name and message, the fields passed
+    through `extra` and, when present, the formatted exception.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SuccessSampler(logging.Filter):
+    """
+    Keep only a `sample_rate` share of the records whose `outcome` is "success".
+
+    Records without an outcome, or with any other outcome, are always kept.
+
+    Args:
+        sample_rate (float): Fraction of success records kept, between 0 and 1.
+    """
+
+    def __init__(self, sample_rate: float) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.sample_rate >= 1 or getattr(record, "outcome", None) != "success":
+            return True
+        return random.random() < self.sample_rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """A queue handler which keeps the `extra` fields and exception of a record apart
+    from its message, so that the listener's formatter can structure them."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(
+    filename: str,
+    level: str = "INFO",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    rotate_when: str = "",
+    success_sample_rate: float = 1.0,
+) -> logging.handlers.QueueListener:
+    """
+    Route every log record through a queue to a rotating file and the console.
+
+    Replaces the handlers of the root logger. The listener is stopped, draining the
+    queue, when the interpreter exits.
+
+    Args:
+        filename (str): The log file.
+        level (str): The minimum level logged.
+        max_bytes (int): Size at which the log file is rotated.
+        backup_count (int): Number of rotated files kept.
+        rotate_when (str): Rotate by time instead of size, e.g. "midnight" or "H";
+            see `logging.handlers.TimedRotatingFileHandler`.
+        success_sample_rate (float): Fraction of success request logs kept.
+
+    Returns:
+        logging.handlers.QueueListener: The started listener.
+    """
+    if rotate_when:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            filename, when=rotate_when, backupCount=backup_count, encoding="utf-8"
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+
+    formatter = JsonFormatter()
+    handlers = [file_handler, logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SuccessSampler(success_sample_rate))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def hash_api_key(api_key: str) -> str:
+    """Return a short SHA-256 digest identifying an API key in logs."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def annotate(**fields) -> None:
+    """Attach fields to the log line of the current request; no-op outside a request."""
+    context = _request_context.get()
+    if context is not None:
+        context.update(fields)
+
+
+@contextmanager
+def stage(name: str):
+    """Record the duration of a stage of the current request in milliseconds.
+
+    Args:
+        name (str): The stage name, e.g. "lookup" or "deliver".
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        context = _request_context.get()
+        if context is not None:
+            context["stages"][name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+class RequestLoggingMiddleware:
+    """
+    A pure ASGI middleware logging one structured line per HTTP request.
+
+    The line holds the request id (taken from `X-Request-ID` or generated, and echoed
+    in the response), method, path, status, duration, the stage timings recorded with
+    `stage` and the fields attached with `annotate`. The `outcome` is "success" below
+    status 400, "rejected" for other client errors and "error" otherwise, unless an
+    endpoint annotated a more specific one.
+
+    Args:
+        app: The wrapped ASGI application.
+        logger (logging.Logger): The logger the lines are written to.
+    """
+
+    def __init__(self, app, logger: logging.Logger) -> None:
+        self.app = app
+        self.logger = logger
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        context = {"stages": {}}
+        token = _request_context.set(context)
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _request_context.reset(token)
+            if status < 400:
+                outcome = "success"
+            elif status < 500:
+                outcome = "rejected"
+            else:
+                outcome = "error"
+            context.setdefault("outcome", outcome)
+
+            self.logger.log(
+                logging.ERROR if status >= 500 else logging.INFO,
+                "%s %s %s",
+                scope["method"],
+                scope["path"],
+                status,
+                extra={
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                    **context,
+                },
+            )
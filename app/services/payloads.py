@@ -0,0 +1,77 @@
+"""
+Module: payloads
+
+This module decodes request bodies sent as JSON or MessagePack into pydantic models.
+
+Functions:
+    - decode(model: Type[BaseModel], body: bytes, content_type: str) -> BaseModel:
+      Parse and validate a body according to its media type.
+
+Exceptions:
+    - UnsupportedMediaType: Raised for a media type which is neither JSON nor MessagePack.
+    - MalformedPayload: Raised for a MessagePack body which cannot be decoded.
+
+Usage:
+    ```python
+    form = decode(FormInput, await request.body(), request.headers.get("content-type"))
+    ```
+
+Notes:
+    - JSON bodies are parsed and validated in one pass by `model_validate_json`,
+      without building intermediate Python objects first.
+    - MessagePack bodies are unpacked by the C extension of `msgpack` and validated
+      with `model_validate`, so both encodings accept exactly the same documents.
+    - Validation errors are raised as `pydantic.ValidationError`, as by the model.
+"""
+from typing import Optional, Type, TypeVar
+
+import msgpack
+from pydantic import BaseModel
+
+JSON_TYPES = {"application/json"}
+MSGPACK_TYPES = {
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+}
+MEDIA_TYPES = sorted(JSON_TYPES | MSGPACK_TYPES)
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+class UnsupportedMediaType(ValueError):
+    """Raised when a body is neither JSON nor MessagePack."""
+
+
+class MalformedPayload(ValueError):
+    """Raised when a MessagePack body cannot be decoded."""
+
+
+def decode(model: Type[Model], body: bytes, content_type: Optional[str]) -> Model:
+    """Parse and validate a request body according to its `Content-Type`.
+
+    Args:
+        model (Type[BaseModel]): The model the body is validated with.
+        body (bytes): The raw request body.
+        content_type (Optional[str]): The `Content-Type` header; JSON when missing.
+
+    Returns:
+        BaseModel: The validated model.
+
+    Raises:
+        UnsupportedMediaType: If the media type is not supported.
+        MalformedPayload: If a MessagePack body cannot be decoded.
+        pydantic.ValidationError: If the body is invalid JSON or fails validation.
+    """
+    media_type = (content_type or "application/json").split(";")[0].strip().lower()
+    if media_type in JSON_TYPES or media_type.endswith("+json"):
+        return model.model_validate_json(body)
+    if media_type not in MSGPACK_TYPES:
+        raise UnsupportedMediaType(f"Unsupported media type: {media_type}")
+
+    try:
+        document = msgpack.unpackb(body, raw=False)
+    except (ValueError, TypeError) as e:
+        reason = str(e) or type(e).__name__
+        raise MalformedPayload(f"Invalid MessagePack body: {reason}") from e
+    return model.model_validate(document)
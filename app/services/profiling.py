@@ -0,0 +1,208 @@
+"""
+Module: profiling
+
+This module provides opt-in, per-request profiling for the ASGI application.
+
+Classes:
+    - RequestProfiler: Decides which requests are profiled and keeps their profiles.
+    - ProfilingMiddleware: A pure ASGI middleware running `cProfile` around the
+      selected requests.
+
+Selecting Requests:
+    - A request carrying `X-Profile: <token>` is profiled when `token` matches the
+      configured token.
+    - When the profiler is enabled (e.g. by an admin toggle), a random `sample_rate`
+      fraction of all requests is profiled.
+    Profiled responses carry an `X-Profile-Id` header naming the stored profile.
+
+Notes:
+    - When the profiler is disabled and no token is configured, the middleware only
+      checks two attributes before calling the application.
+    - Only one request is profiled at a time. `cProfile` hooks the event loop thread,
+      so coroutines of other requests that run meanwhile appear in the profile too.
+    - Profiles are kept in memory as marshalled `pstats` data, the format written by
+      `pstats.Stats.dump_stats`, so they can be loaded with `pstats.Stats(path)`.
+"""
+import cProfile
+import hmac
+import io
+import marshal
+import pstats
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+
+class RequestProfiler:
+    """
+    Decide which requests are profiled and keep the most recent profiles.
+
+    Args:
+        token (Optional[str]): The value of `X-Profile` that triggers profiling.
+        enabled (bool): Whether requests are sampled.
+        sample_rate (float): Fraction of requests profiled while enabled.
+        max_profiles (int): Number of profiles kept in memory.
+
+    Methods:
+        - configure(enabled: bool, sample_rate: float): Change sampling at runtime.
+        - should_profile(headers) -> bool: Whether a request is profiled.
+        - store(...): Keep a finished profile.
+        - profiles() -> list: Metadata of the stored profiles.
+        - as_pstats(profile_id: str) -> Optional[bytes]: The marshalled pstats data.
+        - as_text(profile_id: str, limit: int) -> Optional[str]: A readable summary.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        enabled: bool = False,
+        sample_rate: float = 0.0,
+        max_profiles: int = 50,
+    ) -> None:
+        self.token = token.encode() if token else None
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_profiles = max_profiles
+        self.busy = False
+        self._profiles: "OrderedDict[str, dict]" = OrderedDict()
+
+    def configure(self, enabled: bool, sample_rate: float) -> None:
+        """Turn request sampling on or off.
+
+        Args:
+            enabled (bool): Whether requests are sampled.
+            sample_rate (float): Fraction of requests profiled while enabled.
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+
+    def should_profile(self, headers) -> bool:
+        """Return whether a request with the given raw ASGI headers is profiled."""
+        if self.busy:
+            return False
+        if self.token is not None:
+            for name, value in headers:
+                if name == b"x-profile":
+                    return hmac.compare_digest(value, self.token)
+        return self.enabled and random.random() < self.sample_rate
+
+    def store(
+        self,
+        profile_id: str,
+        profile: cProfile.Profile,
+        method: str,
+        path: str,
+        took: float,
+    ) -> None:
+        """Keep a finished profile, evicting the oldest ones beyond `max_profiles`.
+
+        Args:
+            profile_id (str): The id announced in the `X-Profile-Id` header.
+            profile (cProfile.Profile): The disabled profiler.
+            method (str): The HTTP method of the request.
+            path (str): The path of the request.
+            took (float): Seconds the request took.
+        """
+        stats = pstats.Stats(profile)
+        self._profiles[profile_id] = {
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "duration_ms": round(took * 1000, 2),
+            "created": time.time(),
+            "data": marshal.dumps(stats.stats),
+        }
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def profiles(self) -> list:
+        """Return the metadata of the stored profiles, newest first."""
+        return [
+            {key: value for key, value in profile.items() if key != "data"}
+            for profile in reversed(self._profiles.values())
+        ]
+
+    def as_pstats(self, profile_id: str) -> Optional[bytes]:
+        """Return the marshalled pstats data of a profile, or None if unknown."""
+        profile = self._profiles.get(profile_id)
+        return profile["data"] if profile else None
+
+    def as_text(self, profile_id: str, limit: int = 50) -> Optional[str]:
+        """Return the top functions of a profile by cumulative time, or None if unknown.
+
+        Args:
+            profile_id (str): The profile id.
+            limit (int): Number of functions listed.
+
+        Returns:
+            Optional[str]: The `pstats` report.
+        """
+        data = self.as_pstats(profile_id)
+        if data is None:
+            return None
+
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        stats.stats = marshal.loads(data)
+        stats.get_top_level_stats()
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    A pure ASGI middleware profiling the requests selected by a `RequestProfiler`.
+
+    Args:
+        app: The wrapped ASGI application.
+        profiler (RequestProfiler): Selects the requests and stores their profiles.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler
+        if (
+            scope["type"] != "http"
+            or (not profiler.enabled and profiler.token is None)
+            or not profiler.should_profile(scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = cProfile.Profile()
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        profiler.busy = True
+        started = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            profiler.busy = False
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            profiler.busy = False
+            profiler.store(
+                profile_id,
+                profile,
+                scope["method"],
+                scope["path"],
+                time.perf_counter() - started,
+            )
@@ -0,0 +1,200 @@
+"""
+Module: quota
+
+This module provides in-memory per-API-key rate limits and daily quotas.
+
+Classes:
+    - QuotaExceeded: Raised when a key is over its rate limit or daily quota.
+    - QuotaManager: Enforces the limits on the hot path and aggregates usage counters
+      which are flushed to the database in batches.
+
+Usage:
+    1. Call `check(api_key)` before doing any work for a request.
+    2. Call `record(api_key)` once the key is known to be valid.
+    3. Periodically `drain()` the pending increments, write them with a single bulk
+       write and `reconcile()` with the totals read back from the database.
+
+Example:
+    ```python
+    quota = QuotaManager(rate_per_minute=60, daily_limit=10000)
+    try:
+        quota.check(api_key)
+    except QuotaExceeded as e:
+        ...  # reply 429 with Retry-After: e.retry_after
+    ```
+
+Notes:
+    - Nothing here touches the database; `models.usage.UsageClass` persists the counters.
+    - The totals read back after a flush include the increments of every other
+      worker, which is how workers reconcile their view of the daily usage.
+"""
+import datetime
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from .scheduler import TokenBucket
+
+
+class QuotaExceeded(Exception):
+    """
+    Raised when an API key is over its rate limit or daily quota.
+
+    Attributes:
+        retry_after (int): Seconds after which the request may be retried.
+        reason (str): A human-readable reason.
+    """
+
+    def __init__(self, retry_after: int, reason: str) -> None:
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def _today() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+
+def _seconds_until_midnight() -> int:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    midnight = (now + datetime.timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return max(1, math.ceil((midnight - now).total_seconds()))
+
+
+class QuotaManager:
+    """
+    Enforce per-key rate limits and daily quotas from in-memory counters.
+
+    Args:
+        rate_per_minute (float): Requests per minute allowed for a key; 0 disables it.
+        daily_limit (int): Requests per UTC day allowed for a key; 0 disables it.
+        max_keys (int): Number of keys whose rate limit buckets are kept in memory.
+
+    Methods:
+        - check(api_key: str): Raise `QuotaExceeded` if the key is over a limit.
+        - record(api_key: str): Count a request against the key's daily quota.
+        - drain() -> dict: Take the pending increments for writing.
+        - restore(pending: dict): Put back increments whose write failed.
+        - reconcile(day: str, totals: dict): Adopt the daily totals read from the database.
+    """
+
+    def __init__(
+        self, rate_per_minute: float, daily_limit: int, max_keys: int = 100000
+    ) -> None:
+        self.rate_per_minute = rate_per_minute
+        self.daily_limit = daily_limit
+        self.max_keys = max_keys
+
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._day = _today()
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._flushing: Dict[Tuple[str, str], int] = {}
+        self._baseline: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _roll_over(self) -> str:
+        day = _today()
+        if day != self._day:
+            self._day = day
+            self._baseline = {}
+        return day
+
+    def used_today(self, api_key: str) -> int:
+        """Return the known number of requests of a key today, across workers.
+
+        Args:
+            api_key (str): The API key.
+
+        Returns:
+            int: The reconciled total plus the increments not reconciled yet.
+        """
+        key = (self._roll_over(), api_key)
+        return (
+            self._baseline.get(api_key, 0)
+            + self._pending.get(key, 0)
+            + self._flushing.get(key, 0)
+        )
+
+    def check(self, api_key: str) -> None:
+        """Enforce the rate limit and daily quota of a key.
+
+        Takes a rate limit token when the request is admitted. Does not touch the
+        database.
+
+        Args:
+            api_key (str): The API key.
+
+        Raises:
+            QuotaExceeded: If the key is over its daily quota or rate limit.
+        """
+        if self.daily_limit and self.used_today(api_key) >= self.daily_limit:
+            raise QuotaExceeded(
+                _seconds_until_midnight(), "Daily notification quota exceeded."
+            )
+
+        if not self.rate_per_minute:
+            return
+
+        bucket = self._buckets.get(api_key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_per_minute / 60, self.rate_per_minute)
+            self._buckets[api_key] = bucket
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(api_key)
+
+        delay = bucket.delay()
+        if delay > 0:
+            raise QuotaExceeded(math.ceil(delay), "Rate limit exceeded.")
+        bucket.reserve()
+
+    def record(self, api_key: str) -> None:
+        """Count one request of a valid key against its daily quota.
+
+        Args:
+            api_key (str): The API key.
+        """
+        key = (self._roll_over(), api_key)
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+
+    def drain(self) -> Dict[Tuple[str, str], int]:
+        """Take all pending increments for writing.
+
+        Returns:
+            Dict[Tuple[str, str], int]: Increments keyed by (day, api_key).
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushing = dict(pending)
+        return pending
+
+    def restore(self, pending: Dict[Tuple[str, str], int]) -> None:
+        """Put back increments whose write failed so they are retried on the next flush.
+
+        Args:
+            pending (Dict[Tuple[str, str], int]): Increments returned by `drain`.
+        """
+        with self._lock:
+            for key, count in pending.items():
+                self._pending[key] = self._pending.get(key, 0) + count
+            self._flushing = {}
+
+    def reconcile(self, day: str, totals: Dict[str, int]) -> None:
+        """Adopt the database totals of a day, which include other workers' usage.
+
+        Totals of any other day than the current one are ignored.
+
+        Args:
+            day (str): The UTC day the totals belong to.
+            totals (Dict[str, int]): The request count per API key.
+        """
+        current = self._roll_over()
+        with self._lock:
+            if day == current:
+                self._baseline.update(totals)
+            self._flushing = {}
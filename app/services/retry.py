@@ -0,0 +1,152 @@
+"""
+Module: retry
+
+This module provides the retry policy of failed Telegram deliveries and the replay of
+dead-lettered deliveries.
+
+Classes:
+    - RetryPolicy: Decides whether a failure is retried and when.
+
+Functions:
+    - requeue_dead_letters(letters, write_retries, delete_letters, batch_size, now) -> int:
+      Move dead-lettered deliveries back to the retry queue in batches.
+
+Retry Documents:
+    A pending retry is stored as
+    {"_id": str, "bot_id": str, "chat_id": int, "text": str, "priority": str,
+     "attempts": int, "next_attempt": float, "last_error": str, "created": float,
+     "api_key": str, "notification_id": str}
+    where `next_attempt` and `created` are Unix timestamps, and `api_key` and
+    `notification_id` identify the callback told about the outcome. A message too long
+    for Telegram also has `parts`, the messages it is split into, and `part`, the index
+    of the first one not sent yet; the parts are sent in order by one retry, and the
+    outcome is reported after the last one. Dead letters are the same documents plus
+    `failed_at`.
+
+Notes:
+    - Delays use "full jitter": a uniformly random delay between 0 and the capped
+      exponential backoff, so retries of a burst of failures spread out instead of
+      hitting the Bot API again at the same time.
+    - A Telegram `retry_after` is a lower bound on the delay.
+"""
+import random
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .telegram import TelegramAPIError
+
+
+class RetryPolicy:
+    """
+    Decide whether a failed delivery is retried and how long to wait before it is.
+
+    Args:
+        max_attempts (int): Attempts, including the first one, before giving up.
+        base_delay (float): Backoff of the first retry, in seconds.
+        max_delay (float): Upper bound of the backoff, in seconds.
+
+    Methods:
+        - is_transient(error: Exception) -> bool: Whether the failure may succeed later.
+        - should_retry(error: Exception, attempts: int) -> bool: Whether to retry.
+        - delay(attempts: int, retry_after: Optional[float]) -> float: The jittered backoff.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        """Return whether a failure is a timeout, a connection error, a 429 or a 5xx.
+
+        Args:
+            error (Exception): The failure of a delivery.
+
+        Returns:
+            bool: True if the delivery may succeed when retried.
+        """
+        if not isinstance(error, TelegramAPIError):
+            return False
+        status = error.status_code
+        return status is None or status == 429 or status >= 500
+
+    def should_retry(self, error: Exception, attempts: int) -> bool:
+        """Return whether a delivery which failed `attempts` times is retried.
+
+        Args:
+            error (Exception): The last failure.
+            attempts (int): Attempts made so far.
+
+        Returns:
+            bool: True if the failure is transient and attempts are left.
+        """
+        return self.is_transient(error) and attempts < self.max_attempts
+
+    def delay(self, attempts: int, retry_after: Optional[float] = None) -> float:
+        """Return the seconds to wait before the next attempt.
+
+        Args:
+            attempts (int): Attempts made so far.
+            retry_after (Optional[float]): The wait requested by Telegram, if any.
+
+        Returns:
+            float: The delay.
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return max(random.uniform(0, backoff), retry_after or 0)
+
+
+def requeue_dead_letters(
+    letters: Iterable[Dict],
+    write_retries: Callable[[List[Dict]], None],
+    delete_letters: Callable[[List[Dict]], None],
+    batch_size: int,
+    now: float,
+) -> int:
+    """
+    Move dead-lettered deliveries back to the retry queue, due immediately.
+
+    Each batch is first upserted into the retry queue by `_id` and only then removed
+    from the dead letters, so an interrupted replay can simply be run again.
+
+    Args:
+        letters (Iterable[Dict]): The dead-lettered retry documents.
+        write_retries (Callable): Applies bulk write operations to the retry queue.
+        delete_letters (Callable): Applies bulk write operations to the dead letters.
+        batch_size (int): Documents per bulk write.
+        now (float): The Unix time the deliveries become due.
+
+    Returns:
+        int: The number of deliveries requeued.
+    """
+    count = 0
+    batch = []
+
+    def flush():
+        write_retries(
+            [
+                {
+                    "filter": {"_id": letter["_id"]},
+                    "replacement": {
+                        **{k: v for k, v in letter.items() if k != "failed_at"},
+                        "attempts": 0,
+                        "next_attempt": now,
+                    },
+                    "upsert": True,
+                }
+                for letter in batch
+            ]
+        )
+        delete_letters([{"delete": {"_id": letter["_id"]}} for letter in batch])
+
+    for letter in letters:
+        batch.append(letter)
+        if len(batch) >= batch_size:
+            flush()
+            count += len(batch)
+            batch = []
+
+    if batch:
+        flush()
+        count += len(batch)
+    return count
@@ -0,0 +1,343 @@
+"""
+Module: scheduler
+
+This module provides a rate-limited, priority-aware delivery scheduler for outbound
+Telegram traffic.
+
+Classes:
+    - TokenBucket: A reservation based token bucket rate limiter.
+    - DeliveryScheduler: Dispatches queued deliveries from priority lanes while
+      respecting a global and a per-chat rate limit.
+
+Usage:
+    1. Create a `DeliveryScheduler` with the lanes ordered from most to least urgent.
+    2. `await scheduler.submit(lane, chat_id, func, *args)` from a coroutine; `func` is
+       a blocking callable which is executed in a worker thread once the scheduler
+       picks the job and the rate limiters allow it.
+
+Example:
+    ```python
+    scheduler = DeliveryScheduler(lanes=["high", "normal", "low"], rate=30)
+    await scheduler.submit("high", chat_id, client.send_message, chat_id, "Disk full")
+    ```
+
+Notes:
+    - Lanes are served with strict priority. A lane whose oldest job has waited longer
+      than `starvation_timeout` seconds is served first so bulk traffic still drains
+      while a high-priority lane is busy.
+    - A job whose chat is over its rate limit is parked with the rest of that chat's
+      traffic instead of occupying a worker, so one busy chat cannot stall others.
+    - Errors carrying a `retry_after` attribute (e.g. a Telegram 429) pause the global
+      bucket for that long.
+"""
+import asyncio
+import functools
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class TokenBucket:
+    """
+    A token bucket which hands out reservations instead of rejecting callers.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens the bucket can hold.
+
+    Methods:
+        - reserve() -> float: Take a token and return how long to wait before using it.
+        - delay() -> float: Seconds until a token is available, without taking it.
+        - pause(seconds: float): Withhold tokens for the given number of seconds.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token, going into debt if none is available.
+
+        Returns:
+            float: Seconds the caller must wait before the token becomes valid.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def delay(self) -> float:
+        """Return how long until a token is available, without taking it.
+
+        Returns:
+            float: Seconds until the next reservation would be free of debt.
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Withhold tokens so that the next reservation waits at least `seconds`.
+
+        Args:
+            seconds (float): The pause duration.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class _Job:
+    __slots__ = ("chat_id", "func", "future", "enqueued_at")
+
+    def __init__(self, chat_id, func, future, enqueued_at):
+        self.chat_id = chat_id
+        self.func = func
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class _LaneStats:
+    __slots__ = ("enqueued", "dispatched", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.enqueued = 0
+        self.dispatched = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class DeliveryScheduler:
+    """
+    Dispatch blocking delivery calls from priority lanes under rate limits.
+
+    Args:
+        lanes (Iterable[str]): Lane names ordered from most to least urgent.
+        rate (float): Global deliveries per second.
+        chat_rate (float): Deliveries per second for a single chat.
+        workers (int): Number of deliveries executed concurrently.
+        starvation_timeout (float): Seconds after which a waiting job is served
+            regardless of its lane.
+        max_chats (int): Number of per-chat buckets kept in memory.
+
+    Methods:
+        - submit(lane: str, chat_id: int, func: Callable, *args) -> Any: Queue a
+          delivery and wait for its result.
+        - snapshot() -> dict: Per-lane queue depth and wait time metrics.
+    """
+
+    def __init__(
+        self,
+        lanes: Iterable[str],
+        rate: float = 30.0,
+        chat_rate: float = 1.0,
+        workers: int = 8,
+        starvation_timeout: float = 5.0,
+        max_chats: int = 10000,
+    ) -> None:
+        self.lanes = list(lanes)
+        self.workers = workers
+        self.starvation_timeout = starvation_timeout
+        self.max_chats = max_chats
+
+        self._queues: Dict[str, deque] = {lane: deque() for lane in self.lanes}
+        self._stats: Dict[str, _LaneStats] = {lane: _LaneStats() for lane in self.lanes}
+        self._bucket = TokenBucket(rate, max(rate, 1.0))
+        self._chat_rate = chat_rate
+        self._chat_buckets: "OrderedDict[Any, TokenBucket]" = OrderedDict()
+        self._deferred: Dict[Any, deque] = {}
+        self._ready: deque = deque()
+        self._pending: Optional[asyncio.Semaphore] = None
+        self._tasks = []
+        self._loop = None
+        self._in_flight = 0
+
+    async def submit(self, lane: str, chat_id: Any, func: Callable, *args) -> Any:
+        """Queue a delivery on a lane and wait until it has been executed.
+
+        Args:
+            lane (str): The lane to queue the delivery on.
+            chat_id (Any): The target chat, used for per-chat rate limiting.
+            func (Callable): The blocking callable performing the delivery.
+            *args: Positional arguments passed to `func`.
+
+        Returns:
+            Any: The return value of `func`.
+
+        Raises:
+            ValueError: If `lane` is unknown.
+            Exception: Whatever `func` raised.
+        """
+        if lane not in self._queues:
+            raise ValueError(f"Unknown delivery lane: {lane}")
+
+        self._start()
+        loop = asyncio.get_running_loop()
+        job = _Job(
+            chat_id,
+            functools.partial(func, *args),
+            loop.create_future(),
+            time.monotonic(),
+        )
+        self._queues[lane].append(job)
+        self._stats[lane].enqueued += 1
+        self._pending.release()
+        return await job.future
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._loop is loop:
+            return
+        # (Re)start the workers on the running loop, e.g. after a test client
+        # replaced the loop the previous workers were bound to. Jobs queued on a
+        # previous loop can no longer be resolved and are dropped.
+        self._loop = loop
+        for queue in self._queues.values():
+            queue.clear()
+        self._deferred.clear()
+        self._ready.clear()
+        self._pending = asyncio.Semaphore(0)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks. Queued jobs are left untouched."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _next_job(self):
+        """Pick the next job: released jobs, starved lanes, then strict priority."""
+        if self._ready:
+            return self._ready.popleft()
+
+        now = time.monotonic()
+        starved = None
+        for lane in self.lanes:
+            queue = self._queues[lane]
+            if queue and now - queue[0].enqueued_at >= self.starvation_timeout:
+                if starved is None or queue[0].enqueued_at < starved[1].enqueued_at:
+                    starved = (lane, queue[0])
+        if starved is not None:
+            lane = starved[0]
+            return lane, self._queues[lane].popleft()
+
+        for lane in self.lanes:
+            if self._queues[lane]:
+                return lane, self._queues[lane].popleft()
+        return None, None
+
+    def _defer(self, lane: str, job: _Job) -> bool:
+        """Park the job if its chat is rate limited or already has parked jobs."""
+        pending = self._deferred.get(job.chat_id)
+        if pending is not None:
+            pending.append((lane, job))
+            return True
+
+        delay = self._chat_bucket(job.chat_id).delay()
+        if delay <= 0:
+            return False
+
+        self._deferred[job.chat_id] = deque([(lane, job)])
+        asyncio.get_running_loop().call_later(delay, self._release, job.chat_id)
+        return True
+
+    def _release(self, chat_id: Any) -> None:
+        """Hand the oldest parked job of a chat back to the workers."""
+        pending = self._deferred[chat_id]
+        self._ready.append(pending.popleft())
+        self._pending.release()
+        if pending:
+            asyncio.get_running_loop().call_later(
+                1 / self._chat_rate, self._release, chat_id
+            )
+        else:
+            del self._deferred[chat_id]
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self._chat_rate, 1.0)
+            self._chat_buckets[chat_id] = bucket
+            while len(self._chat_buckets) > self.max_chats:
+                self._chat_buckets.popitem(last=False)
+        else:
+            self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._pending.acquire()
+            released = bool(self._ready)
+            lane, job = self._next_job()
+            if job is None or job.future.done():
+                continue
+            if not released and self._defer(lane, job):
+                continue
+
+            await asyncio.sleep(self._chat_bucket(job.chat_id).reserve())
+            await asyncio.sleep(self._bucket.reserve())
+
+            stats = self._stats[lane]
+            waited = time.monotonic() - job.enqueued_at
+            stats.dispatched += 1
+            stats.wait_total += waited
+            stats.wait_max = max(stats.wait_max, waited)
+
+            self._in_flight += 1
+            try:
+                result = await loop.run_in_executor(None, job.func)
+            except Exception as e:
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after:
+                    self._bucket.pause(float(retry_after))
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._in_flight -= 1
+
+    def snapshot(self) -> dict:
+        """Return per-lane queue depth and wait time metrics.
+
+        Returns:
+            dict: Metrics keyed by lane, plus the number of in-flight deliveries and
+                of jobs parked behind a per-chat rate limit.
+        """
+        now = time.monotonic()
+        lanes = {}
+        for lane in self.lanes:
+            queue = self._queues[lane]
+            stats = self._stats[lane]
+            lanes[lane] = {
+                "depth": len(queue),
+                "enqueued": stats.enqueued,
+                "dispatched": stats.dispatched,
+                "oldest_wait_ms": round((now - queue[0].enqueued_at) * 1000, 2)
+                if queue
+                else 0.0,
+                "avg_wait_ms": round(stats.wait_total / stats.dispatched * 1000, 2)
+                if stats.dispatched
+                else 0.0,
+                "max_wait_ms": round(stats.wait_max * 1000, 2),
+            }
+        return {
+            "in_flight": self._in_flight,
+            "deferred": sum(len(pending) for pending in self._deferred.values())
+            + len(self._ready),
+            "lanes": lanes,
+        }
@@ -0,0 +1,68 @@
+"""
+Module: streaming
+
+This module provides helpers for consuming streamed data with bounded memory.
+
+Functions:
+    - iterate_threadsafe(stream, loop) -> Iterator: Consume an async iterator from a
+      worker thread, one item at a time.
+    - iter_lines(chunks) -> Iterator[bytes]: Split a stream of byte chunks into lines.
+
+Example:
+    ```python
+    loop = asyncio.get_running_loop()
+    lines = iter_lines(iterate_threadsafe(request.stream(), loop))
+    await asyncio.to_thread(consume, lines)
+    ```
+"""
+import asyncio
+from typing import AsyncIterator, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def iterate_threadsafe(
+    stream: AsyncIterator[T], loop: asyncio.AbstractEventLoop
+) -> Iterator[T]:
+    """
+    Expose an async iterator running on `loop` as a blocking iterator for a worker thread.
+
+    Each item is only requested from the event loop when the consumer asks for it, so
+    nothing is read ahead.
+
+    Args:
+        stream (AsyncIterator[T]): The async iterator, e.g. `request.stream()`.
+        loop (asyncio.AbstractEventLoop): The event loop the iterator belongs to.
+
+    Yields:
+        T: The next item of the stream.
+    """
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(stream.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Split a stream of byte chunks into lines, without the line terminators.
+
+    Only the incomplete last line of a chunk is carried over to the next one.
+
+    Args:
+        chunks (Iterable[bytes]): The byte chunks.
+
+    Yields:
+        bytes: The next line.
+    """
+    rest = b""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if rest:
+        yield rest.rstrip(b"\r")
@@ -0,0 +1,125 @@
+"""
+Module: streams
+
+This module turns a series of notifications sharing a stream id into one Telegram
+message which is edited in place.
+
+Classes:
+    - StreamRegistry: Tracks the message of every stream and debounces its edits.
+
+Usage:
+    ```python
+    registry = StreamRegistry(max_size=10000, ttl=3600, debounce=1)
+    message = await registry.push((api_key, stream_id), text, send, edit)
+    ```
+
+    `send(text)` delivers the first update of a stream and returns the sent message,
+    and `edit(message_id, text)` replaces its text; both are coroutine functions.
+
+Notes:
+    - Updates of a stream are pushed one at a time. While an edit waits for the
+      debounce interval, newer updates only replace the pending text, so a burst of
+      updates results in a single edit carrying the latest one. The requests of the
+      superseded updates complete with that edit.
+    - If the first message could not be sent, the next update sends a new one.
+    - Streams live in a `TTLCache`: a stream unused for `ttl` seconds, or evicted
+      because the store is full, starts over with a new message.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .cache import TTLCache
+
+
+class _Stream:
+    """The message of a stream and the latest text pushed to it."""
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.message_id: Optional[int] = None
+        self.text: Optional[str] = None
+        self.version = 0
+        self.pushed_version = 0
+        self.pushed_at = 0.0
+        self.result: Any = None
+
+
+class StreamRegistry:
+    """
+    Map stream ids to the message they edit, debouncing the edits of every stream.
+
+    Args:
+        max_size (int): Maximum number of streams tracked.
+        ttl (float): Seconds a stream is tracked after its last update.
+        debounce (float): Minimum seconds between two pushes of the same stream.
+
+    Methods:
+        - push(key, text, send, edit) -> Any: Send or edit the message of a stream.
+        - forget(key): Stop tracking a stream.
+    """
+
+    def __init__(self, max_size: int, ttl: float, debounce: float) -> None:
+        self.debounce = debounce
+        self._streams = TTLCache(max_size=max_size, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def forget(self, key: Hashable) -> None:
+        """Stop tracking a stream, so that its next update sends a new message."""
+        self._streams.pop(key)
+
+    async def push(
+        self,
+        key: Hashable,
+        text: str,
+        send: Callable[[str], Awaitable[Any]],
+        edit: Callable[[int, str], Awaitable[Any]],
+    ) -> Any:
+        """
+        Deliver the latest text of a stream.
+
+        Args:
+            key (Hashable): The stream, e.g. (api_key, stream_id).
+            text (str): The new text.
+            send (Callable): Sends the first message of the stream.
+            edit (Callable): Edits the message of the stream.
+
+        Returns:
+            Any: The result of the `send` or `edit` call which delivered this text or
+                a newer one, None if `send` returned None.
+
+        Raises:
+            Exception: Whatever `send` or `edit` raised while pushing this update.
+        """
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = _Stream()
+        # Every update extends the lifetime of the stream
+        self._streams.set(key, stream)
+
+        stream.version += 1
+        version = stream.version
+        stream.text = text
+
+        async with stream.lock:
+            if stream.pushed_version >= version:
+                return stream.result
+
+            if stream.message_id is None:
+                pushed_version = stream.version
+                result = await send(stream.text)
+            else:
+                wait = stream.pushed_at + self.debounce - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                pushed_version = stream.version
+                result = await edit(stream.message_id, stream.text)
+
+            stream.pushed_version = pushed_version
+            stream.pushed_at = time.monotonic()
+            stream.result = result
+            if isinstance(result, dict) and "message_id" in result:
+                stream.message_id = result["message_id"]
+            return result
@@ -0,0 +1,307 @@
+"""
+Module: telegram
+
+This module provides a thin, blocking client for the Telegram Bot API.
+
+Classes:
+    - TelegramAPIError: Raised when a Bot API call fails.
+    - MultipartStream: A file-like multipart/form-data body built on the fly.
+    - TelegramClient: Issues Bot API calls over a pooled HTTP session.
+
+Usage:
+    1. Create one `TelegramClient` per bot token and reuse it for every call.
+    2. Run its methods in a worker thread when calling from asyncio code.
+
+Example:
+    ```python
+    from services.telegram import TelegramClient
+
+    client = TelegramClient(token="123456:ABC")
+    client.send_message(chat_id=42, text="Hello")
+    ```
+
+Note:
+    The module deliberately has no imports from the rest of the application so it
+    can be shared by the API and the bot process.
+"""
+import uuid
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class TelegramAPIError(Exception):
+    """
+    Raised when a Telegram Bot API call fails.
+
+    Attributes:
+        status_code (Optional[int]): The HTTP / Bot API error code, or None when the
+            request never got a response (timeouts, connection errors).
+        description (str): A human-readable description of the failure.
+        retry_after (Optional[float]): Seconds Telegram asked us to wait before the
+            next call (only set for 429 responses).
+    """
+
+    def __init__(
+        self,
+        status_code: Optional[int],
+        description: str,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(f"{status_code}: {description}")
+        self.status_code = status_code
+        self.description = description
+        self.retry_after = retry_after
+
+    @property
+    def chat_unreachable(self) -> bool:
+        """Whether the chat can no longer be messaged by the bot.
+
+        True when the user blocked the bot, the chat does not exist or the user's
+        account was deactivated. Such failures persist until the user starts the bot
+        again.
+        """
+        if self.status_code == 403:
+            return True
+        description = (self.description or "").lower()
+        return self.status_code == 400 and (
+            "chat not found" in description or "user is deactivated" in description
+        )
+
+    @property
+    def message_not_modified(self) -> bool:
+        """Whether an edit failed only because the message already has that content."""
+        description = (self.description or "").lower()
+        return self.status_code == 400 and "message is not modified" in description
+
+    @property
+    def message_uneditable(self) -> bool:
+        """Whether the message to edit was deleted or is too old to be edited."""
+        description = (self.description or "").lower()
+        return self.status_code == 400 and (
+            "message to edit not found" in description
+            or "message can't be edited" in description
+        )
+
+
+class MultipartStream:
+    """
+    A read-only, file-like multipart/form-data body whose file part is streamed.
+
+    The body is produced piece by piece from the form fields, the file chunks and the
+    closing boundary, so only the chunk currently being sent is held in memory. The
+    total length is known upfront, which lets `requests` send a `Content-Length`
+    header instead of falling back to chunked transfer encoding.
+
+    Args:
+        fields (dict): Plain form fields sent before the file part.
+        file_field (str): The name of the file field, e.g. "document".
+        filename (str): The file name reported to Telegram.
+        chunks (Iterator[bytes]): The file content.
+        size (int): The exact number of bytes `chunks` yields.
+        content_type (str): The MIME type of the file part.
+
+    Attributes:
+        content_type (str): The `Content-Type` header value of the whole body.
+    """
+
+    def __init__(
+        self,
+        fields: dict,
+        file_field: str,
+        filename: str,
+        chunks: Iterator[bytes],
+        size: int,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        head = b"".join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode()
+            for name, value in fields.items()
+            if value is not None
+        )
+        filename = filename.replace('"', "").replace("\r", "").replace("\n", "")
+        head += (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+
+        self._length = len(head) + size + len(tail)
+        self._pieces = self._iter_pieces(head, chunks, tail)
+        self._view = memoryview(b"")
+
+    @staticmethod
+    def _iter_pieces(head, chunks, tail):
+        yield head
+        yield from chunks
+        yield tail
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to `size` bytes of the body, or b"" once it is exhausted."""
+        while not self._view:
+            piece = next(self._pieces, None)
+            if piece is None:
+                return b""
+            self._view = memoryview(piece)
+
+        if size is None or size < 0:
+            size = len(self._view)
+        data = bytes(self._view[:size])
+        self._view = self._view[size:]
+        return data
+
+
+class TelegramClient:
+    """
+    A blocking Telegram Bot API client bound to a single bot token.
+
+    Args:
+        token (str): The bot token.
+        timeout (float): Timeout in seconds for each HTTP request.
+        pool_size (int): Maximum number of pooled connections to the Bot API.
+
+    Attributes:
+        token (str): The bot token.
+        bot_id (str): The numeric bot id, i.e. the part of the token before the colon.
+        session (requests.Session): The pooled HTTP session used for every call.
+        calls (int): Number of Bot API calls issued.
+        failures (int): Number of Bot API calls which failed.
+
+    Methods:
+        - call(method: str, data: dict) -> dict: Issue an arbitrary Bot API call.
+        - send_message(chat_id: int, text: str) -> dict: Send a text message.
+        - edit_message_text(chat_id: int, message_id: int, text: str) -> dict: Edit a sent message.
+        - send_file(chat_id: int, kind: str, ...) -> dict: Stream a document or photo.
+    """
+
+    API_URL = "https://api.telegram.org/bot{}/{}"
+
+    def __init__(self, token: str, timeout: float = 60, pool_size: int = 10) -> None:
+        self.token = token
+        self.bot_id = token.split(":", 1)[0] if token else None
+        self.timeout = timeout
+        self.calls = 0
+        self.failures = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+    def call(self, method: str, data: Optional[dict] = None, **kwargs) -> dict:
+        """Issue a Bot API call and return its `result` field.
+
+        Args:
+            method (str): The Bot API method name, e.g. "sendMessage".
+            data (Optional[dict]): Form fields sent with the request.
+            **kwargs: Extra keyword arguments passed to `requests.Session.post`.
+
+        Returns:
+            dict: The `result` object of the Bot API response.
+
+        Raises:
+            TelegramAPIError: If the request fails or Telegram reports an error.
+        """
+        url = self.API_URL.format(self.token, method)
+        self.calls += 1
+        try:
+            response = self.session.post(url, data=data, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.failures += 1
+            raise TelegramAPIError(None, str(e)) from e
+
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {}
+
+        if response.ok and payload.get("ok", False):
+            return payload.get("result")
+
+        self.failures += 1
+        parameters = payload.get("parameters") or {}
+        raise TelegramAPIError(
+            payload.get("error_code", response.status_code),
+            payload.get("description", response.reason),
+            retry_after=parameters.get("retry_after"),
+        )
+
+    def send_message(self, chat_id: int, text: str) -> dict:
+        """Send a text message to a chat.
+
+        Args:
+            chat_id (int): The target chat id.
+            text (str): The message text.
+
+        Returns:
+            dict: The sent Telegram message.
+
+        Raises:
+            TelegramAPIError: If the message could not be sent.
+        """
+        return self.call("sendMessage", {"chat_id": chat_id, "text": text})
+
+    def edit_message_text(self, chat_id: int, message_id: int, text: str) -> dict:
+        """Replace the text of a message the bot sent.
+
+        Args:
+            chat_id (int): The chat of the message.
+            message_id (int): The id of the message.
+            text (str): The new text.
+
+        Returns:
+            dict: The edited Telegram message.
+
+        Raises:
+            TelegramAPIError: If the message could not be edited.
+        """
+        return self.call(
+            "editMessageText",
+            {"chat_id": chat_id, "message_id": message_id, "text": text},
+        )
+
+    def send_file(
+        self,
+        chat_id: int,
+        kind: str,
+        filename: str,
+        chunks: Iterator[bytes],
+        size: int,
+        caption: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+    ) -> dict:
+        """Stream a file to a chat with `sendDocument` or `sendPhoto`.
+
+        Args:
+            chat_id (int): The target chat id.
+            kind (str): Either "document" or "photo".
+            filename (str): The file name shown in Telegram.
+            chunks (Iterator[bytes]): The file content, consumed lazily.
+            size (int): The exact number of bytes `chunks` yields.
+            caption (Optional[str]): An optional caption.
+            content_type (str): The MIME type of the file.
+
+        Returns:
+            dict: The sent Telegram message.
+
+        Raises:
+            TelegramAPIError: If the file could not be sent.
+        """
+        method = {"document": "sendDocument", "photo": "sendPhoto"}[kind]
+        body = MultipartStream(
+            {"chat_id": chat_id, "caption": caption},
+            kind,
+            filename,
+            chunks,
+            size,
+            content_type,
+        )
+        return self.call(method, data=body, headers={"Content-Type": body.content_type})
@@ -0,0 +1,192 @@
+"""
+Module: templates
+
+This module compiles and renders the message templates subscribers store with their
+subscription.
+
+Classes:
+    - TemplateError: Raised for invalid templates or missing variables.
+    - CompiledTemplate: A template parsed once into literal text and fields.
+    - TemplateCache: An LRU cache of compiled templates.
+
+Template Syntax:
+    Templates use `str.format` fields restricted to plain names, e.g.
+    "Build {build} finished with status {status}". Format specs and conversions are
+    allowed ("{duration:.1f}", "{payload!r}"); attribute and index lookups are not.
+    Literal braces are written as "{{" and "}}".
+
+Limits:
+    The width and precision of a format spec are at most `MAX_FORMAT_WIDTH`, and a
+    rendered template at most `MAX_RENDERED_LENGTH` characters, so that a short
+    template cannot produce a huge message ("{x:>200000000}").
+
+Example:
+    ```python
+    template = compile_template("Disk {disk} is {usage}% full")
+    template.render({"disk": "/var", "usage": 93})
+    ```
+"""
+import re
+import string
+from typing import Hashable, Optional
+
+from .cache import LRUCache
+
+# Template names are used as keys of the subscription's `templates` sub-document
+NAME_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+MAX_TEMPLATE_LENGTH = 4096
+MAX_FORMAT_WIDTH = 4096
+MAX_RENDERED_LENGTH = 256 * 1024
+
+_formatter = string.Formatter()
+
+
+class TemplateError(ValueError):
+    """Raised when a template cannot be compiled or rendered."""
+
+
+class CompiledTemplate:
+    """
+    A template parsed once into literal text and fields.
+
+    Args:
+        source (str): The template source.
+
+    Attributes:
+        source (str): The template source.
+        fields (frozenset): The names of the variables the template uses.
+
+    Raises:
+        TemplateError: If the template is malformed or uses unsupported fields.
+    """
+
+    __slots__ = ("source", "fields", "_parts")
+
+    def __init__(self, source: str) -> None:
+        try:
+            parsed = list(_formatter.parse(source))
+        except ValueError as e:
+            raise TemplateError(f"Invalid template: {e}") from e
+
+        parts = []
+        for literal, field, spec, conversion in parsed:
+            if field is not None:
+                if not field.isidentifier():
+                    raise TemplateError(
+                        f"Invalid template field '{{{field}}}': use plain names only."
+                    )
+                if spec and "{" in spec:
+                    raise TemplateError("Nested fields are not supported.")
+                # Fill characters are single digits at most, so any larger number
+                # in the spec is its width or precision
+                if spec and any(
+                    int(number) > MAX_FORMAT_WIDTH
+                    for number in re.findall(r"\d+", spec)
+                ):
+                    raise TemplateError(
+                        f"Invalid format spec '{spec}': widths and precisions are "
+                        f"limited to {MAX_FORMAT_WIDTH}."
+                    )
+            parts.append((literal, field, spec, conversion))
+
+        self.source = source
+        self.fields = frozenset(part[1] for part in parts if part[1] is not None)
+        self._parts = tuple(parts)
+
+    def render(self, variables: dict) -> str:
+        """Render the template with the given variables.
+
+        Args:
+            variables (dict): The values of the template fields.
+
+        Returns:
+            str: The rendered text.
+
+        Raises:
+            TemplateError: If a variable is missing or cannot be formatted, or the
+                text is longer than `MAX_RENDERED_LENGTH`.
+        """
+        missing = self.fields.difference(variables)
+        if missing:
+            raise TemplateError(
+                f"Missing template variables: {', '.join(sorted(missing))}"
+            )
+
+        pieces = []
+        length = 0
+        for literal, field, spec, conversion in self._parts:
+            pieces.append(literal)
+            length += len(literal)
+            if field is not None:
+                value = variables[field]
+                try:
+                    if conversion:
+                        value = _formatter.convert_field(value, conversion)
+                    pieces.append(format(value, spec or ""))
+                except (TypeError, ValueError) as e:
+                    raise TemplateError(f"Cannot format '{field}': {e}") from e
+                length += len(pieces[-1])
+            if length > MAX_RENDERED_LENGTH:
+                raise TemplateError(
+                    f"Rendered template is longer than {MAX_RENDERED_LENGTH} characters."
+                )
+        return "".join(pieces)
+
+
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a template source.
+
+    Args:
+        source (str): The template source.
+
+    Returns:
+        CompiledTemplate: The compiled template.
+
+    Raises:
+        TemplateError: If the template is malformed.
+    """
+    return CompiledTemplate(source)
+
+
+class TemplateCache:
+    """
+    An LRU cache of compiled templates keyed by owner and template name.
+
+    A cached entry is only reused while its source is unchanged, so templates updated
+    by another process (e.g. through the bot) are recompiled on first use.
+
+    Args:
+        max_size (int): Maximum number of compiled templates kept.
+
+    Methods:
+        - get(owner, name: str, source: str) -> CompiledTemplate: Return the compiled template.
+        - invalidate(owner, name: str): Drop a template after it was updated or deleted.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self._cache = LRUCache(max_size)
+
+    def get(self, owner: Hashable, name: str, source: str) -> CompiledTemplate:
+        """Return the compiled form of `source`, compiling it on a miss.
+
+        Args:
+            owner (Hashable): The owner of the template, e.g. the API key.
+            name (str): The template name.
+            source (str): The current template source.
+
+        Returns:
+            CompiledTemplate: The compiled template.
+
+        Raises:
+            TemplateError: If the template is malformed.
+        """
+        key = (owner, name)
+        compiled: Optional[CompiledTemplate] = self._cache.get(key)
+        if compiled is None or compiled.source != source:
+            compiled = compile_template(source)
+            self._cache.set(key, compiled)
+        return compiled
+
+    def invalidate(self, owner: Hashable, name: str) -> None:
+        """Drop the compiled template of `owner` called `name`."""
+        self._cache.pop((owner, name))
@@ -0,0 +1,151 @@
+"""
+Module: transfer
+
+This module implements the streaming export and import of collections as
+newline-delimited JSON (NDJSON), one document per line.
+
+Functions:
+    - export_lines(documents: Iterable[dict]) -> Iterator[bytes]: Serialize documents.
+    - import_documents(lines, write_batch, ...) -> ImportStats: Upsert documents in batches.
+
+Classes:
+    - ImportStats: Counters of an import run.
+    - ImportFailed: Raised when a batch fails, carrying the offset to resume from.
+
+Notes:
+    - Documents are serialized with MongoDB Extended JSON (`bson.json_util`) so types
+      such as ObjectId and datetime survive the round trip.
+    - Imports upsert by `_id`, so replaying a partially imported file is safe. The
+      `offset` of a run is the number of lines already processed; pass it back to
+      resume after a failure.
+"""
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from bson import json_util
+
+
+class ImportStats:
+    """
+    Counters of an import run.
+
+    Attributes:
+        offset (int): Lines processed so far, including the skipped `start` lines.
+        written (int): Documents written.
+        invalid (int): Lines that could not be parsed as a JSON object.
+    """
+
+    __slots__ = ("offset", "written", "invalid")
+
+    def __init__(self, offset: int = 0) -> None:
+        self.offset = offset
+        self.written = 0
+        self.invalid = 0
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        return {"offset": self.offset, "written": self.written, "invalid": self.invalid}
+
+
+class ImportFailed(Exception):
+    """
+    Raised when a batch of an import fails.
+
+    Attributes:
+        stats (ImportStats): The counters up to the last successful batch; its
+            `offset` is where the import can be resumed.
+    """
+
+    def __init__(self, stats: ImportStats, cause: Exception) -> None:
+        super().__init__(f"Import failed at line {stats.offset}: {cause}")
+        self.stats = stats
+
+
+def export_lines(documents: Iterable[dict]) -> Iterator[bytes]:
+    """
+    Serialize documents to NDJSON lines.
+
+    Args:
+        documents (Iterable[dict]): The documents, typically a streaming cursor.
+
+    Yields:
+        bytes: One UTF-8 encoded JSON document followed by a newline.
+    """
+    for document in documents:
+        yield json_util.dumps(document).encode() + b"\n"
+
+
+def _operation(document: dict) -> dict:
+    if "_id" in document:
+        return {
+            "filter": {"_id": document["_id"]},
+            "replacement": document,
+            "upsert": True,
+        }
+    return {"insert": document}
+
+
+def import_documents(
+    lines: Iterable[bytes],
+    write_batch: Callable[[List[dict], bool], None],
+    batch_size: int = 1000,
+    offset: int = 0,
+    ordered: bool = True,
+    on_progress: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """
+    Import NDJSON documents as batched upserts.
+
+    Args:
+        lines (Iterable[bytes]): The NDJSON lines.
+        write_batch (Callable[[List[dict], bool], None]): Writes a list of bulk
+            operations (see `db.validator.BulkWriteInput`), ordered or not.
+        batch_size (int): Documents per bulk write.
+        offset (int): Number of leading lines to skip, e.g. from a failed run.
+        ordered (bool): Whether each bulk write stops at its first error.
+        on_progress (Optional[Callable[[ImportStats], None]]): Called after every batch.
+
+    Returns:
+        ImportStats: The counters of the run.
+
+    Raises:
+        ImportFailed: If a batch could not be written.
+    """
+    stats = ImportStats(offset)
+    batch: List[dict] = []
+    pending_lines = 0
+
+    def flush():
+        nonlocal batch, pending_lines
+        if batch:
+            try:
+                write_batch(batch, ordered)
+            except Exception as e:
+                raise ImportFailed(stats, e) from e
+            stats.written += len(batch)
+        stats.offset += pending_lines
+        batch, pending_lines = [], 0
+        if on_progress is not None:
+            on_progress(stats)
+
+    for number, line in enumerate(lines):
+        if number < offset:
+            continue
+        pending_lines += 1
+        if not line.strip():
+            continue
+        try:
+            document = json_util.loads(line)
+        except ValueError:
+            stats.invalid += 1
+            continue
+        if not isinstance(document, dict):
+            stats.invalid += 1
+            continue
+
+        batch.append(_operation(document))
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch or pending_lines:
+        flush()
+    return stats
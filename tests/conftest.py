@@ -0,0 +1,28 @@
+"""
+Shared setup of the test suite.
+
+The application reads its settings from the environment when `config.config` is
+imported, so the environment is set here, before any test module imports it: an
+in-memory SQLite database stands in for MongoDB and a dummy token configures one bot.
+The app directory is put on the import path, as when the API is run from it.
+"""
+import os
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app")
+sys.path.insert(0, APP_DIR)
+
+os.environ.update(
+    {
+        "DB_URL": "sqlite://",
+        "DB_NAME": "rapidnotify_test",
+        "TABLE_NAME": "subscriptions",
+        "BOT_KEY": "1000:test-token",
+        "BOT_KEYS": "",
+        "API_KEY_SECRET": "test-secret",
+        "TELEGRAM_CHAT_RATE": "1000",
+        "TELEGRAM_GLOBAL_RATE": "1000",
+        "LOG_LEVEL": "CRITICAL",
+        "LOG_SUCCESS_SAMPLE_RATE": "0",
+    }
+)
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from api.V1.deps import admission, admission_controller
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from services.admission import (
+    AdmissionController,
+    AdmissionLimit,
+    AdmissionLimiter,
+    Overloaded,
+    parse_limits,
+)
+
+
+def test_parse_limits():
+    assert parse_limits("RapidNotify:high=128/256/1, attachment=4") == {
+        "RapidNotify:high": AdmissionLimit(128, 256, 1.0),
+        "attachment": AdmissionLimit(4, 0, 0.0),
+    }
+    with pytest.raises(ValueError):
+        parse_limits("RapidNotify")
+
+
+def test_limiter_rejects_once_slots_and_queue_are_full():
+    limiter = AdmissionLimiter(AdmissionLimit(1, 0, 0))
+
+    async def run():
+        await limiter.acquire()
+        with pytest.raises(Overloaded):
+            await limiter.acquire()
+        limiter.release()
+        await limiter.acquire()
+
+    asyncio.run(run())
+
+    assert limiter.snapshot()["admitted"] == 2
+    assert limiter.snapshot()["rejected"] == 1
+
+
+def test_queued_requests_are_admitted_in_order():
+    limiter = AdmissionLimiter(AdmissionLimit(1, 2, 1))
+    admitted = []
+
+    async def request(name):
+        await limiter.acquire()
+        admitted.append(name)
+
+    async def run():
+        await limiter.acquire()
+        waiters = [asyncio.create_task(request(name)) for name in ("a", "b")]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*waiters)
+
+    asyncio.run(run())
+
+    assert admitted == ["a", "b"]
+    assert limiter.in_flight == 1
+
+
+def test_queue_deadline_rejects_waiting_requests():
+    limiter = AdmissionLimiter(AdmissionLimit(1, 1, 0.01))
+
+    async def run():
+        await limiter.acquire()
+        with pytest.raises(Overloaded):
+            await limiter.acquire()
+
+    asyncio.run(run())
+
+    assert limiter.snapshot()["timed_out"] == 1
+    assert limiter.snapshot()["waiting"] == 0
+
+
+def test_controller_uses_priority_overrides():
+    controller = AdmissionController(
+        AdmissionLimit(8), {"RapidNotify:high": AdmissionLimit(16)}
+    )
+
+    assert controller.limiter("RapidNotify", "high").limit.max_in_flight == 16
+    assert controller.limiter("RapidNotify", "low").limit.max_in_flight == 8
+    assert controller.limiter("RapidNotify", "low") is controller.limiter("RapidNotify")
+
+
+def test_admission_runs_before_the_body_is_read(monkeypatch):
+    reads = []
+
+    async def body(request: Request):
+        reads.append(await request.body())
+
+    app = FastAPI()
+
+    @app.post("/route", dependencies=[Depends(admission("test-route"))])
+    async def route(_: None = Depends(body)):
+        return {}
+
+    client = TestClient(app)
+    assert client.post("/route", content=b"first").status_code == 200
+
+    monkeypatch.setitem(
+        admission_controller._limiters,
+        "test-route",
+        AdmissionLimiter(AdmissionLimit(0)),
+    )
+    response = client.post("/route", content=b"second")
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert reads == [b"first"]
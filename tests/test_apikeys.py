@@ -0,0 +1,65 @@
+import pytest
+from services.apikeys import ApiKeySigner, InvalidApiKey, SignedKey
+
+
+@pytest.fixture
+def signer():
+    return ApiKeySigner("secret")
+
+
+def test_issued_key_verifies(signer):
+    api_key = signer.issue(42, 1000)
+
+    assert signer.is_signed(api_key)
+    assert signer.verify(api_key) == SignedKey(signer.key_id(api_key), 42, "1000")
+
+
+def test_key_without_bot_verifies(signer):
+    assert signer.verify(signer.issue(42)).bot_id is None
+
+
+def test_tampered_key_is_rejected(signer):
+    api_key = signer.issue(42, 1000)
+    forged = api_key.replace(".42.", ".43.")
+
+    with pytest.raises(InvalidApiKey, match="signature"):
+        signer.verify(forged)
+    with pytest.raises(InvalidApiKey):
+        ApiKeySigner("other-secret").verify(api_key)
+
+
+def test_revoked_key_is_rejected(signer):
+    api_key, other = signer.issue(42, 1000), signer.issue(42, 1000)
+
+    signer.revoke(signer.key_id(api_key))
+
+    with pytest.raises(InvalidApiKey, match="revoked"):
+        signer.verify(api_key)
+    assert signer.verify(other) is not None
+
+
+def test_revocation_list_is_replaced(signer):
+    api_key = signer.issue(42)
+    signer.revoke(signer.key_id(api_key))
+
+    signer.load_revoked([])
+
+    assert signer.verify(api_key) is not None
+
+
+def test_unsigned_keys_are_looked_up(signer):
+    assert signer.verify("a1b2c3d4") is None
+    assert signer.key_id("a1b2c3d4") == "a1b2c3d4"
+
+    signer.revoke("a1b2c3d4")
+    with pytest.raises(InvalidApiKey):
+        signer.verify("a1b2c3d4")
+
+
+def test_signer_without_secret():
+    signer = ApiKeySigner(None)
+
+    assert not signer.enabled
+    assert signer.verify(ApiKeySigner("secret").issue(42)) is None
+    with pytest.raises(RuntimeError):
+        signer.issue(42)
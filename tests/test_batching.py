@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from services.batching import KeyBatcher
+
+
+class Loader:
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    def __call__(self, keys):
+        self.batches.append(sorted(keys))
+        if self.error is not None:
+            raise self.error
+        return {key: key.upper() for key in keys if key != "missing"}
+
+
+def test_concurrent_loads_share_one_batch():
+    loader = Loader()
+    batcher = KeyBatcher(loader, window=0.01, default="default")
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.load(key) for key in ("a", "b", "a", "missing"))
+        )
+
+    assert asyncio.run(run()) == ["A", "B", "A", "default"]
+    assert loader.batches == [["a", "b", "missing"]]
+    assert batcher.snapshot()["lookups"] == 4
+
+
+def test_full_batch_is_dispatched_without_waiting():
+    loader = Loader()
+    batcher = KeyBatcher(loader, window=10, max_batch=2)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.load(key) for key in ("a", "b", "c", "d"))), 1
+        )
+
+    assert asyncio.run(run()) == ["A", "B", "C", "D"]
+    assert loader.batches == [["a", "b"], ["c", "d"]]
+
+
+def test_loader_errors_reach_every_waiter():
+    batcher = KeyBatcher(Loader(error=ConnectionError("down")), window=0.01)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.load("a"), batcher.load("b"), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_cancelled_waiter_does_not_fail_others():
+    batcher = KeyBatcher(Loader(), window=0.01)
+
+    async def run():
+        cancelled = asyncio.create_task(batcher.load("a"))
+        other = asyncio.create_task(batcher.load("a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await other
+
+    assert asyncio.run(run()) == "A"
@@ -0,0 +1,199 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from api.V1 import deps
+from config.config import Config
+from db.mongo import (
+    DataBase,
+    MongoDbClientConfig,
+    QueryDataInput,
+    UpdateDataInput,
+    UploadDataInput,
+)
+from fastapi import HTTPException
+from models.retry import RetryClass
+from services.telegram import TelegramAPIError
+
+
+def table(name):
+    return {"db_name": Config.DB_NAME, "table_name": name}
+
+
+@pytest.fixture
+def db():
+    return DataBase(MongoDbClientConfig(db_url=Config.DB_URL))
+
+
+@pytest.fixture
+def subscription(db):
+    """A subscription with an API key of its own, flagged as unreachable."""
+    api_key = uuid.uuid4().hex
+    document = {
+        "_id": uuid.uuid4().int % 10**9,
+        "api_key": api_key,
+        "unreachable": True,
+        "unreachable_reason": "403: Forbidden: bot was blocked by the user",
+    }
+    db.upload(UploadDataInput(data=document, **table(Config.TABLE_NAME)))
+    yield document
+    deps.unreachable_chats.pop(api_key)
+
+
+@pytest.fixture
+def retries(monkeypatch):
+    """A retry store whose collections are used by this test only."""
+    suffix = uuid.uuid4().hex[:8]
+    monkeypatch.setattr(Config, "RETRY_TABLE_NAME", f"retries_{suffix}")
+    monkeypatch.setattr(Config, "DEAD_LETTER_TABLE_NAME", f"dead_letters_{suffix}")
+    return RetryClass()
+
+
+class SentTexts(list):
+    """The texts sent by a bot; sending a text mapped in `fail` raises its error."""
+
+    def __init__(self):
+        super().__init__()
+        self.fail = {}
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    texts = SentTexts()
+
+    def send_message(chat_id, text):
+        error = texts.fail.pop(text, None)
+        if error is not None:
+            raise error
+        texts.append(text)
+        return {"message_id": len(texts)}
+
+    client = deps.bot_pool.default.client
+    monkeypatch.setattr(client, "send_message", send_message)
+    return texts
+
+
+def test_flagged_subscription_is_rejected_and_cached(subscription):
+    api_key = subscription["api_key"]
+
+    with pytest.raises(HTTPException) as excinfo:
+        deps.reject_unreachable(api_key, subscription)
+    assert excinfo.value.status_code == 410
+
+    # Later requests are rejected before any lookup
+    with pytest.raises(HTTPException):
+        deps.reject_unreachable(api_key)
+
+
+def test_cleared_flag_drops_the_cached_key(subscription):
+    api_key = subscription["api_key"]
+    deps.unreachable_chats.set(api_key, "blocked")
+
+    deps.reject_unreachable(api_key, {**subscription, "unreachable": False})
+
+    deps.reject_unreachable(api_key)
+    assert api_key not in deps.unreachable_chats
+
+
+def test_mark_unreachable_stores_the_flag(db, subscription):
+    api_key = subscription["api_key"]
+    db.update(
+        UpdateDataInput(
+            filter={"_id": subscription["_id"]},
+            data={"$unset": {"unreachable": ""}},
+            **table(Config.TABLE_NAME),
+        )
+    )
+    error = TelegramAPIError(403, "Forbidden: bot was blocked by the user")
+
+    exception = asyncio.run(deps.mark_unreachable(api_key, subscription["_id"], error))
+
+    assert exception.status_code == 410
+    assert api_key in deps.unreachable_chats
+    (stored,) = db.query(
+        QueryDataInput(data={"_id": subscription["_id"]}, **table(Config.TABLE_NAME))
+    )
+    assert stored["unreachable"] is True
+
+
+def test_recheck_drops_keys_whose_flag_was_cleared(db, subscription):
+    blocked = subscription["api_key"]
+    cleared, deleted = uuid.uuid4().hex, uuid.uuid4().hex
+    db.upload(
+        UploadDataInput(
+            data={"_id": uuid.uuid4().hex, "api_key": cleared},
+            **table(Config.TABLE_NAME),
+        )
+    )
+    for api_key in (blocked, cleared, deleted):
+        deps.unreachable_chats.set(api_key, "blocked")
+
+    dropped = asyncio.run(deps.recheck_unreachable())
+
+    assert dropped >= 2
+    assert blocked in deps.unreachable_chats
+    assert cleared not in deps.unreachable_chats
+    assert deleted not in deps.unreachable_chats
+
+
+def enqueue(retries, parts, part=0, bot_id=None):
+    return retries.enqueue(
+        bot_id or deps.bot_pool.default.client.bot_id,
+        42,
+        "".join(parts),
+        "normal",
+        "500: Internal Server Error",
+        1,
+        time.time() - 1,
+        parts=parts if len(parts) > 1 else None,
+        part=part,
+    )
+
+
+def pending(retries):
+    return retries.due(time.time() + 10**6, 10)
+
+
+def dead_letters(db, retry_id):
+    return db.query(
+        QueryDataInput(data={"_id": retry_id}, **table(Config.DEAD_LETTER_TABLE_NAME))
+    )
+
+
+def test_split_retry_resumes_parts_in_order(retries, sent):
+    enqueue(retries, ["p0", "p1", "p2"], part=1)
+    sent.fail["p2"] = TelegramAPIError(502, "Bad Gateway")
+
+    asyncio.run(deps.process_retries(retries))
+
+    (retry,) = pending(retries)
+    assert (retry["part"], retry["attempts"]) == (2, 2)
+    assert retry["next_attempt"] > time.time()
+
+    asyncio.run(deps._retry_delivery(retries, retry))
+
+    assert sent == ["p1", "p2"]
+    assert pending(retries) == []
+
+
+def test_permanent_failure_is_dead_lettered(db, retries, sent):
+    retry_id = enqueue(retries, ["hello"])
+    sent.fail["hello"] = TelegramAPIError(400, "Bad Request: message text is empty")
+
+    asyncio.run(deps.process_retries(retries))
+
+    assert pending(retries) == []
+    (letter,) = dead_letters(db, retry_id)
+    assert letter["attempts"] == 2
+    assert letter["last_error"].startswith("400")
+
+
+def test_retry_pinned_to_an_unknown_bot_is_dead_lettered(db, retries, sent):
+    retry_id = enqueue(retries, ["hello"], bot_id="999")
+
+    asyncio.run(deps.process_retries(retries))
+
+    assert sent == []
+    assert pending(retries) == []
+    assert dead_letters(db, retry_id)[0]["last_error"] == "Bot 999 is not configured."
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from models.history import HistoryClass
+from services.history import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    timestamp,
+)
+
+START = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_cursor_round_trip():
+    sent_at = START + timedelta(microseconds=123456)
+
+    cursor = encode_cursor(sent_at, "abc")
+
+    assert cursor == f"{round(START.timestamp() * 1000) + 123}.abc"
+    assert decode_cursor(cursor) == (timestamp(sent_at), "abc")
+    assert decode_cursor(encode_cursor(sent_at.timestamp(), "abc"))[0] == (
+        timestamp(sent_at)
+    )
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "x.abc", "99999999999999999999.abc"])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_keyset_pages_cover_every_entry_once():
+    history = HistoryClass()
+    chat_id = 7001
+    # Entries 0-3 share a timestamp, so pages break ties on the id
+    entries = [
+        {
+            "_id": f"n{index}",
+            "chat_id": chat_id,
+            "text": str(index),
+            "sent_at": START + timedelta(seconds=max(index, 3)),
+        }
+        for index in range(8)
+    ]
+    history.write(entries)
+    history.write([{**entries[0], "_id": "other", "chat_id": chat_id + 1}])
+
+    pages, after = [], None
+    while True:
+        page = history.page(chat_id, 3, after)
+        if not page:
+            break
+        pages.append([entry["_id"] for entry in page])
+        after = decode_cursor(encode_cursor(page[-1]["sent_at"], page[-1]["_id"]))
+
+    assert pages == [["n7", "n6", "n5"], ["n4", "n3", "n2"], ["n1", "n0"]]
+
+
+def test_rewritten_entries_are_not_duplicated():
+    history = HistoryClass()
+    entry = {"_id": "s1", "chat_id": 7003, "status": "queued", "sent_at": START}
+
+    history.write([entry])
+    history.write([{**entry, "status": "sent"}])
+
+    (stored,) = history.page(7003, 10)
+    assert stored["status"] == "sent"
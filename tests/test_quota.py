@@ -0,0 +1,51 @@
+import pytest
+from services.quota import QuotaExceeded, QuotaManager, _today
+
+
+def test_rate_limit_allows_a_burst_then_rejects():
+    quota = QuotaManager(rate_per_minute=3, daily_limit=0)
+
+    for _ in range(3):
+        quota.check("key")
+    with pytest.raises(QuotaExceeded) as excinfo:
+        quota.check("key")
+
+    assert excinfo.value.retry_after >= 1
+    quota.check("other-key")
+
+
+def test_daily_limit_counts_recorded_requests():
+    quota = QuotaManager(rate_per_minute=0, daily_limit=2)
+
+    quota.check("key")
+    quota.record("key")
+    quota.check("key")
+    quota.record("key")
+
+    with pytest.raises(QuotaExceeded, match="Daily"):
+        quota.check("key")
+    assert quota.used_today("key") == 2
+
+
+def test_failed_flush_is_restored():
+    quota = QuotaManager(rate_per_minute=0, daily_limit=0)
+    quota.record("key")
+    quota.record("key")
+
+    pending = quota.drain()
+    assert pending == {(_today(), "key"): 2}
+    assert quota.used_today("key") == 2
+
+    quota.restore(pending)
+    assert quota.drain() == pending
+
+
+def test_reconcile_adopts_totals_of_today_only():
+    quota = QuotaManager(rate_per_minute=0, daily_limit=5)
+
+    quota.reconcile("1970-01-01", {"key": 100})
+    assert quota.used_today("key") == 0
+
+    quota.reconcile(_today(), {"key": 5})
+    with pytest.raises(QuotaExceeded):
+        quota.check("key")
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from services.scheduler import DeliveryScheduler, TokenBucket
+
+
+class RetryAfter(Exception):
+    retry_after = 2
+
+
+def test_token_bucket_reserves_into_debt():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.delay() == pytest.approx(0.2, abs=0.01)
+
+
+def test_token_bucket_pause_withholds_tokens():
+    bucket = TokenBucket(rate=10, capacity=10)
+
+    bucket.pause(3)
+
+    assert bucket.delay() == pytest.approx(3.1, abs=0.01)
+
+
+async def _run_blocked(scheduler, jobs, wait=0.0):
+    """Queue `jobs` behind a delivery holding the only worker and return their order."""
+    started, unblock = threading.Event(), threading.Event()
+    order = []
+
+    def block():
+        started.set()
+        unblock.wait(5)
+
+    blocker = asyncio.create_task(scheduler.submit("low", "blocker", block))
+    await asyncio.to_thread(started.wait, 5)
+
+    tasks = [
+        asyncio.create_task(scheduler.submit(lane, chat_id, order.append, name))
+        for lane, chat_id, name in jobs
+    ]
+    await asyncio.sleep(wait)
+    unblock.set()
+    await asyncio.gather(blocker, *tasks)
+    await scheduler.stop()
+    return order
+
+
+def test_lanes_are_served_by_priority():
+    scheduler = DeliveryScheduler(["high", "normal", "low"], rate=1000, workers=1)
+    jobs = [("low", 1, "low"), ("normal", 2, "normal"), ("high", 3, "high")]
+
+    order = asyncio.run(_run_blocked(scheduler, jobs))
+
+    assert order == ["high", "normal", "low"]
+
+
+def test_starved_lane_is_served_first():
+    scheduler = DeliveryScheduler(
+        ["high", "low"], rate=1000, workers=1, starvation_timeout=0.05
+    )
+    jobs = [("low", 1, "low"), ("high", 2, "high")]
+
+    order = asyncio.run(_run_blocked(scheduler, jobs, wait=0.1))
+
+    assert order == ["low", "high"]
+
+
+def test_rate_limited_chat_does_not_stall_other_chats():
+    scheduler = DeliveryScheduler(["normal"], rate=1000, chat_rate=2, workers=1)
+    done = []
+
+    def deliver(chat_id):
+        done.append((chat_id, time.monotonic()))
+
+    async def run():
+        await asyncio.gather(
+            *(
+                scheduler.submit("normal", chat_id, deliver, chat_id)
+                for chat_id in (1, 1, 2)
+            )
+        )
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert [chat_id for chat_id, _ in done] == [1, 2, 1]
+    assert done[2][1] - done[0][1] >= 0.4
+
+
+def test_retry_after_pauses_the_global_bucket():
+    scheduler = DeliveryScheduler(["normal"], rate=1000)
+
+    def fail():
+        raise RetryAfter()
+
+    async def run():
+        with pytest.raises(RetryAfter):
+            await scheduler.submit("normal", 1, fail)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert scheduler._bucket.delay() > 1
+
+
+def test_unknown_lane_is_rejected():
+    scheduler = DeliveryScheduler(["normal"])
+
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.submit("urgent", 1, print))
@@ -0,0 +1,164 @@
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from db.mongo import (
+    BulkWriteInput,
+    DataBase,
+    DeleteDataInput,
+    IndexInput,
+    MongoDbClientConfig,
+    QueryDataInput,
+    ScanDataInput,
+    UpdateDataInput,
+    UploadDataInput,
+)
+from db.sqlite import SQLiteDataBase
+
+TABLE = {"db_name": "test", "table_name": "users"}
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = DataBase(MongoDbClientConfig(db_url=f"sqlite:///{tmp_path}/test.db"))
+    for document in (
+        {"_id": 1, "api_key": "a", "age": 30, "profile": {"city": "Pune"}},
+        {"_id": 2, "api_key": "b", "age": 40, "profile": {"city": "Delhi"}},
+        {"_id": 3, "api_key": "c", "age": 50, "tags": ["x"]},
+    ):
+        database.upload(UploadDataInput(data=document, **TABLE))
+    return database
+
+
+def ids(documents):
+    return sorted(document["_id"] for document in documents)
+
+
+def all_ids(db):
+    return ids(db.iterate(ScanDataInput(data={}, **TABLE)))
+
+
+def test_sqlite_url_selects_the_sqlite_backend(db):
+    assert isinstance(db, SQLiteDataBase)
+
+
+@pytest.mark.parametrize(
+    "filter, expected",
+    [
+        ({"api_key": "b"}, [2]),
+        ({"api_key": {"$in": ["a", "c"]}}, [1, 3]),
+        ({"age": {"$gt": 30, "$lte": 50}}, [2, 3]),
+        ({"age": {"$ne": 40}}, [1, 3]),
+        ({"profile.city": "Pune"}, [1]),
+        ({"tags": {"$exists": True}}, [3]),
+        ({"$or": [{"age": 30}, {"api_key": "c"}]}, [1, 3]),
+        ({"$and": [{"age": {"$gte": 40}}, {"api_key": {"$nin": ["c"]}}]}, [2]),
+    ],
+)
+def test_query_filters(db, filter, expected):
+    assert ids(db.query(QueryDataInput(data=filter, **TABLE))) == expected
+
+
+def test_duplicate_id_is_rejected(db):
+    with pytest.raises(sqlite3.IntegrityError):
+        db.upload(UploadDataInput(data={"_id": 1}, **TABLE))
+
+
+def test_update_operators(db):
+    result = db.update(
+        UpdateDataInput(
+            filter={"_id": 1},
+            data={"$set": {"profile.city": "Goa"}, "$inc": {"age": 1}},
+            **TABLE,
+        )
+    )
+
+    assert (result.matched_count, result.modified_count) == (1, 1)
+    (document,) = db.query(QueryDataInput(data={"_id": 1}, **TABLE))
+    assert document["age"] == 31
+    assert document["profile"] == {"city": "Goa"}
+
+
+def test_upsert_inserts_filter_fields(db):
+    result = db.update(
+        UpdateDataInput(
+            filter={"_id": 9, "api_key": "z"},
+            data={"$setOnInsert": {"age": 1}, "$inc": {"count": 2}},
+            upsert=True,
+            **TABLE,
+        )
+    )
+
+    assert result.upserted_id == 9
+    assert db.query(QueryDataInput(data={"_id": 9}, **TABLE)) == [
+        {"_id": 9, "api_key": "z", "age": 1, "count": 2}
+    ]
+
+
+def test_delete_removes_one_document(db):
+    result = db.delete(DeleteDataInput(data={"age": {"$gte": 40}}, **TABLE))
+
+    assert result.deleted_count == 1
+    assert all_ids(db) == [1, 3]
+
+
+def test_bulk_write(db):
+    result = db.bulk_write(
+        BulkWriteInput(
+            operations=[
+                {"insert": {"_id": 4, "age": 60}},
+                {"filter": {"_id": 1}, "update": {"$unset": {"profile": ""}}},
+                {"filter": {"_id": 5}, "replacement": {"age": 70}, "upsert": True},
+                {"delete": {"_id": 2}},
+            ],
+            **TABLE,
+        )
+    )
+
+    assert (result.inserted_count, result.modified_count) == (1, 1)
+    assert (result.upserted_count, result.deleted_count) == (1, 1)
+    assert all_ids(db) == [1, 3, 4, 5]
+    assert "profile" not in db.query(QueryDataInput(data={"_id": 1}, **TABLE))[0]
+
+
+def test_unordered_bulk_write_applies_the_other_operations(db):
+    with pytest.raises(sqlite3.IntegrityError):
+        db.bulk_write(
+            BulkWriteInput(
+                operations=[{"insert": {"_id": 1}}, {"insert": {"_id": 6}}],
+                ordered=False,
+                **TABLE,
+            )
+        )
+
+    assert ids(db.query(QueryDataInput(data={"_id": 6}, **TABLE))) == [6]
+
+
+def test_iterate_sorts_and_limits(db):
+    documents = db.iterate(
+        ScanDataInput(data={}, sort=[["age", -1]], limit=2, batch_size=1, **TABLE)
+    )
+
+    assert [document["_id"] for document in documents] == [3, 2]
+
+
+def test_datetimes_are_compared_as_timestamps(db):
+    now = datetime.now(timezone.utc)
+    db.upload(UploadDataInput(data={"_id": 7, "at": now}, **TABLE))
+
+    found = db.query(
+        QueryDataInput(data={"at": {"$gt": now - timedelta(seconds=1)}}, **TABLE)
+    )
+
+    assert ids(found) == [7]
+    assert found[0]["at"] == pytest.approx(now.timestamp())
+
+
+def test_ttl_index_expires_documents(db):
+    db.upload(UploadDataInput(data={"_id": 8, "at": time.time() - 120}, **TABLE))
+
+    db.create_index(IndexInput(keys=[["at", 1]], expire_after=60, **TABLE))
+
+    assert db.query(QueryDataInput(data={"_id": 8}, **TABLE)) == []
+    assert all_ids(db) == [1, 2, 3]
@@ -0,0 +1,70 @@
+import pytest
+from services.templates import (
+    MAX_FORMAT_WIDTH,
+    MAX_RENDERED_LENGTH,
+    TemplateCache,
+    TemplateError,
+    compile_template,
+)
+
+
+def test_render_with_specs_and_conversions():
+    template = compile_template("{name!r} took {duration:.1f}s {{ok}}")
+
+    assert template.fields == {"name", "duration"}
+    assert template.render({"name": "build", "duration": 2.345}) == (
+        "'build' took 2.3s {ok}"
+    )
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["{user.name}", "{items[0]}", "{0}", "{}", "{x:{width}}", "{unclosed"],
+)
+def test_unsupported_templates_are_rejected(source):
+    with pytest.raises(TemplateError):
+        compile_template(source)
+
+
+def test_missing_variables_are_reported():
+    template = compile_template("{a} {b}")
+
+    with pytest.raises(TemplateError, match="a, b"):
+        template.render({})
+
+
+def test_unformattable_value_is_a_template_error():
+    with pytest.raises(TemplateError):
+        compile_template("{x:d}").render({"x": "text"})
+
+
+def test_format_width_is_bounded():
+    compile_template(f"{{x:>{MAX_FORMAT_WIDTH}}}")
+
+    with pytest.raises(TemplateError, match="limited"):
+        compile_template(f"{{x:>{MAX_FORMAT_WIDTH + 1}}}")
+    with pytest.raises(TemplateError, match="limited"):
+        compile_template("{x:.200000000f}")
+
+
+def test_rendered_length_is_bounded():
+    template = compile_template(f"{{x:>{MAX_FORMAT_WIDTH}}}" * 100)
+
+    with pytest.raises(TemplateError, match="longer"):
+        template.render({"x": 1})
+    with pytest.raises(TemplateError, match="longer"):
+        compile_template("{x}").render({"x": "a" * (MAX_RENDERED_LENGTH + 1)})
+
+
+def test_cache_recompiles_changed_sources():
+    cache = TemplateCache(max_size=2)
+
+    first = cache.get("key", "disk", "Disk {disk}")
+    assert cache.get("key", "disk", "Disk {disk}") is first
+
+    updated = cache.get("key", "disk", "Disk {disk} full")
+    assert updated is not first
+    assert updated.render({"disk": "/var"}) == "Disk /var full"
+
+    cache.invalidate("key", "disk")
+    assert cache.get("key", "disk", "Disk {disk} full") is not updated